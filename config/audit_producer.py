@@ -1,12 +1,16 @@
+from __future__ import annotations
+
 import json
 import os
 import threading
-import pika
-from typing import Optional
+from typing import Optional, TYPE_CHECKING
 from datetime import date, datetime
 from decimal import Decimal
 from uuid import UUID
 
+if TYPE_CHECKING:
+    import pika
+
 
 _AMQP_URL = os.getenv(
     "AUDIT_AMQP_URL",
@@ -65,6 +69,7 @@ def _ensure_channel():
     with _lock:
         if _channel and _channel.is_open:
             return _channel
+        import pika  # diferido: solo cuando se publica
         params = pika.URLParameters(_AMQP_URL)
         params.socket_timeout = _PUBLISH_TIMEOUT
         _connection = pika.BlockingConnection(params)
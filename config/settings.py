@@ -2,16 +2,12 @@ from corsheaders.defaults import default_headers
 from pathlib import Path
 import os
 
-import environ
 from urllib.parse import urlparse, parse_qsl
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
-# initialize environment variables
-
-env = environ.Env()
-
-environ.Env.read_env(os.path.join(BASE_DIR, '.env'))
+# initialize environment variables (.env se lee una sola vez en envs_constants)
+from config.shared.constants.envs_constants import env
 
 # Quick-start development settings - unsuitable for production
 # See https://docs.djangoproject.com/en/4.0/howto/deployment/checklist/
@@ -19,7 +15,7 @@ environ.Env.read_env(os.path.join(BASE_DIR, '.env'))
 # SECURITY WARNING: keep the secret key used in production secret!
 SECRET_KEY = env('SECRET_KEY')
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = env('DEBUG', default=True)
+DEBUG = env.bool('DEBUG', default=True)
 
 # Multi-Factor Authentication settings
 MFA_ISSUER = "S360 ERP"
@@ -30,7 +26,6 @@ MFA_ISSUER = "S360 ERP"
 SHARED_APPS = [
     'django_prometheus',
     'widget_tweaks',
-    'django_user_agents',
     'cacheops',
     'rest_framework',
     'rest_framework.authtoken',
@@ -45,6 +40,7 @@ SHARED_APPS = [
     'drf_yasg',
     'core.homepage',
     'core.multicpy',
+    'core.ops',
     'core.security',
     'core.user',
 
@@ -79,7 +75,7 @@ TENANT_APPS = [
 
 # INSTALLED_APPS = list(SHARED_APPS) + [app for app in TENANT_APPS if app not in SHARED_APPS]
 INSTALLED_APPS = [
-    'widget_tweaks', 'django_user_agents', 'cacheops', 'rest_framework', 'rest_framework.authtoken', 'django_cleanup.apps.CleanupConfig', 'django.contrib.staticfiles', 'django.contrib.admin', 'django.contrib.auth', 'django.contrib.contenttypes', 'django.contrib.sessions', 'django.contrib.messages', 'core.homepage', 'core.multicpy', 'core.security', 'core.user', 'core.billing', 'core.dashboard', 'core.login', 'core.network',
+    'widget_tweaks', 'cacheops', 'rest_framework', 'rest_framework.authtoken', 'django_cleanup.apps.CleanupConfig', 'django.contrib.staticfiles', 'django.contrib.admin', 'django.contrib.auth', 'django.contrib.contenttypes', 'django.contrib.sessions', 'django.contrib.messages', 'core.homepage', 'core.multicpy', 'core.ops', 'core.security', 'core.user', 'core.billing', 'core.dashboard', 'core.login', 'core.network',
     # 'django_crontab',
     # swagger
     'encrypted_model_fields',
@@ -102,12 +98,13 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'crum.CurrentRequestUserMiddleware',
-    'django_user_agents.middleware.UserAgentMiddleware',
+    'config.shared.middlewares.db_connection_middleware.DBConnectionMiddleware',
+    'config.shared.middlewares.request_context_middleware.RequestContextMiddleware',
+    'config.shared.middlewares.query_instrumentation_middleware.QueryInstrumentationMiddleware',
+    # UA se parsea bajo demanda: config.shared.helpers.request_netinfo.get_user_agent
 
     # ### Custom Middlewares
-    'config.shared.middlewares.not_found_middleware.Custom404Middleware',
-    'config.shared.middlewares.unauthorized_middleware.CustomUnauthorizedMiddleware',
-    'config.shared.middlewares.front_version_middleware.FrontVersionMiddleware',
+    'config.shared.middlewares.error_normalization_middleware.ErrorNormalizationMiddleware',
 
 ]
 
@@ -172,10 +169,52 @@ DATABASES = {
     }
 }
 
-# DATABASE_ROUTERS = [
-#    'django_tenants.routers.TenantSyncRouter',
-#    'core.network.utils.db_routers.Router',
-# ]
+# ### Conexiones persistentes ===========================
+# sync/gthread: cada worker (o thread) reutiliza su conexión hasta DB_CONN_MAX_AGE,
+#   conexiones máximas por worker = GUNICORN_THREADS.
+# gevent/eventlet: una conexión por greenlet que nunca se reutiliza -> sin
+#   persistencia, usar pgbouncer (DB_PGBOUNCER) para el pooling.
+GUNICORN_WORKER_CLASS = env.str('GUNICORN_WORKER_CLASS', default='sync')
+DB_PGBOUNCER = env.bool('DB_PGBOUNCER', default=False)
+DB_CONN_MAX_AGE = env.int('DB_CONN_MAX_AGE', default=60)
+if GUNICORN_WORKER_CLASS in ('gevent', 'eventlet'):
+    DB_CONN_MAX_AGE = 0
+DB_CONN_HEALTH_CHECKS = env.bool('DB_CONN_HEALTH_CHECKS', default=True)
+# solo se hace ping (SELECT 1) a conexiones reutilizadas que estuvieron inactivas más de N segundos
+DB_CONN_HEALTH_CHECK_IDLE = env.float('DB_CONN_HEALTH_CHECK_IDLE', default=30)
+
+DATABASES['default'].update({
+    'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+    # nativo desde Django 4.1; en 4.0 lo aplica DBConnectionMiddleware
+    'CONN_HEALTH_CHECKS': DB_CONN_HEALTH_CHECKS,
+    # pgbouncer en transaction pooling no soporta cursores server-side (.iterator())
+    'DISABLE_SERVER_SIDE_CURSORS': DB_PGBOUNCER,
+})
+
+# ### Réplicas de lectura ===========================
+# DATABASE_REPLICA_URLS=postgres://...,postgres://... -> aliases replica_1, replica_2, ...
+DB_REPLICAS = []
+for _index, _replica_url in enumerate(env.list('DATABASE_REPLICA_URLS', default=[]), start=1):
+    _replica = env.db_url_config(_replica_url)
+    DATABASES[f'replica_{_index}'] = {
+        **DATABASES['default'],
+        **_replica,
+        'OPTIONS': _replica.get('OPTIONS', {}),
+        'TEST': {'MIRROR': 'default'},
+    }
+    DB_REPLICAS.append(f'replica_{_index}')
+
+# lag máximo (segundos) antes de volver al primario
+DB_REPLICA_MAX_LAG = env.float('DB_REPLICA_MAX_LAG', default=5)
+DB_REPLICA_LAG_CHECK_INTERVAL = env.float(
+    'DB_REPLICA_LAG_CHECK_INTERVAL', default=5)
+# round_robin | least_lag
+DB_REPLICA_STRATEGY = env.str('DB_REPLICA_STRATEGY', default='round_robin')
+
+DATABASE_ROUTERS = [
+    # 'django_tenants.routers.TenantSyncRouter',
+    'core.network.utils.db_routers.Router',
+]
 
 # Django-tenant-schemas
 
@@ -183,6 +222,18 @@ DATABASES = {
 
 # TENANT_DOMAIN_MODEL = 'multicpy.Domain'
 
+# resolución de tenant (CustomMiddleware): header X-Tenant o host, cache en proceso
+TENANT_HEADER = 'HTTP_' + env.str('TENANT_HEADER', default='X-Tenant').upper().replace('-', '_')
+TENANT_CACHE_TTL = env.int('TENANT_CACHE_TTL', default=60)
+TENANT_CACHE_MAX_SIZE = env.int('TENANT_CACHE_MAX_SIZE', default=1024)
+# el header solo se acepta desde estos proxies (IPs o redes, ej. 10.0.0.0/8); vacío = nunca
+TENANT_TRUSTED_PROXIES = env.list('TENANT_TRUSTED_PROXIES', default=[])
+
+# jobs en todos los schemas (TenantJobRunner)
+TENANT_JOB_MAX_WORKERS = env.int('TENANT_JOB_MAX_WORKERS', default=4)
+# segundos; se aplica como statement_timeout (por statement SQL, no por tenant)
+TENANT_JOB_TIMEOUT = env.float('TENANT_JOB_TIMEOUT', default=None)
+
 AUTH_PASSWORD_VALIDATORS = [
     {
         'NAME': 'django.contrib.auth.password_validation.UserAttributeSimilarityValidator',
@@ -262,10 +313,14 @@ REST_FRAMEWORK = {
     'EXCEPTION_HANDLER': 'config.shared.helpers.handle_rest_exception_drf_helper.handle_rest_exception_drf_helper',
 
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
-        'rest_framework.renderers.BrowsableAPIRenderer',
+        'config.shared.renderers.orjson_renderer.ORJSONRenderer',
         # 'rest_framework_xml.renderers.XMLRenderer'
-    ]
+    ] + (['rest_framework.renderers.BrowsableAPIRenderer'] if DEBUG else []),
+    'DEFAULT_PARSER_CLASSES': [
+        'config.shared.parsers.orjson_parser.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ],
 }
 
 # Django-cacheops
@@ -284,6 +339,61 @@ CACHES = {
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
+# ### JOBS EN SEGUNDO PLANO (Redis de CACHES['default']) ----------------------
+# worker: python manage.py run_jobs --queues default:4,email:2,pdf:1,audit:2
+JOB_QUEUES = env.str('JOB_QUEUES', default='default:4,email:2,pdf:1,audit:2')
+JOB_TASK_MODULES = [
+    'core.login.tasks',
+    'core.billing.tasks',
+    'webhooks.tasks',
+    'users.tasks',
+]
+JOB_RESULT_TTL = env.int('JOB_RESULT_TTL', default=60 * 60 * 24)
+# heartbeat del worker: si vence, sus jobs en proceso vuelven a la cola (reaper)
+JOB_HEARTBEAT_TTL = env.int('JOB_HEARTBEAT_TTL', default=30)
+JOB_REAPER_INTERVAL = env.int('JOB_REAPER_INTERVAL', default=30)
+# True: los jobs se ejecutan en línea (desarrollo sin worker)
+JOBS_EAGER = env.bool('JOBS_EAGER', default=False)
+
+# ### EMAIL ---------------------------------------------------------------------
+# local: EMAIL_BACKEND=django.core.mail.backends.filebased.EmailBackend (sink en EMAIL_FILE_PATH)
+# o un SMTP falso (MailHog/smtp4dev) con EMAIL_HOST=localhost EMAIL_PORT=1025 EMAIL_USE_TLS=False
+EMAIL_BACKEND = env.str(
+    'EMAIL_BACKEND', default='django.core.mail.backends.smtp.EmailBackend')
+EMAIL_HOST = env.str('EMAIL_HOST', default='localhost')
+EMAIL_PORT = env.int('EMAIL_PORT', default=587)
+EMAIL_HOST_USER = env.str('EMAIL_HOST_USER', default='')
+EMAIL_HOST_PASSWORD = env.str('EMAIL_HOST_PASSWORD', default='')
+EMAIL_USE_TLS = env.bool('EMAIL_USE_TLS', default=True)
+EMAIL_TIMEOUT = env.int('EMAIL_TIMEOUT', default=10)
+EMAIL_FILE_PATH = env.str('EMAIL_FILE_PATH', default=os.path.join(BASE_DIR, 'tmp', 'emails'))
+DEFAULT_FROM_EMAIL = env.str('DEFAULT_FROM_EMAIL', default=EMAIL_HOST_USER or 'webmaster@localhost')
+
+# ### PDF (weasyprint) --------------------------------------------------------------
+# procesos para write_pdf; 0 = en línea en el proceso que llama
+PDF_RENDER_WORKERS = env.int('PDF_RENDER_WORKERS', default=0)
+PDF_ASSET_CACHE_MAX_BYTES = env.int('PDF_ASSET_CACHE_MAX_BYTES', default=32 * 1024 * 1024)
+# static se cachea sin vencimiento; media y URLs remotas pueden cambiar: TTL en segundos (0 = no cachear)
+PDF_ASSET_CACHE_TTL = env.int('PDF_ASSET_CACHE_TTL', default=60)
+PDF_BASE_STYLESHEET = os.path.join(BASE_DIR, 'static', 'lib', 'bootstrap-5.0.2', 'css', 'bootstrap.min.css')
+
+# ### SECUENCIAS DE COMPROBANTES ---------------------------------------------------------
+# 0 = sin huecos (lock por comprobante); N > 0 = bloques de N por proceso (huecos en ReceiptSequenceGap)
+RECEIPT_SEQUENCE_BLOCK_SIZE = env.int('RECEIPT_SEQUENCE_BLOCK_SIZE', default=0)
+
+# ### TOTP ------------------------------------------------------------------------
+TOTP_QR_CACHE_TTL = env.int('TOTP_QR_CACHE_TTL', default=300)
+# procesos del pool de aprovisionamiento masivo (uno por corrida de provision_totp / por worker de jobs);
+# None = os.cpu_count(), 1 = en línea
+TOTP_PROVISION_WORKERS = env.int('TOTP_PROVISION_WORKERS', default=None)
+# segundos que el resultado de un aprovisionamiento masivo por API queda para su descarga única
+TOTP_PROVISION_DOWNLOAD_TTL = env.int('TOTP_PROVISION_DOWNLOAD_TTL', default=900)
+TOTP_INTERVAL = 30
+# intentos de verificación por ventana (Redis); se excede -> 429
+TOTP_RATE_LIMIT_WINDOW = env.int('TOTP_RATE_LIMIT_WINDOW', default=300)
+TOTP_RATE_LIMIT_USER = env.int('TOTP_RATE_LIMIT_USER', default=5)
+TOTP_RATE_LIMIT_IP = env.int('TOTP_RATE_LIMIT_IP', default=30)
+
 # Constants
 
 CUSTOMER_GROUP = 2
@@ -310,8 +420,16 @@ SWAGGER_SETTINGS = {
             'Token': []
         }
     ],
+    'SPEC_URL': '/api/v1/swagger.json',
 }
 
+# schema precomputado: manage.py generate_openapi_schema en cada deploy (Procfile).
+# Sin APP_VERSION no hay archivo ni cache compartido: cada proceso genera el suyo.
+OPENAPI_SCHEMA_VERSION = env.str('APP_VERSION', default=None)
+OPENAPI_SCHEMA_DIR = env.str(
+    'OPENAPI_SCHEMA_DIR', default=os.path.join(BASE_DIR, 'openapi'))
+OPENAPI_CACHE_TIMEOUT = env.int('OPENAPI_CACHE_TIMEOUT', default=60 * 60)
+
 
 # ### CORS Origin ===========================
 CORS_ALLOW_HEADERS = list(default_headers) + ['x-front-version']
@@ -329,6 +447,12 @@ INSTALLED_APPS.insert(0, 'django_prometheus')
 MIDDLEWARE.insert(0, 'django_prometheus.middleware.PrometheusBeforeMiddleware')
 MIDDLEWARE.append('django_prometheus.middleware.PrometheusAfterMiddleware')
 
+# 3) Instrumentación SQL por request (histogramas por view + aviso de N+1)
+QUERY_INSTRUMENTATION_ENABLED = env.bool(
+    'QUERY_INSTRUMENTATION_ENABLED', default=True)
+QUERY_N_PLUS_ONE_THRESHOLD = env.int('QUERY_N_PLUS_ONE_THRESHOLD', default=10)
+QUERY_SLOWEST_COUNT = env.int('QUERY_SLOWEST_COUNT', default=5)
+
 
 # 4) Logging estructurado JSON para Promtail
 LOGGING = {
@@ -8,6 +8,17 @@ PAGINATION_DEFAULT_PAGE_SIZE = 10
 PAGINATION_PAGE_SIZE_KEY = "page_size"
 PAGINATION_PAGE_NUMBER_KEY = "page"
 
+# ## Export (streaming) --------------------
+EXPORT_FORMAT_KEY = "export"
+EXPORT_FORMATS = ("ndjson", "csv")
+EXPORT_DEFAULT_CHUNK_SIZE = 1000
+
+# ## Meses (validators de modelos) --------------------
+MONTHS = (
+    'ENERO', 'FEBRERO', 'MARZO', 'ABRIL', 'MAYO', 'JUNIO',
+    'JULIO', 'AGOSTO', 'SEPTIEMBRE', 'OCTUBRE', 'NOVIEMBRE', 'DICIEMBRE',
+)
+
 
 # ### Swagger ======================================
 # Parámetros de paginación
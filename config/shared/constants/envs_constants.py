@@ -3,10 +3,10 @@ import os
 import environ
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
-BASE_DIR = Path(__file__).resolve().parent.parent
+BASE_DIR = Path(__file__).resolve().parent.parent.parent.parent
 
 # Initialize environment variables
 env = environ.Env()
 
-# Read .env file
+# Read .env file (una sola vez por proceso: settings y el resto importan este `env`)
 environ.Env.read_env(os.path.join(BASE_DIR, '.env'))
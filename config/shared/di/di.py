@@ -13,3 +13,15 @@ class Container(containers.DeclarativeContainer):
 
 
 container = Container()
+
+
+def resolve(provider_name: str):
+    """
+    Resuelve un provider del container. Los providers son Singleton: la instancia
+    se crea una vez por proceso (worker) y se respetan container.override() y
+    container.reset_singletons() (tests).
+    No cachea nada propio: cada llamada (ej. en el __init__ de una view, una vez
+    por request) hace la búsqueda del provider y retorna el singleton existente.
+    Los services/repositories son stateless: el estado por request vive en RequestContext.
+    """
+    return getattr(container, provider_name)()
@@ -0,0 +1,38 @@
+import asyncio
+from functools import wraps
+
+from config.shared.helpers.request_context_helper import get_request_context
+
+
+def replica_read(view_method):
+    """
+    Habilita lecturas desde réplicas mientras corre el handler (GET de list/detail).
+    Cualquier escritura dentro del request fija el primario (ver Router).
+    """
+    if asyncio.iscoroutinefunction(view_method):
+        @wraps(view_method)
+        async def async_wrapper(*args, **kwargs):
+            context = get_request_context()
+            previous = context.db_read_replica
+            context.db_read_replica = True
+            try:
+                return await view_method(*args, **kwargs)
+            finally:
+                context.db_read_replica = previous
+        return async_wrapper
+
+    @wraps(view_method)
+    def wrapper(*args, **kwargs):
+        context = get_request_context()
+        previous = context.db_read_replica
+        context.db_read_replica = True
+        try:
+            return view_method(*args, **kwargs)
+        finally:
+            context.db_read_replica = previous
+    return wrapper
+
+
+def pin_primary():
+    """ Fuerza el primario para el resto del request (read-after-write) """
+    get_request_context().db_pinned_primary = True
@@ -0,0 +1,101 @@
+import gzip
+import hashlib
+import threading
+from pathlib import Path
+
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseNotModified
+from django.views.decorators.http import require_GET
+from drf_yasg import openapi
+from drf_yasg.codecs import OpenAPICodecJson
+from drf_yasg.generators import OpenAPISchemaGenerator
+
+from config.shared.constants.envs_constants import env
+
+
+OPENAPI_INFO = openapi.Info(
+    title="ERP API",
+    default_version='v1',
+    description="API description",
+    terms_of_service="https://www.google.com/policies/terms/",
+    contact=openapi.Contact(email="contact@myapi.local"),
+    license=openapi.License(name="BSD License"),
+)
+
+
+class CompiledSchema:
+    """ Schema ya serializado: body, body gzip y ETag (sha256 del contenido) """
+    __slots__ = ('content', 'gzip_content', 'etag')
+
+    def __init__(self, content):
+        self.content = content
+        self.gzip_content = gzip.compress(content, mtime=0)
+        self.etag = f'"{hashlib.sha256(content).hexdigest()[:32]}"'
+
+
+class OpenApiSchemaStaticHelper:
+    _compiled = None
+    _lock = threading.Lock()
+
+    @staticmethod
+    def schema_path():
+        """ None sin APP_VERSION: un archivo sin versión quedaría servido en todos los deploys """
+        version = getattr(settings, 'OPENAPI_SCHEMA_VERSION', None)
+        if not version:
+            return None
+        return Path(settings.OPENAPI_SCHEMA_DIR) / f'openapi-{version}.json'
+
+    @staticmethod
+    def generate():
+        """ Introspección completa de views/serializers (drf_yasg): costoso """
+        generator = OpenAPISchemaGenerator(
+            info=OPENAPI_INFO, url=env.str('API_BASE_URL'))
+        schema = generator.get_schema(request=None, public=True)
+        return OpenAPICodecJson(validators=[]).encode(schema)
+
+    @staticmethod
+    def write(path=None):
+        path = Path(path or OpenApiSchemaStaticHelper.schema_path())
+        path.parent.mkdir(parents=True, exist_ok=True)
+        content = OpenApiSchemaStaticHelper.generate()
+        path.write_bytes(content)
+        path.with_suffix('.json.gz').write_bytes(
+            gzip.compress(content, mtime=0))
+        return path, content
+
+    @staticmethod
+    def get_compiled():
+        """
+        Archivo versionado generado en el deploy (generate_openapi_schema);
+        si no existe se genera una vez por proceso.
+        """
+        if OpenApiSchemaStaticHelper._compiled is None:
+            with OpenApiSchemaStaticHelper._lock:
+                if OpenApiSchemaStaticHelper._compiled is None:
+                    path = OpenApiSchemaStaticHelper.schema_path()
+                    if path is not None and path.exists():
+                        content = path.read_bytes()
+                    else:
+                        content = OpenApiSchemaStaticHelper.generate()
+                    OpenApiSchemaStaticHelper._compiled = CompiledSchema(content)
+        return OpenApiSchemaStaticHelper._compiled
+
+
+@require_GET
+def openapi_schema_view(request):
+    compiled = OpenApiSchemaStaticHelper.get_compiled()
+
+    if request.META.get('HTTP_IF_NONE_MATCH') == compiled.etag:
+        response = HttpResponseNotModified()
+    elif 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', ''):
+        response = HttpResponse(
+            compiled.gzip_content, content_type='application/json')
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response = HttpResponse(
+            compiled.content, content_type='application/json')
+
+    response['ETag'] = compiled.etag
+    response['Vary'] = 'Accept-Encoding'
+    response['Cache-Control'] = 'public, max-age=0, must-revalidate'
+    return response
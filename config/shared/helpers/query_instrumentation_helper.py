@@ -0,0 +1,117 @@
+import heapq
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from django.db import connections
+
+
+_IN_LIST_RE = re.compile(r'\((?:\s*%s\s*,)+\s*%s\s*\)')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+
+def fingerprint_sql(sql):
+    """ Normaliza el statement: los params ya vienen separados (%s), solo se colapsan IN (...) y espacios """
+    sql = _IN_LIST_RE.sub('(%s...)', sql)
+    return _WHITESPACE_RE.sub(' ', sql).strip()
+
+
+class QueryStats:
+    """ Métricas SQL acumuladas en un bloque (request, service, test) """
+
+    def __init__(self, slowest_count=5):
+        self.count = 0
+        self.total_time = 0.0
+        self.fingerprints = Counter()
+        self.slowest_count = slowest_count
+        self._slowest = []  # min-heap (duration, seq, sql)
+
+    def record(self, sql, duration):
+        self.count += 1
+        self.total_time += duration
+        self.fingerprints[fingerprint_sql(sql)] += 1
+        item = (duration, self.count, sql)
+        if len(self._slowest) < self.slowest_count:
+            heapq.heappush(self._slowest, item)
+        elif duration > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, item)
+
+    @property
+    def duplicates(self):
+        """ fingerprint -> veces ejecutado, solo los repetidos """
+        return {sql: n for sql, n in self.fingerprints.items() if n > 1}
+
+    @property
+    def duplicate_count(self):
+        return sum(n - 1 for n in self.fingerprints.values())
+
+    @property
+    def max_repeated(self):
+        return max(self.fingerprints.values(), default=0)
+
+    @property
+    def slowest(self):
+        return [(sql, duration) for duration, _, sql in sorted(self._slowest, reverse=True)]
+
+    def as_dict(self):
+        return {
+            'count': self.count,
+            'total_time': round(self.total_time, 6),
+            'duplicates': self.duplicates,
+            'slowest': self.slowest,
+        }
+
+
+class _QueryRecorder:
+    def __init__(self, stats):
+        self.stats = stats
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.stats.record(sql, time.perf_counter() - start)
+
+
+@contextmanager
+def instrument_queries(slowest_count=5, using=None, stats=None):
+    """
+    Registra todas las queries ejecutadas dentro del bloque.
+        with instrument_queries() as stats:
+            ...
+        stats.count, stats.total_time, stats.duplicates, stats.slowest
+    Con `stats` se sigue acumulando en uno existente (ej. el body de un streaming response).
+    """
+    if stats is None:
+        stats = QueryStats(slowest_count=slowest_count)
+    recorder = _QueryRecorder(stats)
+    aliases = [using] if using else [conn.alias for conn in connections.all()]
+    with ExitStack() as stack:
+        for alias in aliases:
+            stack.enter_context(connections[alias].execute_wrapper(recorder))
+        yield stats
+
+
+@contextmanager
+def assert_query_budget(max_queries, max_repeated=None, using=None):
+    """
+    Helper para tests: falla si el bloque excede el presupuesto de queries.
+        with assert_query_budget(max_queries=4, max_repeated=1):
+            client.get('/api/...')
+    """
+    with instrument_queries(using=using) as stats:
+        yield stats
+
+    errors = []
+    if stats.count > max_queries:
+        errors.append(
+            f"se ejecutaron {stats.count} queries (presupuesto: {max_queries})")
+    if max_repeated is not None and stats.max_repeated > max_repeated:
+        errors.append(
+            f"statement repetido {stats.max_repeated} veces (máximo: {max_repeated})")
+    if errors:
+        detail = '\n'.join(
+            f"  {n}x {sql}" for sql, n in sorted(stats.duplicates.items(), key=lambda x: -x[1]))
+        raise AssertionError('; '.join(errors) + (f"\nRepetidos:\n{detail}" if detail else ''))
@@ -0,0 +1,40 @@
+from contextvars import ContextVar
+
+
+class RequestContext:
+    """
+    Estado por request. Los services son singletons por proceso (DI), por lo que
+    cualquier dato propio de un request (ej. pre_instance del update) vive aquí
+    y no en el service.
+    """
+
+    def __init__(self, request=None):
+        self.request = request
+        self.tenant = getattr(request, 'tenant_info', None)  # TenantInfo (CustomMiddleware)
+        self.pre_instance = None
+        self.user_scope = None  # UserScope del usuario autenticado (row-level filters)
+        self.db_read_replica = False  # lecturas habilitadas contra réplicas (list/detail)
+        self.db_pinned_primary = False  # hubo una escritura: el resto del request lee del primario
+        self.db_replica_used = False  # alguna lectura salió de una réplica (no se cachea)
+
+
+_request_context: ContextVar = ContextVar('request_context', default=None)
+
+
+def get_request_context() -> RequestContext:
+    context = _request_context.get()
+    if context is None:
+        # fuera de un request (shell, commands): contexto del thread.
+        # Los jobs y los callbacks por tenant abren el suyo con start_request_context()
+        # para no heredar estado de la ejecución anterior en el mismo thread.
+        context = RequestContext()
+        _request_context.set(context)
+    return context
+
+
+def start_request_context(request=None):
+    return _request_context.set(RequestContext(request))
+
+
+def end_request_context(token):
+    _request_context.reset(token)
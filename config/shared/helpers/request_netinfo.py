@@ -1,6 +1,9 @@
+from functools import lru_cache
 from ipaddress import ip_address
 from typing import Dict, List
 
+USER_AGENT_CACHE_SIZE = 1024
+
 
 def _parse_ip_list(xff: str) -> List[str]:
     if not xff:
@@ -16,7 +19,45 @@ def _parse_ip_list(xff: str) -> List[str]:
     return out
 
 
+def _base_request(request):
+    # DRF Request -> HttpRequest: el memo queda en el request compartido por todo el stack
+    return getattr(request, "_request", request)
+
+
+@lru_cache(maxsize=USER_AGENT_CACHE_SIZE)
+def parse_user_agent(ua_string: str):
+    """ Parseo del UA (regex de ua-parser) compartido entre requests por UA string """
+    from user_agents import parse
+    return parse(ua_string)
+
+
+def get_user_agent(request):
+    """ UA parseado bajo demanda (reemplaza request.user_agent de UserAgentMiddleware) """
+    base_request = _base_request(request)
+    user_agent = getattr(base_request, "_parsed_user_agent", None)
+    if user_agent is None:
+        meta = getattr(base_request, "META", {}) or {}
+        user_agent = parse_user_agent(meta.get("HTTP_USER_AGENT", "") or "")
+        try:
+            base_request._parsed_user_agent = user_agent
+        except AttributeError:
+            pass
+    return user_agent
+
+
 def get_request_netinfo(request) -> Dict[str, object]:
+    base_request = _base_request(request)
+    netinfo = getattr(base_request, "_netinfo", None)
+    if netinfo is None:
+        netinfo = _build_request_netinfo(base_request)
+        try:
+            base_request._netinfo = netinfo
+        except AttributeError:
+            pass
+    return netinfo
+
+
+def _build_request_netinfo(request) -> Dict[str, object]:
     meta = getattr(request, "META", {}) or {}
 
     xff_raw = meta.get("HTTP_X_FORWARDED_FOR", "") or ""
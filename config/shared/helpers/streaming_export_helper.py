@@ -0,0 +1,66 @@
+import csv
+import json
+
+from django.http import StreamingHttpResponse
+
+from config.shared.constants.constants import EXPORT_FORMAT_KEY, EXPORT_FORMATS
+from config.shared.exceptions.bad_request_exception import BadRequestException
+
+
+class _EchoBuffer:
+    """Pseudo-buffer: csv.writer escribe y devolvemos la línea sin acumular."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_cell(value):
+    if value is None:
+        return ''
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, default=str, ensure_ascii=False)
+    return value
+
+
+def stream_ndjson(rows):
+    for row in rows:
+        yield json.dumps(row, default=str, ensure_ascii=False) + '\n'
+
+
+def stream_csv(rows, header=None):
+    writer = csv.writer(_EchoBuffer())
+    # header del service (campos de serializer2): también se emite sin filas
+    if header is not None:
+        yield writer.writerow(header)
+    for row in rows:
+        if header is None:
+            header = list(row.keys())
+            yield writer.writerow(header)
+        yield writer.writerow([_csv_cell(row.get(key)) for key in header])
+
+
+def get_export_format(request):
+    export_format = request.GET.get(EXPORT_FORMAT_KEY)
+    if not export_format:
+        return None
+    export_format = export_format.lower()
+    if export_format not in EXPORT_FORMATS:
+        raise BadRequestException(
+            message=f"Formato de exportación '{export_format}' no soportado",
+            data={'formats': list(EXPORT_FORMATS)}
+        )
+    return export_format
+
+
+def build_streaming_export_response(rows, export_format, filename, header=None):
+    if export_format == 'csv':
+        response = StreamingHttpResponse(
+            stream_csv(rows, header), content_type='text/csv; charset=utf-8')
+    else:
+        response = StreamingHttpResponse(
+            stream_ndjson(rows), content_type='application/x-ndjson')
+
+    response['Content-Disposition'] = f'attachment; filename="{filename}.{export_format}"'
+    # evita que proxies (nginx) bufferen la respuesta completa
+    response['X-Accel-Buffering'] = 'no'
+    return response
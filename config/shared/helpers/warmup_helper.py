@@ -0,0 +1,152 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connections
+from django.urls import URLPattern, URLResolver, get_resolver
+from prometheus_client import Gauge
+
+from config.shared.serializers.compiled_serializer import get_compiled_serializer
+
+
+logger = logging.getLogger(__name__)
+
+# con PROMETHEUS_MULTIPROC_DIR cada worker escribe su valor y el export toma el
+# máximo entre los workers vivos; sin multiproceso es el valor del worker que responde
+worker_warmup_seconds = Gauge(
+    'django_worker_warmup_seconds',
+    'Duración del warm-up del worker por etapa',
+    ['stage'],
+    multiprocess_mode='livemax',
+)
+
+
+class WarmupStaticHelper:
+    """
+    Prepara el worker antes de recibir tráfico: el primer request debe costar
+    lo mismo que cualquier otro.
+    - post-fork (gunicorn post_worker_init): run() completo.
+    - pre-fork (preload_app): run(open_connections=False, observe=False); las
+      conexiones no deben heredarse entre procesos y el master no expone métricas.
+    - db_connections: las conexiones de Django son thread-local; solo se abren
+      cuando el worker atiende los requests en el thread que hace el warm-up
+      (sync con GUNICORN_THREADS=1). Cache y ES son por proceso y se abren siempre.
+    """
+
+    @staticmethod
+    def run(open_connections=True, db_connections=True, observe=True):
+        stages = [
+            ('urls', WarmupStaticHelper.warm_urls),
+            ('views', WarmupStaticHelper.warm_views),
+            ('openapi', WarmupStaticHelper.warm_openapi),
+        ]
+        if open_connections:
+            stages.append(('connections', lambda: WarmupStaticHelper.warm_connections(db=db_connections)))
+
+        total_start = time.perf_counter()
+        report = {}
+        for stage, step in stages:
+            start = time.perf_counter()
+            try:
+                report[stage] = step()
+            except Exception as e:
+                # el warm-up nunca debe impedir que el worker arranque
+                report[stage] = f'error: {e}'
+                logger.exception('Warm-up %s falló', stage)
+            if observe:
+                worker_warmup_seconds.labels(stage=stage).set(
+                    time.perf_counter() - start)
+
+        total = time.perf_counter() - total_start
+        if observe:
+            worker_warmup_seconds.labels(stage='total').set(total)
+        logger.info('Warm-up del worker en %.3fs: %s', total, report)
+        return report
+
+    # ---------------------------
+    # etapas
+    # ---------------------------
+    @staticmethod
+    def iter_url_patterns(patterns=None):
+        if patterns is None:
+            patterns = get_resolver().url_patterns
+        for pattern in patterns:
+            if isinstance(pattern, URLResolver):
+                yield from WarmupStaticHelper.iter_url_patterns(pattern.url_patterns)
+            elif isinstance(pattern, URLPattern):
+                yield pattern
+
+    @staticmethod
+    def warm_urls():
+        resolver = get_resolver()
+        # compila regex y reverse_dict de todo el árbol
+        resolver.reverse_dict
+        count = 0
+        for pattern in WarmupStaticHelper.iter_url_patterns():
+            pattern.pattern.regex
+            count += 1
+        return count
+
+    @staticmethod
+    def warm_views():
+        warmed, services = 0, {}
+        for pattern in WarmupStaticHelper.iter_url_patterns():
+            view_class = getattr(pattern.callback, 'view_class', None)
+            if view_class is None:
+                continue
+            try:
+                # __init__ de las views resuelve el grafo de services (DI)
+                view = view_class(**getattr(pattern.callback, 'view_initkwargs', {}))
+            except Exception:
+                logger.debug('Warm-up: no se pudo instanciar %s', view_class)
+                continue
+            service = getattr(view, 'service', None)
+            if service is not None and id(service) not in services:
+                services[id(service)] = service
+            warmed += 1
+
+        for service in services.values():
+            try:
+                WarmupStaticHelper.warm_service(service)
+            except Exception:
+                logger.debug('Warm-up: falló el service %s', type(service))
+        return {'views': warmed, 'services': len(services)}
+
+    @staticmethod
+    def warm_service(service):
+        for attr in ('serializer', 'serializer2'):
+            serializer_class = getattr(service, attr, None)
+            if isinstance(serializer_class, type):
+                serializer_class().fields  # field map de DRF
+        serializer2 = getattr(service, 'serializer2', None)
+        if isinstance(serializer2, type):
+            get_compiled_serializer(serializer2)
+
+        filter_class = getattr(service, 'filter', None)
+        repository = getattr(service, 'repository', None)
+        if isinstance(filter_class, type) and repository is not None:
+            filter_class(data={}, queryset=repository.model.objects.none()).form
+
+    @staticmethod
+    def warm_openapi():
+        from config.shared.helpers.openapi_schema_helper import OpenApiSchemaStaticHelper
+        return len(OpenApiSchemaStaticHelper.get_compiled().content)
+
+    @staticmethod
+    def warm_connections(db=True):
+        opened = []
+        if db:
+            for alias in connections:
+                connections[alias].ensure_connection()
+                opened.append(alias)
+
+        cache.get('worker_warmup')
+        opened.append('cache')
+
+        if getattr(settings, 'ES_URL', None):
+            # crea el cliente del proceso (el mismo que usan login y jobs) y abre su pool
+            from webhooks.services.auditoria_log_service import get_es_log_service
+            if get_es_log_service().ping(timeout=3):
+                opened.append('elasticsearch')
+        return opened
@@ -0,0 +1,79 @@
+import time
+
+import django
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+from prometheus_client import Counter
+
+
+db_connections_opened = Counter(
+    'django_db_connections_opened_total',
+    'Conexiones nuevas a la base de datos',
+    ['alias'],
+)
+db_connections_reused = Counter(
+    'django_db_connections_reused_total',
+    'Requests que reutilizaron una conexión persistente',
+    ['alias'],
+)
+db_connections_unusable = Counter(
+    'django_db_connections_unusable_total',
+    'Conexiones persistentes descartadas por el health check',
+    ['alias'],
+)
+
+# Django >= 4.1 hace el health check nativo con CONN_HEALTH_CHECKS
+NATIVE_HEALTH_CHECKS = django.VERSION >= (4, 1)
+
+
+def _on_connection_created(sender, connection, **kwargs):
+    db_connections_opened.labels(alias=connection.alias).inc()
+
+
+connection_created.connect(
+    _on_connection_created, dispatch_uid='db_connection_middleware_created')
+
+
+class DBConnectionMiddleware:
+    """
+    Métricas de reutilización de conexiones persistentes (CONN_MAX_AGE) y
+    health check antes de usar una conexión que quedó abierta de otro request.
+    El ping (is_usable, un SELECT 1) solo se hace si la conexión estuvo inactiva
+    más de DB_CONN_HEALTH_CHECK_IDLE segundos: con tráfico continuo no cuesta nada.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.idle_threshold = getattr(settings, 'DB_CONN_HEALTH_CHECK_IDLE', 30)
+
+    def __call__(self, request):
+        self.check_connections()
+        try:
+            return self.get_response(request)
+        finally:
+            self.mark_used()
+
+    def check_connections(self):
+        now = time.monotonic()
+        for conn in connections.all():
+            if conn.connection is None:
+                continue
+            db_connections_reused.labels(alias=conn.alias).inc()
+            if NATIVE_HEALTH_CHECKS or not conn.settings_dict.get('CONN_HEALTH_CHECKS'):
+                continue
+            # las conexiones son por thread: el atributo vive en el wrapper de este thread
+            last_used = getattr(conn, '_health_check_last_used', None)
+            if last_used is not None and now - last_used < self.idle_threshold:
+                continue
+            if not conn.is_usable():
+                # el server la cerró (restart, idle timeout, pgbouncer): se reabre al usarla
+                db_connections_unusable.labels(alias=conn.alias).inc()
+                conn.close()
+
+    @staticmethod
+    def mark_used():
+        now = time.monotonic()
+        for conn in connections.all():
+            if conn.connection is not None:
+                conn._health_check_last_used = now
@@ -0,0 +1,62 @@
+import orjson
+from django.http import HttpResponse, JsonResponse
+from rest_framework import status
+
+from config.shared.renderers.orjson_renderer import ORJSON_OPTIONS, orjson_default
+
+
+DEFAULT_MESSAGES = {
+    status.HTTP_401_UNAUTHORIZED: "Authentication credentials were not provided.",
+    # With mixins, PermissionRequiredViewMixin raise exception before calling the view and handle_rest_exception_helper handle the exception
+    status.HTTP_403_FORBIDDEN: "Permission denied",
+}
+
+NOT_FOUND_CONTENT = orjson.dumps({
+    'status': status.HTTP_404_NOT_FOUND,
+    'error': 'Resource not found',
+})
+
+
+class ErrorNormalizationMiddleware:
+    """
+    Unifica 401/403/404 (antes Custom404Middleware, CustomUnauthorizedMiddleware
+    y CustomForbiddenMiddleware). El resto de responses pasa sin tocarse.
+    - 401/403: shape {status, message, data}; si la Response de DRF ya lo tiene
+      (handle_rest_exception_helper) se devuelve tal cual, sin re-serializar.
+    - 404: todo lo que no sea JsonResponse se reemplaza por el body genérico.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        status_code = response.status_code
+
+        if status_code in DEFAULT_MESSAGES:
+            return self._normalize_error(response, status_code)
+        if status_code == status.HTTP_404_NOT_FOUND and not isinstance(response, JsonResponse):
+            return HttpResponse(NOT_FOUND_CONTENT, status=status.HTTP_404_NOT_FOUND, content_type='application/json')
+        return response
+
+    @staticmethod
+    def _normalize_error(response, status_code):
+        data = getattr(response, 'data', None)
+        if not isinstance(data, dict):
+            data = {}
+
+        response_data = {
+            "status": status_code,
+            "message": data.get("message") if data.get("message") else DEFAULT_MESSAGES[status_code],
+            "data": data.get("data") if data.get("data") else None,
+        }
+        if data == response_data and not getattr(response, 'streaming', False):
+            # ya renderizado con el shape correcto
+            return response
+
+        return HttpResponse(
+            orjson.dumps(response_data, default=orjson_default,
+                         option=ORJSON_OPTIONS),
+            status=status_code,
+            content_type='application/json',
+        )
@@ -0,0 +1,92 @@
+import logging
+
+from django.conf import settings
+from prometheus_client import Histogram
+
+from config.shared.helpers.query_instrumentation_helper import instrument_queries
+
+
+logger = logging.getLogger(__name__)
+
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, float('inf'))
+
+db_queries_per_request = Histogram(
+    'django_request_db_queries',
+    'Queries SQL ejecutadas por request',
+    ['view'],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+db_query_time_per_request = Histogram(
+    'django_request_db_query_seconds',
+    'Tiempo total en SQL por request',
+    ['view'],
+)
+db_duplicate_queries_per_request = Histogram(
+    'django_request_db_duplicate_queries',
+    'Queries SQL repetidas (mismo fingerprint) por request',
+    ['view'],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+
+
+class QueryInstrumentationMiddleware:
+    """
+    Mide las queries de cada request (count, tiempo, fingerprints repetidos y
+    las más lentas), las exporta por view class y avisa de posibles N+1.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, 'QUERY_INSTRUMENTATION_ENABLED', True)
+        self.n_plus_one_threshold = getattr(
+            settings, 'QUERY_N_PLUS_ONE_THRESHOLD', 10)
+        self.slowest_count = getattr(settings, 'QUERY_SLOWEST_COUNT', 5)
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        with instrument_queries(slowest_count=self.slowest_count) as stats:
+            response = self.get_response(request)
+
+        view = getattr(request, '_instrumented_view', None)
+        if view is None:
+            # sin view resuelta (404, static, etc.)
+            return response
+
+        if response.streaming:
+            # las queries del body (ej. exportaciones) corren al iterarlo, después de este middleware
+            response.streaming_content = self._instrument_stream(
+                response.streaming_content, request, view, stats)
+            return response
+
+        self._observe(request, view, stats)
+        return response
+
+    def _instrument_stream(self, content, request, view, stats):
+        try:
+            with instrument_queries(stats=stats):
+                yield from content
+        finally:
+            self._observe(request, view, stats)
+
+    def _observe(self, request, view, stats):
+        db_queries_per_request.labels(view=view).observe(stats.count)
+        db_query_time_per_request.labels(view=view).observe(stats.total_time)
+        db_duplicate_queries_per_request.labels(
+            view=view).observe(stats.duplicate_count)
+
+        if stats.max_repeated >= self.n_plus_one_threshold:
+            sql, times = max(stats.duplicates.items(), key=lambda x: x[1])
+            logger.warning(
+                'Posible N+1 en %s %s (%s): %s queries, %.3fs, statement repetido %sx: %s | más lentas: %s',
+                request.method, request.path, view, stats.count, stats.total_time,
+                times, sql, stats.slowest,
+            )
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'view_class', None) or getattr(
+            view_func, 'cls', None)
+        request._instrumented_view = view_class.__name__ if view_class else getattr(
+            view_func, '__name__', 'unknown')
+        return None
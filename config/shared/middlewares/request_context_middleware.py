@@ -0,0 +1,13 @@
+from config.shared.helpers.request_context_helper import start_request_context, end_request_context
+
+
+class RequestContextMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        token = start_request_context(request)
+        try:
+            return self.get_response(request)
+        finally:
+            end_request_context(token)
@@ -0,0 +1,19 @@
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser
+
+from config.shared.renderers.orjson_renderer import ORJSONRenderer
+
+
+class ORJSONParser(BaseParser):
+    """
+    Parser JSON basado en orjson (reemplaza a JSONParser de DRF).
+    """
+    media_type = 'application/json'
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f'JSON parse error - {exc}')
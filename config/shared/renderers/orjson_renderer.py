@@ -0,0 +1,48 @@
+import datetime
+import decimal
+
+import orjson
+from django.utils.functional import Promise
+from rest_framework.renderers import BaseRenderer
+
+
+ORJSON_OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+def orjson_default(obj):
+    # UUID, datetime, date y time los serializa orjson de forma nativa
+    if isinstance(obj, decimal.Decimal):
+        return float(obj)
+    if isinstance(obj, Promise):  # gettext_lazy
+        return str(obj)
+    if isinstance(obj, datetime.timedelta):
+        return str(obj.total_seconds())
+    if isinstance(obj, bytes):
+        return obj.decode()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    if hasattr(obj, 'tolist'):
+        return obj.tolist()
+    if hasattr(obj, '__iter__'):  # QuerySet, generadores
+        return list(obj)
+    raise TypeError(f'Type is not JSON serializable: {type(obj).__name__}')
+
+
+class ORJSONRenderer(BaseRenderer):
+    """
+    Renderer JSON basado en orjson, compatible con el shape de JSONRenderer de DRF.
+    """
+    media_type = 'application/json'
+    format = 'json'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        options = ORJSON_OPTIONS
+        renderer_context = renderer_context or {}
+        if renderer_context.get('indent') or 'indent' in (accepted_media_type or ''):
+            options |= orjson.OPT_INDENT_2
+
+        return orjson.dumps(data, default=orjson_default, option=options)
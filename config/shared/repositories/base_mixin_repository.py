@@ -11,6 +11,11 @@ class ReadRepositoryMixin:
     def find_all_by_pk_list_and_attrs(self, pks: list, params: dict):
         return self.model.objects.filter(pk__in=pks, **params)
 
+    def find_all_by_attr_in(self, attr: str, values):
+        queryset = self.model.objects.filter(**{f'{attr}__in': values})
+        # mismo orden que .first() (Meta.ordering o pk): "el primero por valor" es determinista
+        return queryset if queryset.ordered else queryset.order_by('pk')  # return queryset
+
     def find_one(self, pk):
         return self.model.objects.filter(pk=pk).first()  # return instance
 
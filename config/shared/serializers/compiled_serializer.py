@@ -0,0 +1,121 @@
+from functools import lru_cache
+from operator import attrgetter
+
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.fields import SkipField
+from rest_framework.relations import PKOnlyObject
+
+
+# campos cuyo to_representation es trivial para valores que vienen del modelo.
+# Se compara el tipo exacto: una subclase puede redefinir to_representation
+_IDENTITY_FIELDS = (serializers.BooleanField,)
+_STR_FIELDS = (serializers.CharField,)
+_INT_FIELDS = (serializers.IntegerField,)
+
+
+class CompiledReadSerializer:
+    """
+    Plan de solo lectura generado a partir de un ModelSerializer (serializer2).
+    Produce el mismo shape que `serializer(instances, many=True).data`, pero
+    evitando el dispatch por campo de DRF en los campos simples del modelo.
+    La validación sigue siendo responsabilidad de DRF.
+    """
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        # instancia "plantilla": los campos quedan bound (SerializerMethodField, etc.)
+        self._template = serializer_class()
+        model = serializer_class.Meta.model
+        self.plan = [
+            (name, *self._compile_field(field, model))
+            for name, field in self._template.fields.items()
+            if not field.write_only
+        ]
+
+    # ---------------------------
+    # compilación
+    # ---------------------------
+    def _compile_field(self, field, model):
+        attname = self._fast_attname(field, model)
+        if attname is None:
+            return False, field.get_attribute, field.to_representation, None
+
+        field_type = type(field)
+        if field_type is serializers.PrimaryKeyRelatedField:
+            to_repr = None
+        elif field_type is serializers.UUIDField and field.uuid_format == 'hex_verbose':
+            to_repr = str
+        elif field_type in _IDENTITY_FIELDS:
+            to_repr = None
+        elif field_type in _STR_FIELDS:
+            to_repr = str
+        elif field_type in _INT_FIELDS:
+            to_repr = int
+        else:
+            to_repr = field.to_representation
+        return True, attrgetter(attname), to_repr, attname
+
+    @staticmethod
+    def _fast_attname(field, model):
+        if field.source == '*' or len(field.source_attrs) != 1:
+            return None
+        # serializers anidados (FK/OneToOne -> dict) y relaciones que no son el pk crudo
+        if isinstance(field, (serializers.BaseSerializer, serializers.ManyRelatedField)):
+            return None
+        pk_only = type(field) is serializers.PrimaryKeyRelatedField and field.pk_field is None
+        if isinstance(field, serializers.RelatedField) and not pk_only:
+            return None
+        try:
+            model_field = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            return None
+        if not getattr(model_field, 'concrete', False) or model_field.many_to_many:
+            return None
+        # attname de un FK es el id: solo equivale a DRF si el campo es el PrimaryKeyRelatedField
+        if model_field.is_relation and not pk_only:
+            return None
+        return model_field.attname
+
+    # ---------------------------
+    # ejecución
+    # ---------------------------
+    def to_representation(self, instance):
+        is_row = isinstance(instance, dict)
+        ret = {}
+        for name, fast, getter, to_repr, attname in self.plan:
+            if fast:
+                value = instance.get(attname) if is_row else getter(instance)
+                if value is None or to_repr is None:
+                    ret[name] = value
+                else:
+                    ret[name] = to_repr(value)
+                continue
+
+            # mismo camino que Serializer.to_representation de DRF
+            try:
+                attribute = getter(instance)
+            except SkipField:
+                continue
+            check_for_none = attribute.pk if isinstance(
+                attribute, PKOnlyObject) else attribute
+            ret[name] = None if check_for_none is None else to_repr(attribute)
+        return ret
+
+    def serialize_many(self, instances):
+        to_representation = self.to_representation
+        return [to_representation(instance) for instance in instances]
+
+
+def is_compilable(serializer_class):
+    if serializer_class is None or not issubclass(serializer_class, serializers.ModelSerializer):
+        return False
+    # un to_representation propio cambia el shape: se deja a DRF
+    return serializer_class.to_representation is serializers.Serializer.to_representation
+
+
+@lru_cache(maxsize=None)
+def get_compiled_serializer(serializer_class):
+    if not is_compilable(serializer_class):
+        return None
+    return CompiledReadSerializer(serializer_class)
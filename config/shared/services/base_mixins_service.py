@@ -4,8 +4,11 @@ from config.shared.exceptions.resource_not_found_exception import ResourceNotFou
 from config.shared.exceptions.invalid_fields_exception import InvalidFieldsException
 from django.core.paginator import Paginator, EmptyPage, PageNotAnInteger
 
-from config.shared.constants.constants import PAGINATION_DEFAULT_PAGE_NUMBER, PAGINATION_DEFAULT_PAGE_SIZE
+from config.shared.constants.constants import PAGINATION_DEFAULT_PAGE_NUMBER, PAGINATION_DEFAULT_PAGE_SIZE, EXPORT_DEFAULT_CHUNK_SIZE
 from config.shared.utils.common_utils import humanize_model_name
+from config.shared.serializers.compiled_serializer import get_compiled_serializer
+from config.shared.helpers.request_context_helper import get_request_context
+from config.shared.services.common.user_scope_static_helper import UserScopeStaticHelper
 
 
 class SafePaginationMixin:
@@ -99,9 +102,14 @@ class SerializationServiceMixin:
     serializer = None  # model serializer
     serializer2 = None  # response
     serializer_upd = None  # update
+    use_compiled_serializer = True  # read path (many=True) sin dispatch de DRF
 
     def serialize(self, instance, many=False):
         if self.serializer2:
+            if many and self.use_compiled_serializer:
+                compiled = get_compiled_serializer(self.serializer2)
+                if compiled is not None:
+                    return compiled.serialize_many(instance)
             return self.serializer2(instance, many=many).data
         raise NotImplementedError("serializer2 not defined")
 
@@ -191,6 +199,58 @@ class FindServiceMixin:
         return instance
 
 
+class ExportServiceMixin:
+    EXPORT_CHUNK_SIZE = EXPORT_DEFAULT_CHUNK_SIZE
+
+    def find_all_queryset(self, filter_params=None, user_id=None, ignorar_user=False):
+        """
+        Queryset de find_all (filtros + scope de usuario + find_all_extended_qs), sin paginar.
+        find_all y la exportación pasan por aquí: si un service cambia la consulta del
+        listado, debe sobrescribir este hook y no solo find_all.
+        """
+        if hasattr(self, '_filter_by_user_logic_mx'):
+            queryset = self.find_all_mx(
+                self.filter, filter_params, user_id=user_id, ignorar_user=ignorar_user)
+        elif hasattr(self, '_filter_by_sales_logic_mx'):
+            queryset = self.find_all_mx(
+                self.filter, filter_params, user_id=user_id)
+        else:
+            queryset = self.find_all_mx(self.filter, filter_params)
+
+        if hasattr(self, 'find_all_extended_qs'):
+            queryset = self.find_all_extended_qs(queryset, filter_params)
+        return queryset
+
+    def find_all_export_qs(self, filter_params=None, user_id=None, ignorar_user=False):
+        # mismo queryset que el listado
+        return self.find_all_queryset(filter_params, user_id=user_id, ignorar_user=ignorar_user)
+
+    def export_header(self):
+        """ Columnas del CSV (también con 0 filas); sobrescribir si find_all_post_serializer cambia el shape """
+        if self.serializer2 is None:
+            return None
+        return list(self.serializer2().fields.keys())
+
+    def iter_serialized(self, queryset, filter_params=None, chunk_size=None):
+        # server-side cursor + serializacion por bloques: memoria constante
+        chunk_size = chunk_size or self.EXPORT_CHUNK_SIZE
+        batch = []
+        for instance in queryset.iterator(chunk_size=chunk_size):
+            batch.append(instance)
+            if len(batch) >= chunk_size:
+                yield from self._serialize_export_batch(batch, filter_params)
+                batch = []
+        if batch:
+            yield from self._serialize_export_batch(batch, filter_params)
+
+    def _serialize_export_batch(self, batch, filter_params=None):
+        serialized_data = self.serialize(batch, many=True)
+        if hasattr(self, 'find_all_post_serializer'):
+            serialized_data = self.find_all_post_serializer(
+                serialized_data, filter_params)
+        return serialized_data
+
+
 class CreateServiceInstanceMixin:
     def create_mx_i(self, data):
         validated_data = self.validate_and_serialize(data)
@@ -203,9 +263,18 @@ class CreateServiceInstanceMixin:
         return model_instance
 
 
-class UpdateServiceMixin:
-    pre_instance = None
+class RequestStateServiceMixin:
+    # los services son singletons: el snapshot previo al update es estado del request
+    @property
+    def pre_instance(self):
+        return get_request_context().pre_instance
+
+    @pre_instance.setter
+    def pre_instance(self, value):
+        get_request_context().pre_instance = value
 
+
+class UpdateServiceMixin(RequestStateServiceMixin):
     def update_mx(self, pk, data):
         # repeat logic 'cause some mixins find_one (service) error in args:
         instance = self.repository.find_one(pk)
@@ -252,8 +321,9 @@ class CacheServiceMixin:
 # all models must inject user_repository
 class FindServiceSalesFilterMixin:
     def find_all_mx(self, filter=None, filter_params=None, order_by='id', order_by_direction='-', user_id=int):
-        user = self.user_repository.find_one(user_id)
-        if not user:
+        scope = UserScopeStaticHelper.get_user_scope(
+            user_id, self.user_repository)
+        if not scope:
             raise ResourceNotFoundException(
                 message=f"Recurso con id '{user_id}' no encontrado"
             )
@@ -271,21 +341,22 @@ class FindServiceSalesFilterMixin:
 
         # step 2: filter by empresa,area,depa,canal_venta,role,user,...
         queryset = self._filter_by_sales_logic_mx(
-            queryset, user
+            queryset, scope.user
         )
 
         return queryset
 
     def find_one_mx(self, pk, user_id):
-        user = self.user_repository.find_one(user_id)
-        if not user:
+        scope = UserScopeStaticHelper.get_user_scope(
+            user_id, self.user_repository)
+        if not scope:
             raise ResourceNotFoundException(
                 message=f"Usuario con id '{user_id}' no encontrado"
             )
 
         queryset = self.repository.find_one_qs(pk)
         queryset = self._filter_by_sales_logic_mx(
-            queryset, user
+            queryset, scope.user
         )
         instance = queryset.first()
         if not instance:
@@ -296,8 +367,9 @@ class FindServiceSalesFilterMixin:
         return instance
 
     def find_one_by_uuid_mx(self, uuid, user_id):
-        user = self.user_repository.find_one(user_id)
-        if not user:
+        scope = UserScopeStaticHelper.get_user_scope(
+            user_id, self.user_repository)
+        if not scope:
             raise ResourceNotFoundException(
                 message=f"Usuario con id '{user_id}' no encontrado"
             )
@@ -305,7 +377,7 @@ class FindServiceSalesFilterMixin:
 
         queryset = self.repository.find_all()
         queryset = self._filter_by_sales_logic_mx(
-            queryset, user
+            queryset, scope.user
         )
         instance = queryset.filter(uuid=uuid).first()
         if not instance:
@@ -316,15 +388,16 @@ class FindServiceSalesFilterMixin:
         return instance
 
     def find_one_by_attr_mx(self, attr, value, user_id):
-        user = self.user_repository.find_one(user_id)
-        if not user:
+        scope = UserScopeStaticHelper.get_user_scope(
+            user_id, self.user_repository)
+        if not scope:
             raise ResourceNotFoundException(
                 message=f"Usuario con id '{user_id}' no encontrado"
             )
 
         queryset = self.repository.find_all()
         queryset = self._filter_by_sales_logic_mx(
-            queryset, user
+            queryset, scope.user
         )
         instance = queryset.filter(**{attr: value}).first()
         if not instance:
@@ -335,27 +408,9 @@ class FindServiceSalesFilterMixin:
         return instance
 
     def _filter_by_sales_logic_mx(self, queryset, user):
-        is_superuser = user.is_superuser
-        if is_superuser or user.role == 'GERENCIA':
-            return queryset
-
-        # TODO: validate this filter logic with actual gerencia
-        if hasattr(self.repository.model, 'area') and user.role == 'ADMINISTRADOR':
-            queryset = queryset.filter(area=user.area)
-        elif hasattr(self.repository.model, 'departamento') and user.role == 'COORDINADOR':
-            queryset = queryset.filter(
-                departamento=user.departamento)
-        elif hasattr(self.repository.model, 'canal_venta') and user.role == 'SUPERVISOR':
-            queryset = queryset.filter(
-                canal_venta=user.canal_venta)
-        elif hasattr(self.repository.model, 'vendedor') and user.role == 'AGENTE':
-            queryset = queryset.filter(vendedor=user)
-
-        # tecnico - flota user
-        elif hasattr(self.repository.model, 'usuario_flota') and user.role == 'TECNICO':
-            queryset = queryset.filter(usuario_flota=user)
-
-        return queryset
+        # user: instancia de usuario; regla precompilada por (model, role)
+        scope = UserScopeStaticHelper.scope_of(user)
+        return UserScopeStaticHelper.apply_scope(queryset, self.repository.model, scope)
 
     # filter tecnicos by flota user
     def _filter_by_flota_user(self, queryset, flota_user=None):
@@ -365,9 +420,7 @@ class FindServiceSalesFilterMixin:
         return queryset
 
 
-class UpdateServiceSalesMixin:
-    pre_instance = None
-
+class UpdateServiceSalesMixin(RequestStateServiceMixin):
     def update_mx(self, pk, data, user):
         instance = self.repository.find_one(pk)
         if not instance:
@@ -394,6 +447,19 @@ class UpdateServiceSalesMixin:
 
 
 class UserValidatorMixin:
+    def find_active_user_scope(self, user_id):
+        scope = UserScopeStaticHelper.get_user_scope(
+            user_id, self.user_repository)
+        if not scope:
+            raise ResourceNotFoundException(
+                message=f"Usuario con id '{user_id}' no encontrado"
+            )
+        if not scope.state:
+            raise ResourceNotFoundException(
+                message=f"Usuario con id '{user_id}' inactivo"
+            )
+        return scope
+
     def find_active_user_instance(self, user_id):
         user = self.user_repository.find_one(user_id)
         if not user:
@@ -411,9 +477,9 @@ class UserValidatorMixin:
 # all models must inject user_repository
 class FindServiceGenericUserFilterMixin:
     def find_all_mx(self, filter=None, filter_params=None, order_by='id', order_by_direction='-', user_id=int, ignorar_user=False):
-        user = None
+        scope = None
         if not ignorar_user:
-            user = UserValidatorMixin.find_active_user_instance(self, user_id)
+            scope = UserValidatorMixin.find_active_user_scope(self, user_id)
         # print('------------- is_superuser:', user.is_superuser, '-------------')
 
         # step 1: general queryset
@@ -429,20 +495,20 @@ class FindServiceGenericUserFilterMixin:
         # step 2: filter by user logic
         if not ignorar_user:
             queryset = self._filter_by_user_logic_mx(
-                queryset, user
+                queryset, scope.user
             )
 
         return queryset
 
     def find_one_mx(self, pk, user_id):
-        user = UserValidatorMixin.find_active_user_instance(self, user_id)
-        if not user:
+        scope = UserValidatorMixin.find_active_user_scope(self, user_id)
+        if not scope:
             raise ResourceNotFoundException(
                 message=f"Usuario con id '{user_id}' no existe o está inactivo")
 
         queryset = self.repository.find_one_qs(pk)
         queryset = self._filter_by_user_logic_mx(
-            queryset, user
+            queryset, scope.user
         )
         instance = queryset.first()
         if not instance:
@@ -455,14 +521,14 @@ class FindServiceGenericUserFilterMixin:
         return instance
 
     def find_one_by_uuid_mx(self, uuid, user_id):
-        user = UserValidatorMixin.find_active_user_instance(self, user_id)
-        if not user:
+        scope = UserValidatorMixin.find_active_user_scope(self, user_id)
+        if not scope:
             raise ResourceNotFoundException(
                 message=f"Usuario con id '{user_id}' no existe o está inactivo")
 
         queryset = self.repository.find_one_by_uuid_qs(uuid)
         queryset = self._filter_by_user_logic_mx(
-            queryset, user
+            queryset, scope.user
         )
         instance = queryset.first()
         if not instance:
@@ -475,14 +541,14 @@ class FindServiceGenericUserFilterMixin:
         return instance
 
     def find_one_by_attr_mx(self, attr, value, user_id):
-        user = UserValidatorMixin.find_active_user_instance(self, user_id)
-        if not user:
+        scope = UserValidatorMixin.find_active_user_scope(self, user_id)
+        if not scope:
             raise ResourceNotFoundException(
                 message=f"Usuario con id '{user_id}' no existe o está inactivo")
 
         queryset = self.repository.find_one_by_attr_qs(attr, value)
         queryset = self._filter_by_user_logic_mx(
-            queryset, user
+            queryset, scope.user
         )
         instance = queryset.first()
         if not instance:
@@ -496,27 +562,9 @@ class FindServiceGenericUserFilterMixin:
 
     # helper methods -------------
     def _filter_by_user_logic_mx(self, queryset, user):
-        is_superuser = user.is_superuser
-        if is_superuser or user.role == 'GERENCIA':
-            return queryset
-
-        # TODO: validate this filter logic with actual gerencia
-        if hasattr(self.repository.model, 'area') and user.role == 'ADMINISTRADOR':
-            queryset = queryset.filter(area=user.area)
-        elif hasattr(self.repository.model, 'departamento') and user.role == 'COORDINADOR':
-            queryset = queryset.filter(
-                departamento=user.departamento)
-        elif hasattr(self.repository.model, 'canal_venta') and user.role == 'SUPERVISOR':
-            queryset = queryset.filter(
-                canal_venta=user.canal_venta)
-        elif hasattr(self.repository.model, 'vendedor') and user.role == 'AGENTE':
-            queryset = queryset.filter(vendedor=user)
-
-        # tecnico - flota user
-        elif hasattr(self.repository.model, 'usuario_flota') and user.role == 'TECNICO':
-            queryset = queryset.filter(usuario_flota=user)
-
-        return queryset
+        # user: instancia de usuario; regla precompilada por (model, role)
+        scope = UserScopeStaticHelper.scope_of(user)
+        return UserScopeStaticHelper.apply_scope(queryset, self.repository.model, scope)
 
 
 class CreateServiceGenericUserMixinOld:
@@ -6,10 +6,10 @@ from config.shared.exceptions.resource_not_found_exception import ResourceNotFou
 from config.shared.utils.common_utils import humanize_model_name, format_params
 
 # ## Service Mixins -----------------------
-from config.shared.services.base_mixins_service import PaginationServiceMixin, SerializationServiceMixin, FindServiceMixin, UpdateServiceMixin, CreateServiceInstanceMixin
+from config.shared.services.base_mixins_service import PaginationServiceMixin, SerializationServiceMixin, FindServiceMixin, UpdateServiceMixin, CreateServiceInstanceMixin, ExportServiceMixin
 
 
-class BaseServiceMixin(PaginationServiceMixin, SerializationServiceMixin, FindServiceMixin, CreateServiceInstanceMixin, UpdateServiceMixin):
+class BaseServiceMixin(PaginationServiceMixin, SerializationServiceMixin, FindServiceMixin, CreateServiceInstanceMixin, UpdateServiceMixin, ExportServiceMixin):
     # DI: inject the repository | other just args
     def __init__(self, repository, filter=None, serializer=None, serializer2=None, serializer_upd=None):
         self.repository = repository
@@ -31,6 +31,24 @@ class BaseServiceMixin(PaginationServiceMixin, SerializationServiceMixin, FindSe
         """
         return serialized_data
 
+    def post_serialize_join(self, serialized_data, related_service, related_attr, as_key, source_key='id', wrap_key=None):
+        """
+        Batch join for related entities: collects `source_key` from the serialized page, fetches all related instances in one `related_attr__in` query (through `related_service`) and joins them in memory under `as_key` (None if missing). If `wrap_key` is given each item becomes {wrap_key: item, as_key: related}.
+        """
+        items = list(serialized_data or [])
+        values = {item[source_key] for item in items if item.get(source_key) is not None}
+        related_by_value = related_service.find_all_serialized_by_attr_in(
+            related_attr, values) if values else {}
+
+        joined = []
+        for item in items:
+            related = related_by_value.get(item.get(source_key))
+            if wrap_key:
+                joined.append({wrap_key: item, as_key: related})
+            else:
+                joined.append({**item, as_key: related})
+        return joined
+
     def find_one_uuid_post_serializer(self, serialized_data, instance, filter_params=None):
         """
         This method is used to extend the serialized data after the serialization process when finding one instance by UUID. You must return the serialized data, even if you don't modify it.
@@ -51,8 +69,7 @@ class BaseServiceMixin(PaginationServiceMixin, SerializationServiceMixin, FindSe
 
     # ### MAIN methods ===========================
     def find_all(self, filter_params=None, page_number=PAGINATION_DEFAULT_PAGE_NUMBER, page_size=PAGINATION_DEFAULT_PAGE_SIZE):
-        queryset = self.find_all_mx(self.filter, filter_params)
-        new_qs = self.find_all_extended_qs(queryset, filter_params)
+        new_qs = self.find_all_queryset(filter_params)
 
         paginated_data = self.paginate_queryset(
             new_qs, page_number, page_size)
@@ -84,6 +101,24 @@ class BaseServiceMixin(PaginationServiceMixin, SerializationServiceMixin, FindSe
         instance = self.find_one_by_attr_mx(attr, value)
         return self.serialize(instance)
 
+    def find_all_serialized_by_attr_in(self, attr: str, values) -> dict:
+        """
+        Bulk version of find_one_by_attr: one query for all values, returns {value: serialized}. Like find_one_by_attr, the first match per value (same order as .first()) wins; where find_one_by_attr raises ResourceNotFoundException for an inactive instance, that value maps to None.
+        """
+        first_by_value = {}
+        for instance in self.repository.find_all_by_attr_in(attr, list(values)):
+            first_by_value.setdefault(getattr(instance, attr), instance)
+
+        active = [
+            instance for instance in first_by_value.values()
+            if not (hasattr(instance, 'state') and not instance.state)
+        ]
+        serialized = self.serialize(active, many=True)
+        serialized_by_value = {
+            getattr(instance, attr): item for instance, item in zip(active, serialized)
+        }
+        return {value: serialized_by_value.get(value) for value in first_by_value}
+
     def create(self, data) -> dict:
         return self.create_mx(data)
 
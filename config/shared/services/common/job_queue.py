@@ -0,0 +1,446 @@
+import importlib
+import logging
+import os
+import socket
+import threading
+import time
+import traceback
+import uuid
+
+import orjson
+from django.conf import settings
+from django.db import close_old_connections, transaction
+from prometheus_client import Counter, Histogram
+
+from config.shared.helpers.request_context_helper import (
+    end_request_context, get_request_context, start_request_context,
+)
+from config.shared.renderers.orjson_renderer import orjson_default
+
+
+logger = logging.getLogger(__name__)
+
+job_duration_seconds = Histogram(
+    'django_job_duration_seconds',
+    'Duración de la ejecución de un job',
+    ['task', 'queue'],
+)
+jobs_total = Counter(
+    'django_jobs_total',
+    'Jobs procesados por estado final del intento',
+    ['task', 'queue', 'status'],
+)
+
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_RETRYING = 'retrying'
+STATUS_SUCCEEDED = 'succeeded'
+STATUS_FAILED = 'failed'
+
+KEY_PREFIX = 'jobs'
+
+
+class Task:
+    """ Función registrada como job: nombre estable, cola y política de reintentos """
+    __slots__ = ('func', 'name', 'queue', 'max_retries', 'backoff', 'max_backoff')
+
+    def __init__(self, func, name, queue, max_retries, backoff, max_backoff):
+        self.func = func
+        self.name = name
+        self.queue = queue
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+
+    def __call__(self, *args, **kwargs):
+        return self.func(*args, **kwargs)
+
+    def retry_delay(self, attempt):
+        # backoff exponencial: backoff, 2*backoff, 4*backoff ... con tope
+        return min(self.backoff * (2 ** (attempt - 1)), self.max_backoff)
+
+    def delay(self, *args, **kwargs):
+        return enqueue(self, *args, **kwargs)
+
+    def delay_on_commit(self, *args, **kwargs):
+        return enqueue_on_commit(self, *args, **kwargs)
+
+
+TASK_REGISTRY = {}
+
+
+def job(name=None, queue='default', max_retries=3, backoff=5, max_backoff=300):
+    """
+    Registra una función como job:
+
+        @job(queue='email', max_retries=5)
+        def send_email(user_id): ...
+
+        send_email.delay_on_commit(user.id, idempotency_key=f'reset-{user.id}')
+
+    Los argumentos viajan como JSON: pasar ids/strings, nunca instancias del ORM.
+    Los jobs deben ser idempotentes: un reintento puede ejecutarlos de nuevo.
+    """
+    def decorator(func):
+        task = Task(
+            func=func,
+            name=name or f'{func.__module__}.{func.__name__}',
+            queue=queue,
+            max_retries=max_retries,
+            backoff=backoff,
+            max_backoff=max_backoff,
+        )
+        TASK_REGISTRY[task.name] = task
+        return task
+    return decorator
+
+
+def autodiscover_tasks():
+    """ Importa JOB_TASK_MODULES para que el worker conozca todos los jobs """
+    for module in getattr(settings, 'JOB_TASK_MODULES', []):
+        importlib.import_module(module)
+    return TASK_REGISTRY
+
+
+def get_task(name):
+    if name not in TASK_REGISTRY:
+        autodiscover_tasks()
+    return TASK_REGISTRY[name]
+
+
+def _redis():
+    # import diferido: django_redis solo cuando se usa la cola
+    from django_redis import get_redis_connection
+    return get_redis_connection('default')
+
+
+def _key(*parts):
+    return ':'.join((KEY_PREFIX,) + parts)
+
+
+def _dumps(value):
+    return orjson.dumps(value, default=orjson_default)
+
+
+class JobQueue:
+    """
+    Cola sobre el Redis del proyecto (CACHES['default']):
+    - jobs:queue:<cola>          LIST  ids listos (LPUSH / BRPOPLPUSH)
+    - jobs:processing:<consumer> LIST  ids tomados por un hilo de un worker, hasta el ack
+    - jobs:delayed:<cola>        ZSET  ids con reintento programado (score = eta)
+    - jobs:job:<id>              HASH  task, args, estado, intentos, resultado, error
+    - jobs:idem:<clave>          STR   id del job para una clave de idempotencia
+    - jobs:workers               SET   workers registrados
+    - jobs:worker:<worker>       HASH  lista de processing -> cola (para el reaper)
+    - jobs:heartbeat:<worker>    STR   vivo mientras no venza JOB_HEARTBEAT_TTL
+    El hash vive JOB_RESULT_TTL segundos; es la fuente del API de estado.
+    Entrega at-least-once: si un worker muere, sus jobs en proceso vuelven a la cola.
+    """
+
+    def __init__(self, client=None):
+        self._client = client
+
+    @property
+    def client(self):
+        if self._client is None:
+            self._client = _redis()
+        return self._client
+
+    @property
+    def result_ttl(self):
+        return getattr(settings, 'JOB_RESULT_TTL', 60 * 60 * 24)
+
+    # ---------------------------
+    # productor
+    # ---------------------------
+    def enqueue(self, task, args=(), kwargs=None, idempotency_key=None, queue=None, owner_id=None):
+        """ `owner_id`: usuario que puede consultar el job en el API (además del staff) """
+        queue = queue or task.queue
+        job_id = uuid.uuid4().hex
+
+        if idempotency_key:
+            idem_key = _key('idem', idempotency_key)
+            # SET NX: el primer enqueue gana; los repetidos devuelven el mismo job
+            if not self.client.set(idem_key, job_id, nx=True, ex=self.result_ttl):
+                existing = self.client.get(idem_key)
+                return existing.decode() if isinstance(existing, bytes) else existing
+
+        job_key = _key('job', job_id)
+        pipe = self.client.pipeline()
+        pipe.hset(job_key, mapping={
+            'id': job_id,
+            'task': task.name,
+            'queue': queue,
+            'args': _dumps(list(args)),
+            'kwargs': _dumps(kwargs or {}),
+            'status': STATUS_QUEUED,
+            'attempts': 0,
+            'enqueued_at': time.time(),
+            'owner_id': '' if owner_id is None else str(owner_id),
+        })
+        pipe.expire(job_key, self.result_ttl)
+        pipe.lpush(_key('queue', queue), job_id)
+        pipe.execute()
+        return job_id
+
+    def status(self, job_id):
+        raw = self.client.hgetall(_key('job', job_id))
+        if not raw:
+            return None
+        data = {k.decode(): v.decode() for k, v in raw.items()}
+        for field in ('args', 'kwargs', 'result'):
+            if field in data:
+                data[field] = orjson.loads(data[field])
+        data['attempts'] = int(data.get('attempts', 0))
+        return data
+
+    # ---------------------------
+    # consumidor
+    # ---------------------------
+    def promote_delayed(self, queue):
+        """ Pasa a la cola los reintentos cuya eta ya venció """
+        delayed_key = _key('delayed', queue)
+        due = self.client.zrangebyscore(delayed_key, 0, time.time())
+        for job_id in due:
+            # ZREM como lock: solo un worker mueve cada id
+            if self.client.zrem(delayed_key, job_id):
+                self.client.lpush(_key('queue', queue), job_id)
+
+    def fetch(self, queue, processing_key, timeout=1):
+        """ Mueve el próximo id a la lista de processing del consumidor (queda ahí hasta ack) """
+        job_id = self.client.brpoplpush(_key('queue', queue), processing_key, timeout=timeout)
+        if job_id is None:
+            return None
+        return job_id.decode() if isinstance(job_id, bytes) else job_id
+
+    def ack(self, processing_key, job_id):
+        """ El job terminó (ok, reintento programado o fallido): sale de processing """
+        self.client.lrem(processing_key, 1, job_id)
+
+    # ---------------------------
+    # workers: registro, heartbeat y reaper
+    # ---------------------------
+    @property
+    def heartbeat_ttl(self):
+        return getattr(settings, 'JOB_HEARTBEAT_TTL', 30)
+
+    def register_worker(self, worker_id, processing):
+        """ processing: {processing_key: cola} de los hilos del worker """
+        pipe = self.client.pipeline()
+        pipe.sadd(_key('workers'), worker_id)
+        pipe.hset(_key('worker', worker_id), mapping=processing)
+        pipe.set(_key('heartbeat', worker_id), time.time(), ex=self.heartbeat_ttl)
+        pipe.execute()
+
+    def heartbeat(self, worker_id):
+        self.client.set(_key('heartbeat', worker_id), time.time(), ex=self.heartbeat_ttl)
+
+    def unregister_worker(self, worker_id):
+        # lo que haya quedado en processing (stop con timeout) vuelve a la cola
+        self._requeue_worker(worker_id)
+        pipe = self.client.pipeline()
+        pipe.delete(_key('heartbeat', worker_id), _key('worker', worker_id))
+        pipe.srem(_key('workers'), worker_id)
+        pipe.execute()
+
+    def requeue_stale(self):
+        """
+        Reaper: los jobs en processing de workers sin heartbeat vuelven a su cola.
+        Retorna la cantidad de jobs reencolados.
+        """
+        requeued = 0
+        for worker_id in self.client.smembers(_key('workers')):
+            worker_id = worker_id.decode() if isinstance(worker_id, bytes) else worker_id
+            if self.client.exists(_key('heartbeat', worker_id)):
+                continue
+            requeued += self._requeue_worker(worker_id)
+            self.client.delete(_key('worker', worker_id))
+            self.client.srem(_key('workers'), worker_id)
+        return requeued
+
+    def _requeue_worker(self, worker_id):
+        requeued = 0
+        for processing_key, queue in self.client.hgetall(_key('worker', worker_id)).items():
+            processing_key = processing_key.decode() if isinstance(processing_key, bytes) else processing_key
+            queue = queue.decode() if isinstance(queue, bytes) else queue
+            # RPOPLPUSH es atómico: cada id queda en processing o en la cola, nunca se pierde
+            while self.client.rpoplpush(processing_key, _key('queue', queue)) is not None:
+                requeued += 1
+        if requeued:
+            logger.warning('Worker %s sin heartbeat: %s jobs reencolados', worker_id, requeued)
+        return requeued
+
+    def run_reaper(self, interval):
+        """ requeue_stale como máximo una vez por `interval` entre todos los workers """
+        if not self.client.set(_key('reaper', 'lock'), time.time(), nx=True, ex=interval):
+            return 0
+        return self.requeue_stale()
+
+    def execute(self, job_id):
+        job_key = _key('job', job_id)
+        data = self.status(job_id)
+        if data is None:
+            logger.warning('Job %s expirado antes de ejecutarse', job_id)
+            return None
+
+        task = get_task(data['task'])
+        attempt = data['attempts'] + 1
+        self.client.hset(job_key, mapping={
+            'status': STATUS_RUNNING, 'attempts': attempt, 'started_at': time.time()})
+
+        start = time.perf_counter()
+        # contexto propio por job: el thread del worker se reutiliza entre jobs
+        token = start_request_context()
+        try:
+            result = task.func(*data['args'], **data['kwargs'])
+        except Exception as e:
+            elapsed = time.perf_counter() - start
+            job_duration_seconds.labels(task=task.name, queue=data['queue']).observe(elapsed)
+            return self._on_failure(task, data, attempt, e)
+        finally:
+            end_request_context(token)
+            close_old_connections()
+
+        job_duration_seconds.labels(task=task.name, queue=data['queue']).observe(
+            time.perf_counter() - start)
+        jobs_total.labels(task=task.name, queue=data['queue'], status=STATUS_SUCCEEDED).inc()
+        self.client.hset(job_key, mapping={
+            'status': STATUS_SUCCEEDED, 'result': _dumps(result), 'finished_at': time.time()})
+        self.client.hdel(job_key, 'error')
+        return STATUS_SUCCEEDED
+
+    def _on_failure(self, task, data, attempt, error):
+        job_key = _key('job', data['id'])
+        error_text = ''.join(traceback.format_exception_only(type(error), error)).strip()
+
+        if attempt <= task.max_retries:
+            delay = task.retry_delay(attempt)
+            logger.warning('Job %s (%s) falló intento %s, reintento en %ss: %s',
+                           data['id'], task.name, attempt, delay, error_text)
+            jobs_total.labels(task=task.name, queue=data['queue'], status=STATUS_RETRYING).inc()
+            self.client.hset(job_key, mapping={'status': STATUS_RETRYING, 'error': error_text})
+            self.client.zadd(_key('delayed', data['queue']), {data['id']: time.time() + delay})
+            return STATUS_RETRYING
+
+        logger.error('Job %s (%s) falló definitivamente tras %s intentos: %s',
+                     data['id'], task.name, attempt, error_text)
+        jobs_total.labels(task=task.name, queue=data['queue'], status=STATUS_FAILED).inc()
+        self.client.hset(job_key, mapping={
+            'status': STATUS_FAILED, 'error': error_text, 'finished_at': time.time()})
+        return STATUS_FAILED
+
+
+job_queue = JobQueue()
+
+
+def _request_user_id():
+    request = get_request_context().request
+    user = getattr(request, 'user', None)
+    if user is not None and getattr(user, 'is_authenticated', False):
+        return user.pk
+    return None
+
+
+def enqueue(task, *args, idempotency_key=None, queue=None, owner_id=None, **kwargs):
+    """
+    Encola `task` y retorna el job_id.
+    El dueño del job es `owner_id` o, por defecto, el usuario del request actual.
+    Con JOBS_EAGER (desarrollo local) se ejecuta en línea y retorna None.
+    """
+    if isinstance(task, str):
+        task = get_task(task)
+    if getattr(settings, 'JOBS_EAGER', False):
+        # mismo aislamiento que en el worker: no comparte el contexto del request
+        token = start_request_context()
+        try:
+            task.func(*args, **kwargs)
+        finally:
+            end_request_context(token)
+        return None
+    if owner_id is None:
+        owner_id = _request_user_id()
+    return job_queue.enqueue(task, args=args, kwargs=kwargs, idempotency_key=idempotency_key,
+                             queue=queue, owner_id=owner_id)
+
+
+def enqueue_on_commit(task, *args, **kwargs):
+    """
+    Encola al confirmar la transacción actual: el worker nunca ve datos que
+    luego se revierten. Fuera de una transacción encola de inmediato.
+    """
+    transaction.on_commit(lambda: enqueue(task, *args, **kwargs))
+
+
+class JobWorker:
+    """
+    Consume colas con N hilos por cola ({'default': 4, 'email': 2}).
+    Los hilos comparten el cliente Redis (thread-safe) y cada uno cierra sus
+    conexiones de BD viejas tras cada job.
+    Cada hilo toma jobs a su propia lista de processing y hace ack al terminar;
+    un hilo aparte mantiene el heartbeat del worker y corre el reaper.
+    """
+
+    def __init__(self, concurrency, queue=None, poll_timeout=1, reaper_interval=None):
+        self.concurrency = concurrency
+        self.queue = queue or job_queue
+        self.poll_timeout = poll_timeout
+        self.reaper_interval = reaper_interval or getattr(settings, 'JOB_REAPER_INTERVAL', 30)
+        self.worker_id = f'{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}'
+        self._stop = threading.Event()
+        self._threads = []
+
+    def processing_key(self, queue_name, index):
+        return _key('processing', self.worker_id, queue_name, str(index))
+
+    def start(self):
+        autodiscover_tasks()
+        consumers = [(queue_name, index) for queue_name, threads in self.concurrency.items()
+                     for index in range(threads)]
+        self.queue.register_worker(self.worker_id, {
+            self.processing_key(queue_name, index): queue_name for queue_name, index in consumers})
+
+        for queue_name, index in consumers:
+            thread = threading.Thread(
+                target=self._loop, args=(queue_name, self.processing_key(queue_name, index)),
+                name=f'job-worker-{queue_name}-{index}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+        self._heartbeat_thread = threading.Thread(
+            target=self._heartbeat_loop, name='job-worker-heartbeat', daemon=True)
+        self._heartbeat_thread.start()
+
+    def stop(self, timeout=None):
+        """ Cada hilo termina su job en curso antes de salir """
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self.queue.unregister_worker(self.worker_id)
+
+    def _loop(self, queue_name, processing_key):
+        while not self._stop.is_set():
+            try:
+                self.queue.promote_delayed(queue_name)
+                job_id = self.queue.fetch(queue_name, processing_key, timeout=self.poll_timeout)
+                if job_id is not None:
+                    try:
+                        self.queue.execute(job_id)
+                    finally:
+                        self.queue.ack(processing_key, job_id)
+            except Exception:
+                # un error de Redis no debe matar el hilo
+                logger.exception('Error en el worker de la cola %s', queue_name)
+                time.sleep(self.poll_timeout)
+
+    def _heartbeat_loop(self):
+        # el heartbeat se renueva aunque los hilos estén en un job largo
+        interval = max(1, self.queue.heartbeat_ttl / 3)
+        last_reap = 0
+        while not self._stop.wait(interval):
+            try:
+                self.queue.heartbeat(self.worker_id)
+                if time.monotonic() - last_reap >= self.reaper_interval:
+                    last_reap = time.monotonic()
+                    self.queue.run_reaper(self.reaper_interval)
+            except Exception:
+                logger.exception('Error en el heartbeat del worker %s', self.worker_id)
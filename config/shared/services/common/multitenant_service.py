@@ -1,14 +1,14 @@
-from django.db import connection
+from config.shared.services.common.multitenant_static_helper import MultitenantStaticHelper
+from config.shared.services.common.tenant_resolver import tenant_resolver
 
 
 class MultitenantService:
 
     def get_current_schema(self):
-        return connection.schema_name
+        return MultitenantStaticHelper.get_current_schema()
 
     def get_current_company(self):
-        schema_name = self.get_current_schema()
-        return print(schema_name=schema_name)
+        return MultitenantStaticHelper.get_current_company()
 
     def get_current_company_by_schema(self, schema_name: str):
-        return print(schema_name=schema_name)
+        return tenant_resolver.resolve_schema(schema_name).company
@@ -1,17 +1,29 @@
 from django_tenants.utils import schema_context, get_tenant_model
+from django.conf import settings
 from django.db import connection
 
+from config.shared.helpers.request_context_helper import get_request_context
+from config.shared.services.common.tenant_resolver import tenant_resolver
+
+from config.shared.services.common.tenant_job_runner import TenantJobError, TenantJobRunner
+
 
 class MultitenantStaticHelper:
 
     @staticmethod
     def get_current_schema():
-        return connection.schema_name
+        tenant_info = get_request_context().tenant
+        if tenant_info is not None:
+            return tenant_info.schema_name
+        return getattr(connection, 'schema_name', settings.DEFAULT_SCHEMA)
 
     @staticmethod
     def get_current_company():
-        schema_name = MultitenantStaticHelper.get_current_schema()
-        return print(schema_name=schema_name)
+        tenant_info = get_request_context().tenant
+        if tenant_info is None:
+            tenant_info = tenant_resolver.resolve_schema(
+                MultitenantStaticHelper.get_current_schema())
+        return tenant_info.company
 
     # ---------------------------------
     @staticmethod
@@ -24,20 +36,31 @@ class MultitenantStaticHelper:
 
     # ---------------------------------
     @staticmethod
-    def run_in_all_schemas_but_list(callback, exclude_schemas=None):
+    def run_in_all_schemas_but_list(callback, exclude_schemas=None, max_workers=None, timeout=None, job_name=None, resume=True):
+        """
+        Ejecuta callback(schema) en paralelo en todos los schemas y retorna el TenantJobReport.
+        Si algún schema falla (o excede el timeout) lanza TenantJobError al terminar
+        todos; el report completo queda en error.report.
+        """
         if exclude_schemas is None:
             exclude_schemas = ['public',]
         TenantModel = get_tenant_model()
-        tenants = TenantModel.objects.exclude(schema_name__in=exclude_schemas)
+        schemas = TenantModel.objects.exclude(
+            schema_name__in=exclude_schemas).values_list('schema_name', flat=True)
 
-        for tenant in tenants:
-            schema = tenant.schema_name
-            with schema_context(schema):
-                callback(schema)
+        runner = TenantJobRunner(
+            callback, max_workers=max_workers, timeout=timeout, job_name=job_name)
+        report = runner.run(schemas, resume=resume)
+        if not report.ok:
+            raise TenantJobError(report)
+        return report
 
     # ---------------------------------
     @staticmethod
     def get_schema_name_from_request(request):
+        tenant_info = getattr(request, 'tenant_info', None)
+        if tenant_info is not None:
+            return tenant_info.schema_name
         if hasattr(request, 'tenant'):
             return request.tenant.schema_name
         return MultitenantStaticHelper.get_current_schema()
@@ -0,0 +1,201 @@
+import logging
+import queue
+import threading
+from contextlib import nullcontext
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import OperationalError, connection, connections
+from django_tenants.utils import schema_context
+
+from config.shared.helpers.request_context_helper import end_request_context, start_request_context
+
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_TIMEOUT = 60 * 60 * 24
+
+# SQLSTATE query_canceled: statement_timeout
+PG_QUERY_CANCELED = '57014'
+
+
+class TenantJobReport:
+    def __init__(self, total):
+        self.total = total
+        self.results = {}    # schema -> valor retornado por el callback
+        self.errors = {}     # schema -> error
+        self.timed_out = []  # schemas cancelados por statement_timeout
+        self.skipped = []    # schemas ya completados (resume)
+
+    @property
+    def done(self):
+        return len(self.results) + len(self.errors) + len(self.timed_out) + len(self.skipped)
+
+    @property
+    def ok(self):
+        return not self.errors and not self.timed_out
+
+    def as_dict(self):
+        return {
+            'total': self.total,
+            'results': self.results,
+            'errors': self.errors,
+            'timed_out': self.timed_out,
+            'skipped': self.skipped,
+        }
+
+
+class TenantJobError(Exception):
+    """ Algún tenant falló o excedió el timeout; `report` tiene el detalle de todos """
+
+    def __init__(self, report):
+        self.report = report
+        failed = list(report.errors) + report.timed_out
+        super().__init__(f"{len(failed)} de {report.total} schemas fallaron: {', '.join(failed)}")
+
+
+class TenantJobRunner:
+    """
+    Ejecuta `callback(schema)` en varios schemas en paralelo (threads acotados).
+    - Cada worker es un thread con su propia conexión (Django las aisla por thread),
+      reutilizada para todos sus tenants y cerrada al terminar el worker.
+    - Timeout: solo statement_timeout en postgres (por statement, no por tenant).
+      Un thread de Python no se puede detener: el trabajo del callback fuera de SQL
+      no está acotado. Un tenant cancelado por timeout queda en report.timed_out.
+    - Un tenant que falla no detiene al resto; todo queda en el TenantJobReport.
+    - Con `job_name`, los schemas completados se guardan en cache y un nuevo
+      run(resume=True) los salta (reanudar tras un crash).
+    """
+
+    def __init__(self, callback, max_workers=None, timeout=None, job_name=None, on_progress=None):
+        self.callback = callback
+        self.max_workers = max_workers or getattr(
+            settings, 'TENANT_JOB_MAX_WORKERS', 4)
+        self.timeout = timeout if timeout is not None else getattr(
+            settings, 'TENANT_JOB_TIMEOUT', None)
+        self.job_name = job_name
+        self.on_progress = on_progress or self._log_progress
+        self._lock = threading.Lock()
+
+    def run(self, schemas, resume=True):
+        schemas = list(schemas)
+        report = TenantJobReport(total=len(schemas))
+
+        completed = self._get_checkpoint() if resume else set()
+        pending = queue.SimpleQueue()
+        pending_count = 0
+        for schema in schemas:
+            if schema in completed:
+                report.skipped.append(schema)
+            else:
+                pending.put(schema)
+                pending_count += 1
+
+        workers = [
+            threading.Thread(target=self._worker, args=(pending, report, completed),
+                             name=f'tenant-job-{index}')
+            for index in range(min(self.max_workers, pending_count))
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        if report.ok:
+            self._clear_checkpoint()
+        return report
+
+    # ---------------------------
+    # ejecución por tenant
+    # ---------------------------
+    def _worker(self, pending, report, completed):
+        try:
+            while True:
+                try:
+                    schema = pending.get_nowait()
+                except queue.Empty:
+                    return
+                self._run_one(schema, report, completed)
+                # la conexión sigue para el siguiente tenant salvo que haya quedado inservible
+                connection.close_if_unusable_or_obsolete()
+        finally:
+            # una conexión por worker
+            connections.close_all()
+
+    def _run_one(self, schema, report, completed):
+        # contexto propio por tenant: el worker atiende varios schemas
+        token = start_request_context()
+        try:
+            with self._schema_scope(schema):
+                self._apply_statement_timeout()
+                result = self.callback(schema)
+        except Exception as e:
+            self._collect_error(schema, e, report)
+        else:
+            self._collect(schema, result, report, completed)
+        finally:
+            end_request_context(token)
+
+    @staticmethod
+    def _schema_scope(schema):
+        # sin backend de django_tenants (sqlite/local) no hay search_path que cambiar
+        if hasattr(connection, 'set_schema'):
+            return schema_context(schema)
+        return nullcontext()
+
+    def _apply_statement_timeout(self):
+        if self.timeout and connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute('SET statement_timeout = %s',
+                               [int(self.timeout * 1000)])
+
+    # ---------------------------
+    # resultados
+    # ---------------------------
+    def _collect(self, schema, result, report, completed):
+        with self._lock:
+            report.results[schema] = result
+            completed.add(schema)
+            self._save_checkpoint(completed)
+            self.on_progress(report.done, report.total, schema, 'ok')
+
+    def _collect_error(self, schema, error, report):
+        if self._is_statement_timeout(error):
+            with self._lock:
+                report.timed_out.append(schema)
+                self.on_progress(report.done, report.total, schema, 'timeout')
+            logger.warning('Tenant job %s: timeout en %s', self.job_name or self.callback, schema)
+            return
+        with self._lock:
+            report.errors[schema] = str(error)
+            self.on_progress(report.done, report.total, schema, 'error')
+        logger.error('Tenant job %s falló en %s', self.job_name or self.callback, schema, exc_info=error)
+
+    @staticmethod
+    def _is_statement_timeout(error):
+        return isinstance(error, OperationalError) and \
+            getattr(error.__cause__, 'pgcode', None) == PG_QUERY_CANCELED
+
+    def _log_progress(self, done, total, schema, status):
+        logger.info('Tenant job %s: %s/%s (%s: %s)',
+                    self.job_name or getattr(self.callback, '__name__', ''), done, total, schema, status)
+
+    # ---------------------------
+    # checkpoint (resume)
+    # ---------------------------
+    def _checkpoint_key(self):
+        return f"tenant_job_{self.job_name}_done"
+
+    def _get_checkpoint(self):
+        if not self.job_name:
+            return set()
+        return set(cache.get(self._checkpoint_key()) or [])
+
+    def _save_checkpoint(self, completed):
+        if self.job_name:
+            cache.set(self._checkpoint_key(), list(completed),
+                      timeout=CHECKPOINT_TIMEOUT)
+
+    def _clear_checkpoint(self):
+        if self.job_name:
+            cache.delete(self._checkpoint_key())
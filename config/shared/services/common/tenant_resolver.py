@@ -0,0 +1,155 @@
+import ipaddress
+import threading
+import time
+from collections import OrderedDict
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models.signals import post_save, post_delete
+
+
+# campos de la empresa que se exponen junto al tenant (ver CompanyLimitResponseSerializer)
+COMPANY_FIELDS = (
+    'uuid', 'id', 'company_name', 'commercial_name', 'logo_1_url', 'logo_2_url', 'schema_name',
+    'email', 'main_address', 'establishment_address', 'mobile', 'phone',
+)
+
+
+class TenantInfo:
+    """ Resultado de la resolución: schema + datos de la empresa (sin objetos del ORM) """
+    __slots__ = ('schema_name', 'domain', 'company')
+
+    def __init__(self, schema_name, domain=None, company=None):
+        self.schema_name = schema_name
+        self.domain = domain
+        self.company = company or {}
+
+
+class TenantResolver:
+    """
+    host / header -> tenant -> TenantInfo, con cache en proceso por TTL.
+    - La cache es LRU acotada (TENANT_CACHE_MAX_SIZE) y solo guarda tenants
+      encontrados: un host/header desconocido no ocupa lugar (ALLOWED_HOSTS=*).
+    - TENANT_HEADER solo se acepta si REMOTE_ADDR está en TENANT_TRUSTED_PROXIES.
+    Sin TENANT_MODEL configurado (proyecto sin tenants) todo resuelve a DEFAULT_SCHEMA.
+    Al guardar/eliminar un tenant o dominio se invalida la cache del proceso;
+    los demás procesos la renuevan al vencer el TTL.
+    """
+
+    def __init__(self):
+        self._cache = OrderedDict()  # key -> (TenantInfo, expires_at)
+        self._lock = threading.Lock()
+        self._signals_connected = False
+        self._trusted_proxies = None
+
+    @property
+    def ttl(self):
+        return getattr(settings, 'TENANT_CACHE_TTL', 60)
+
+    @property
+    def max_size(self):
+        return getattr(settings, 'TENANT_CACHE_MAX_SIZE', 1024)
+
+    @property
+    def trusted_proxies(self):
+        if self._trusted_proxies is None:
+            self._trusted_proxies = [
+                ipaddress.ip_network(proxy, strict=False)
+                for proxy in getattr(settings, 'TENANT_TRUSTED_PROXIES', [])
+            ]
+        return self._trusted_proxies
+
+    def resolve(self, request):
+        return self._get(self._request_key(request))
+
+    def resolve_schema(self, schema_name):
+        return self._get(('schema', schema_name))
+
+    def invalidate(self, *args, **kwargs):
+        with self._lock:
+            self._cache.clear()
+
+    def connect_invalidation(self):
+        if self._signals_connected:
+            return
+        for setting_name in ('TENANT_MODEL', 'TENANT_DOMAIN_MODEL'):
+            model_path = getattr(settings, setting_name, None)
+            if not model_path:
+                continue
+            model = apps.get_model(model_path)
+            post_save.connect(self.invalidate, sender=model,
+                              dispatch_uid=f'tenant_resolver_save_{setting_name}')
+            post_delete.connect(self.invalidate, sender=model,
+                                dispatch_uid=f'tenant_resolver_delete_{setting_name}')
+        self._signals_connected = True
+
+    # ---------------------------
+    # carga
+    # ---------------------------
+    def _get(self, key):
+        if not getattr(settings, 'TENANT_MODEL', None):
+            return TenantInfo(schema_name=settings.DEFAULT_SCHEMA)
+
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and cached[1] > now:
+                self._cache.move_to_end(key)
+                return cached[0]
+
+        tenant_info = self._load(key)
+        if tenant_info is None:
+            # miss: no se cachea
+            return TenantInfo(schema_name=settings.DEFAULT_SCHEMA,
+                              domain=key[1] if key[0] == 'domain' else None)
+        with self._lock:
+            self._cache[key] = (tenant_info, now + self.ttl)
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.max_size:
+                self._cache.popitem(last=False)
+        return tenant_info
+
+    def _is_trusted_proxy(self, request):
+        try:
+            address = ipaddress.ip_address(request.META.get('REMOTE_ADDR', ''))
+        except ValueError:
+            return False
+        return any(address in network for network in self.trusted_proxies)
+
+    def _request_key(self, request):
+        header_value = request.META.get(getattr(settings, 'TENANT_HEADER', 'HTTP_X_TENANT'))
+        if header_value and self._is_trusted_proxy(request):
+            return ('schema', header_value)
+        return ('domain', request.get_host().split(':')[0].lower())
+
+    def _load(self, key):
+
+        kind, value = key
+        tenant, domain = None, None
+        if kind == 'schema':
+            TenantModel = apps.get_model(settings.TENANT_MODEL)
+            tenant = TenantModel.objects.filter(schema_name=value).first()
+        else:
+            DomainModel = apps.get_model(settings.TENANT_DOMAIN_MODEL)
+            domain_obj = DomainModel.objects.select_related(
+                'tenant').filter(domain=value).first()
+            if domain_obj:
+                tenant, domain = domain_obj.tenant, domain_obj.domain
+
+        if tenant is None:
+            return None
+        return TenantInfo(
+            schema_name=tenant.schema_name,
+            domain=domain,
+            company=self._company_settings(tenant),
+        )
+
+    @staticmethod
+    def _company_settings(tenant):
+        company = getattr(tenant, 'company', None)
+        if company is None:
+            return {}
+        return {field: getattr(company, field, None) for field in COMPANY_FIELDS}
+
+
+tenant_resolver = TenantResolver()
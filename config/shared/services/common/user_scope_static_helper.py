@@ -0,0 +1,121 @@
+from functools import lru_cache
+
+from config.shared.helpers.request_context_helper import get_request_context
+
+
+# role -> (campo del modelo filtrado, atributo del scope con el valor)
+# mismo orden/semántica que _filter_by_sales_logic_mx / _filter_by_user_logic_mx
+ROLE_SCOPE_RULES = {
+    'ADMINISTRADOR': ('area', 'area_id'),
+    'COORDINADOR': ('departamento', 'departamento_id'),
+    'SUPERVISOR': ('canal_venta', 'canal_venta_id'),
+    'AGENTE': ('vendedor', 'user_id'),
+    'TECNICO': ('usuario_flota', 'user_id'),
+}
+GLOBAL_SCOPE_ROLES = ('GERENCIA',)
+
+
+class UserScope:
+    """
+    Visibilidad de datos de un usuario: solo lo necesario para filtrar filas.
+    Se arma una vez por request (desde request.user cuando es el mismo usuario).
+    `user` es la instancia de la que salió: los hooks sobrescribibles
+    (_filter_by_*_logic_mx) siguen recibiendo el usuario, no el scope.
+    """
+    __slots__ = ('user_id', 'role', 'is_superuser', 'state',
+                 'area_id', 'departamento_id', 'canal_venta_id', 'user')
+
+    def __init__(self, user_id, role=None, is_superuser=False, state=True,
+                 area_id=None, departamento_id=None, canal_venta_id=None, user=None):
+        self.user_id = user_id
+        self.role = role
+        self.is_superuser = is_superuser
+        self.state = state
+        self.area_id = area_id
+        self.departamento_id = departamento_id
+        self.canal_venta_id = canal_venta_id
+        self.user = user
+
+    @classmethod
+    def from_user(cls, user):
+        return cls(
+            user_id=user.id,
+            role=getattr(user, 'role', None),
+            is_superuser=getattr(user, 'is_superuser', False),
+            state=getattr(user, 'state', True),
+            area_id=getattr(user, 'area_id', None),
+            departamento_id=getattr(user, 'departamento_id', None),
+            canal_venta_id=getattr(user, 'canal_venta_id', None),
+            user=user,
+        )
+
+    @property
+    def is_global(self):
+        return bool(self.is_superuser) or self.role in GLOBAL_SCOPE_ROLES
+
+
+@lru_cache(maxsize=None)
+def compile_scope_rule(model, role):
+    """ Regla precomputada por (model, role); None = sin filtro """
+    rule = ROLE_SCOPE_RULES.get(role)
+    if rule is None or not hasattr(model, rule[0]):
+        return None
+    return rule
+
+
+class UserScopeStaticHelper:
+
+    @staticmethod
+    def get_user_scope(user_id, user_repository):
+        context = get_request_context()
+        scope = context.user_scope
+        if scope is not None and scope.user_id == user_id:
+            return scope
+
+        # reutiliza el usuario ya cargado por la autenticación
+        request_user = getattr(context.request, 'user', None)
+        if request_user is not None and getattr(request_user, 'is_authenticated', False) \
+                and request_user.id == user_id:
+            user = request_user
+        else:
+            user = user_repository.find_one(user_id)
+            if not user:
+                return None
+
+        scope = UserScope.from_user(user)
+        if context.request is not None:
+            # solo se reutiliza dentro del mismo request
+            context.user_scope = scope
+        return scope
+
+    @staticmethod
+    def scope_of(user):
+        """ UserScope de una instancia de usuario; reutiliza el del request si es el mismo """
+        scope = get_request_context().user_scope
+        if scope is not None and scope.user is user:
+            return scope
+        return UserScope.from_user(user)
+
+    @staticmethod
+    def get_scope_key(model, scope):
+        """
+        Identifica la visibilidad efectiva sobre `model`: usuarios con la misma
+        key ven exactamente las mismas filas (ej. 'global', 'area:3', 'vendedor:15').
+        """
+        if scope.is_global:
+            return 'global'
+        rule = compile_scope_rule(model, scope.role)
+        if rule is None:
+            return 'global'
+        field, scope_attr = rule
+        return f"{field}:{getattr(scope, scope_attr)}"
+
+    @staticmethod
+    def apply_scope(queryset, model, scope):
+        if scope.is_global:
+            return queryset
+        rule = compile_scope_rule(model, scope.role)
+        if rule is None:
+            return queryset
+        field, scope_attr = rule
+        return queryset.filter(**{field: getattr(scope, scope_attr)})
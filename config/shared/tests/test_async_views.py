@@ -0,0 +1,80 @@
+import asyncio
+
+import orjson
+from django.test import SimpleTestCase
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from config.shared.exceptions.resource_not_found_exception import ResourceNotFoundException
+from config.shared.views.async_mixins_view import AsyncAPIViewMixin, AsyncRetrieveViewMixin
+from core.ops.management.commands.benchmark_async_views import (
+    AsyncListView, SimulatedListService, SyncListView, build_request,
+)
+
+
+class AsyncListWithPostView(AsyncListView):
+    def post(self, request):
+        return Response({'status': 201}, status=201)
+
+
+class AsyncProtectedListView(AsyncListView):
+    permission_classes = [IsAuthenticated]
+
+
+class MissingService:
+    repository = type('Repository', (), {'model': type('BenchmarkItem', (), {})})()
+
+    def find_one_by_uuid(self, uuid, filter_params=None):
+        raise ResourceNotFoundException(f'Elemento {uuid} no encontrado')
+
+
+class AsyncRetrieveView(AsyncAPIViewMixin, APIView, AsyncRetrieveViewMixin):
+    authentication_classes = []
+    permission_classes = []
+    service = None
+
+
+class AsyncViewTests(SimpleTestCase):
+    def setUp(self):
+        self.service = SimulatedListService()
+        AsyncListView(self.service).clear_cache(model_name='BenchmarkItem')
+
+    def tearDown(self):
+        AsyncListView(self.service).clear_cache(model_name='BenchmarkItem')
+
+    def test_as_view_is_a_coroutine_function(self):
+        self.assertTrue(asyncio.iscoroutinefunction(AsyncListView.as_view(service=self.service)))
+        self.assertFalse(asyncio.iscoroutinefunction(SyncListView.as_view(service=self.service)))
+
+    async def test_list_miss_then_cache_hit(self):
+        view = AsyncListView.as_view(service=self.service)
+        first = await view(build_request('/benchmark/?page=1'))
+        second = await view(build_request('/benchmark/?page=1'))
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.data, second.data)
+        self.assertEqual(self.service.calls, 1)
+
+    async def test_same_envelope_as_sync_view(self):
+        async_response = await AsyncListView.as_view(service=self.service)(build_request('/benchmark/?page=2'))
+        AsyncListView(self.service).clear_cache(model_name='BenchmarkItem')
+        sync_response = SyncListView.as_view(service=self.service)(build_request('/benchmark/?page=2'))
+        self.assertEqual(orjson.loads(async_response.render().content),
+                         orjson.loads(sync_response.render().content))
+
+    async def test_sync_handler_runs_in_thread(self):
+        request = build_request('/benchmark/')
+        request.method = 'POST'
+        response = await AsyncListWithPostView.as_view(service=self.service)(request)
+        self.assertEqual(response.status_code, 201)
+
+    async def test_permissions_are_checked(self):
+        response = await AsyncProtectedListView.as_view(service=self.service)(build_request('/benchmark/'))
+        self.assertIn(response.status_code, (401, 403))
+        self.assertEqual(self.service.calls, 0)
+
+    async def test_retrieve_errors_use_the_envelope(self):
+        response = await AsyncRetrieveView.as_view(service=MissingService())(
+            build_request('/benchmark/abc/'), uuid='abc')
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(orjson.loads(response.content)['message'], 'Elemento abc no encontrado')
@@ -0,0 +1,63 @@
+from django.contrib.auth.models import Group
+from django.test import SimpleTestCase
+from rest_framework import serializers
+
+from config.shared.serializers.compiled_serializer import CompiledReadSerializer
+from users.models.custom_group_model import CustomGroup
+
+
+class GroupNestedSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Group
+        fields = ['id', 'name']
+
+
+class UpperCharField(serializers.CharField):
+    def to_representation(self, value):
+        return super().to_representation(value).upper()
+
+
+class YesNoBooleanField(serializers.BooleanField):
+    def to_representation(self, value):
+        return 'si' if value else 'no'
+
+
+class CentsIntegerField(serializers.IntegerField):
+    def to_representation(self, value):
+        return int(value) * 100
+
+
+class CustomGroupNestedSerializer(serializers.ModelSerializer):
+    group_ptr = GroupNestedSerializer()
+    codigo = UpperCharField()
+    has_description = YesNoBooleanField(source='description')
+    id_cents = CentsIntegerField(source='id')
+
+    class Meta:
+        model = CustomGroup
+        fields = ['id', 'uuid', 'group_ptr', 'codigo', 'description', 'has_description', 'id_cents']
+
+
+class CompiledReadSerializerTests(SimpleTestCase):
+    def setUp(self):
+        self.compiled = CompiledReadSerializer(CustomGroupNestedSerializer)
+        self.instance = CustomGroup(group_ptr=Group(id=3, name='Ventas'), codigo='ven', description='')
+
+    def plan_entry(self, name):
+        return next(entry for entry in self.compiled.plan if entry[0] == name)
+
+    def test_nested_serializer_uses_drf_path(self):
+        _, fast, *_ = self.plan_entry('group_ptr')
+        self.assertFalse(fast)
+        self.assertEqual(self.compiled.to_representation(self.instance)['group_ptr'],
+                         {'id': 3, 'name': 'Ventas'})
+
+    def test_field_subclasses_keep_their_to_representation(self):
+        for name in ('codigo', 'has_description', 'id_cents'):
+            _, _, _, to_repr, _ = self.plan_entry(name)
+            self.assertNotIn(to_repr, (None, str, int), name)
+
+    def test_parity_with_drf(self):
+        expected = CustomGroupNestedSerializer(self.instance).data
+        self.assertEqual(self.compiled.to_representation(self.instance), dict(expected))
+        self.assertEqual(self.compiled.to_representation(self.instance)['codigo'], 'VEN')
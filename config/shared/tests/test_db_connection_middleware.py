@@ -0,0 +1,76 @@
+import time
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from config.shared.middlewares import db_connection_middleware
+from config.shared.middlewares.db_connection_middleware import DBConnectionMiddleware
+
+
+class FakeConnection:
+    def __init__(self, alias='default', open_=True, usable=True, health_checks=True):
+        self.alias = alias
+        self.connection = object() if open_ else None
+        self.usable = usable
+        self.settings_dict = {'CONN_HEALTH_CHECKS': health_checks}
+        self.pings = 0
+
+    def is_usable(self):
+        self.pings += 1
+        return self.usable
+
+    def close(self):
+        self.connection = None
+
+
+class FakeConnectionHandler:
+    def __init__(self, *conns):
+        self.conns = conns
+
+    def all(self):
+        return list(self.conns)
+
+
+@override_settings(DB_CONN_HEALTH_CHECK_IDLE=30)
+@mock.patch.object(db_connection_middleware, 'NATIVE_HEALTH_CHECKS', False)
+class DBConnectionMiddlewareTests(SimpleTestCase):
+    def run_request(self, *conns):
+        with mock.patch.object(db_connection_middleware, 'connections', FakeConnectionHandler(*conns)):
+            return DBConnectionMiddleware(lambda request: 'response')(RequestFactory().get('/'))
+
+    def test_new_connection_is_not_pinged(self):
+        conn = FakeConnection(open_=False)
+        self.assertEqual(self.run_request(conn), 'response')
+        self.assertEqual(conn.pings, 0)
+
+    def test_first_reuse_is_pinged_then_skipped_while_active(self):
+        conn = FakeConnection()
+        self.run_request(conn)
+        self.run_request(conn)
+        self.run_request(conn)
+        self.assertEqual(conn.pings, 1)
+
+    def test_idle_connection_is_pinged_and_closed_if_unusable(self):
+        conn = FakeConnection(usable=False)
+        conn._health_check_last_used = time.monotonic() - 31
+        self.run_request(conn)
+        self.assertEqual(conn.pings, 1)
+        self.assertIsNone(conn.connection)
+
+    def test_recent_connection_is_not_pinged(self):
+        conn = FakeConnection(usable=False)
+        conn._health_check_last_used = time.monotonic() - 5
+        self.run_request(conn)
+        self.assertEqual(conn.pings, 0)
+        self.assertIsNotNone(conn.connection)
+
+    def test_health_checks_disabled(self):
+        conn = FakeConnection(health_checks=False)
+        self.run_request(conn)
+        self.assertEqual(conn.pings, 0)
+
+    def test_reuse_metric(self):
+        before = db_connection_middleware.db_connections_reused.labels(alias='metric')._value.get()
+        self.run_request(FakeConnection(alias='metric'), FakeConnection(alias='metric', open_=False))
+        after = db_connection_middleware.db_connections_reused.labels(alias='metric')._value.get()
+        self.assertEqual(after - before, 1)
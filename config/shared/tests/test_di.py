@@ -0,0 +1,26 @@
+from dependency_injector import providers
+from django.test import SimpleTestCase
+
+from config.shared.di.di import container, resolve
+
+
+class ResolveTests(SimpleTestCase):
+    def tearDown(self):
+        container.reset_override()
+        container.reset_singletons()
+
+    def test_returns_process_singleton(self):
+        self.assertIs(resolve('role_service'), resolve('role_service'))
+        self.assertIs(resolve('role_service'), container.role_service())
+        self.assertIs(resolve('role_service').repository, resolve('role_repository'))
+
+    def test_respects_override(self):
+        fake = object()
+        with container.role_service.override(providers.Object(fake)):
+            self.assertIs(resolve('role_service'), fake)
+        self.assertIsNot(resolve('role_service'), fake)
+
+    def test_respects_reset_singletons(self):
+        before = resolve('role_service')
+        container.reset_singletons()
+        self.assertIsNot(resolve('role_service'), before)
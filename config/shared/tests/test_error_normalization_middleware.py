@@ -0,0 +1,50 @@
+import orjson
+from django.http import HttpResponse, JsonResponse
+from django.test import RequestFactory, SimpleTestCase
+from rest_framework.response import Response
+
+from config.shared.middlewares.error_normalization_middleware import ErrorNormalizationMiddleware
+
+
+class ErrorNormalizationMiddlewareTests(SimpleTestCase):
+    def process(self, response):
+        return ErrorNormalizationMiddleware(lambda request: response)(RequestFactory().get('/'))
+
+    def body(self, response):
+        return orjson.loads(response.content)
+
+    def test_success_passes_through(self):
+        response = HttpResponse('ok')
+        self.assertIs(self.process(response), response)
+
+    def test_already_normalized_drf_response_is_not_rebuilt(self):
+        response = Response({'status': 401, 'message': 'Token inválido', 'data': None}, status=401)
+        self.assertIs(self.process(response), response)
+
+    def test_drf_detail_gets_default_message(self):
+        response = self.process(Response({'detail': 'You do not have permission'}, status=403))
+        self.assertEqual(self.body(response), {'status': 403, 'message': 'Permission denied', 'data': None})
+
+    def test_message_and_data_are_kept(self):
+        response = self.process(Response({'message': 'Sesión expirada', 'data': {'code': 'expired'}}, status=401))
+        self.assertEqual(self.body(response),
+                         {'status': 401, 'message': 'Sesión expirada', 'data': {'code': 'expired'}})
+
+    def test_plain_response_is_normalized(self):
+        response = self.process(HttpResponse('<h1>Unauthorized</h1>', status=401))
+        self.assertEqual(response['Content-Type'], 'application/json')
+        self.assertEqual(self.body(response), {
+            'status': 401, 'message': 'Authentication credentials were not provided.', 'data': None})
+
+    def test_html_404_gets_generic_body(self):
+        response = self.process(HttpResponse('<h1>Not Found</h1>', status=404))
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(self.body(response), {'status': 404, 'error': 'Resource not found'})
+
+    def test_json_404_passes_through(self):
+        response = JsonResponse({'status': 404, 'message': 'Rol no encontrado'}, status=404)
+        self.assertIs(self.process(response), response)
+
+    def test_other_errors_pass_through(self):
+        response = HttpResponse('boom', status=500)
+        self.assertIs(self.process(response), response)
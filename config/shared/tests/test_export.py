@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+
+from django_filters import rest_framework as filters
+from rest_framework import serializers
+from rest_framework.permissions import AllowAny
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+from django.test import TestCase
+
+from config.shared.repositories.base_repository import BaseRepositoryAllMixin
+from config.shared.services.base_service import BaseServiceMixin
+from config.shared.views.base_mixins_view import ListViewNoCacheMixin
+from users.models.usuario_model import Usuario
+
+
+class UsernameFilter(filters.FilterSet):
+    received = []
+
+    class Meta:
+        model = Usuario
+        fields = ['username']
+
+    def __init__(self, data=None, *args, **kwargs):
+        UsernameFilter.received.append(dict(data.items()) if data is not None else None)
+        super().__init__(data, *args, **kwargs)
+
+
+class UsernameSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Usuario
+        fields = ['id', 'username', 'email']
+
+
+class VisibleUsersService(BaseServiceMixin):
+    """ sobrescribe la consulta del listado: la exportación debe respetarla """
+
+    def find_all_queryset(self, filter_params=None, user_id=None, ignorar_user=False):
+        return super().find_all_queryset(filter_params, user_id, ignorar_user).exclude(username='oculto')
+
+
+class UserListView(APIView, ListViewNoCacheMixin):
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    service = None
+
+    def __init__(self, service, **kwargs):
+        self.service = service
+        super().__init__(**kwargs)
+
+
+class ExportTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for username in ('ana', 'beto', 'oculto'):
+            Usuario.objects.create_user(email=f'{username}@example.com', password='x', username=username)
+
+    def setUp(self):
+        UsernameFilter.received = []
+        self.service = VisibleUsersService(
+            BaseRepositoryAllMixin(Usuario), filter=UsernameFilter, serializer2=UsernameSerializer)
+
+    def get(self, path):
+        request = APIRequestFactory().get(path)
+        force_authenticate(request, user=Usuario.objects.get(username='ana'))
+        response = UserListView.as_view(service=self.service)(request)
+        if hasattr(response, 'streaming_content'):
+            return b''.join(response.streaming_content).decode()
+        return response.render().data
+
+    def test_export_matches_list(self):
+        listed = self.get('/users/?page=1&page_size=30')['data']['items']
+        exported = [json.loads(line) for line in self.get('/users/?export=ndjson').splitlines()]
+        self.assertEqual(exported, listed)
+        self.assertNotIn('oculto', [row['username'] for row in exported])
+
+    def test_pagination_params_do_not_reach_filter(self):
+        self.get('/users/?export=ndjson&page=3&page_size=1&username=beto')
+        self.assertEqual(UsernameFilter.received, [{'username': 'beto'}])
+
+    def test_empty_csv_has_header(self):
+        rows = list(csv.reader(io.StringIO(self.get('/users/?export=csv&username=nadie'))))
+        self.assertEqual(rows, [['id', 'username', 'email']])
+
+    def test_csv_columns_follow_serializer(self):
+        rows = list(csv.reader(io.StringIO(self.get('/users/?export=csv&username=beto'))))
+        self.assertEqual(rows[0], ['id', 'username', 'email'])
+        self.assertEqual(rows[1][1:], ['beto', 'beto@example.com'])
@@ -0,0 +1,143 @@
+import time
+import uuid
+
+from django.test import RequestFactory, SimpleTestCase
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from config.shared.helpers.request_context_helper import end_request_context, start_request_context
+from config.shared.services.common.job_queue import (
+    STATUS_SUCCEEDED, JobQueue, JobWorker, enqueue, job, job_queue,
+)
+from config.shared.views.job_status_view import JobStatusView
+
+
+@job(name='tests.add', queue='tests')
+def add_task(a, b):
+    return a + b
+
+
+def api_user(pk, is_staff=False):
+    return type('User', (), {'pk': pk, 'id': pk, 'is_authenticated': True,
+                             'is_staff': is_staff, 'state': True})()
+
+
+class JobQueueReliabilityTests(SimpleTestCase):
+    def setUp(self):
+        self.queue = JobQueue()
+        # cola propia por test: no toca jobs reales del Redis configurado
+        self.queue_name = f'tests-{uuid.uuid4().hex[:8]}'
+        self.worker_id = f'tests-worker-{uuid.uuid4().hex[:8]}'
+        self.processing_key = f'jobs:processing:{self.worker_id}:{self.queue_name}:0'
+        self.job_ids = []
+
+    def tearDown(self):
+        client = self.queue.client
+        client.delete(f'jobs:queue:{self.queue_name}', f'jobs:delayed:{self.queue_name}', self.processing_key,
+                      *(f'jobs:job:{job_id}' for job_id in self.job_ids))
+        self.queue.unregister_worker(self.worker_id)
+
+    def enqueue(self, *args):
+        job_id = self.queue.enqueue(add_task, args=args, queue=self.queue_name)
+        self.job_ids.append(job_id)
+        return job_id
+
+    def queued(self):
+        return [item.decode() for item in self.queue.client.lrange(f'jobs:queue:{self.queue_name}', 0, -1)]
+
+    def processing(self):
+        return [item.decode() for item in self.queue.client.lrange(self.processing_key, 0, -1)]
+
+    def test_fetch_keeps_job_until_ack(self):
+        job_id = self.enqueue(1, 2)
+        self.assertEqual(self.queue.fetch(self.queue_name, self.processing_key), job_id)
+        self.assertEqual(self.queued(), [])
+        self.assertEqual(self.processing(), [job_id])
+        self.assertEqual(self.queue.execute(job_id), STATUS_SUCCEEDED)
+        self.queue.ack(self.processing_key, job_id)
+        self.assertEqual(self.processing(), [])
+        self.assertEqual(self.queue.status(job_id)['result'], 3)
+
+    def test_dead_worker_jobs_are_requeued(self):
+        self.queue.register_worker(self.worker_id, {self.processing_key: self.queue_name})
+        job_id = self.enqueue(1, 2)
+        self.queue.fetch(self.queue_name, self.processing_key)
+        self.queue.client.delete(f'jobs:heartbeat:{self.worker_id}')  # el worker murió
+
+        self.assertGreaterEqual(self.queue.requeue_stale(), 1)
+        self.assertEqual(self.queued(), [job_id])
+        self.assertEqual(self.processing(), [])
+        self.assertFalse(self.queue.client.sismember('jobs:workers', self.worker_id))
+
+    def test_live_worker_is_not_reaped(self):
+        self.queue.register_worker(self.worker_id, {self.processing_key: self.queue_name})
+        job_id = self.enqueue(1, 2)
+        self.queue.fetch(self.queue_name, self.processing_key)
+        self.queue.requeue_stale()
+        self.assertEqual(self.processing(), [job_id])
+        self.assertEqual(self.queued(), [])
+
+    def test_worker_acks_and_unregisters(self):
+        worker = JobWorker({self.queue_name: 1}, queue=self.queue, poll_timeout=1)
+        self.worker_id = worker.worker_id
+        self.processing_key = worker.processing_key(self.queue_name, 0)
+        job_id = self.enqueue(2, 3)
+        worker.start()
+        try:
+            for _ in range(50):
+                if self.queue.status(job_id)['status'] == STATUS_SUCCEEDED:
+                    break
+                time.sleep(0.1)
+        finally:
+            worker.stop()
+        self.assertEqual(self.queue.status(job_id)['result'], 5)
+        self.assertEqual(self.processing(), [])
+        self.assertFalse(self.queue.client.sismember('jobs:workers', worker.worker_id))
+
+
+# ---------------------------
+# dueño del job
+# ---------------------------
+class JobOwnershipTests(SimpleTestCase):
+    def setUp(self):
+        # la instancia que usan enqueue() y JobStatusView
+        self.queue = job_queue
+        self.job_ids = []
+
+    def tearDown(self):
+        self.queue.client.delete('jobs:queue:tests-owner', *(f'jobs:job:{job_id}' for job_id in self.job_ids))
+
+    def enqueue_as(self, user):
+        request = RequestFactory().get('/')
+        request.user = user
+        token = start_request_context(request)
+        try:
+            job_id = enqueue(add_task, 1, 2, queue='tests-owner')
+        finally:
+            end_request_context(token)
+        self.job_ids.append(job_id)
+        return job_id
+
+    def read_as(self, user, job_id):
+        request = APIRequestFactory().get(f'/api/v1/jobs/{job_id}/')
+        force_authenticate(request, user=user)
+        return JobStatusView.as_view()(request, job_id=job_id)
+
+    def test_owner_is_the_request_user(self):
+        job_id = self.enqueue_as(api_user(7))
+        self.assertEqual(self.queue.status(job_id)['owner_id'], '7')
+
+    def test_only_owner_or_staff_can_read(self):
+        job_id = self.enqueue_as(api_user(7))
+        owner = self.read_as(api_user(7), job_id)
+        self.assertEqual(owner.status_code, 200)
+        self.assertNotIn('owner_id', owner.data['data'])
+        self.assertNotIn('args', owner.data['data'])
+        self.assertEqual(self.read_as(api_user(8), job_id).status_code, 404)
+        self.assertEqual(self.read_as(api_user(9, is_staff=True), job_id).status_code, 200)
+
+    def test_job_without_owner_is_staff_only(self):
+        job_id = enqueue(add_task, 1, 2, queue='tests-owner')
+        self.job_ids.append(job_id)
+        self.assertEqual(self.queue.status(job_id)['owner_id'], '')
+        self.assertEqual(self.read_as(api_user(7), job_id).status_code, 404)
+        self.assertEqual(self.read_as(api_user(9, is_staff=True), job_id).status_code, 200)
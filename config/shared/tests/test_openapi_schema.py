@@ -0,0 +1,70 @@
+import gzip
+import shutil
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from config.shared.helpers.openapi_schema_helper import (
+    CompiledSchema, OpenApiSchemaStaticHelper, openapi_schema_view,
+)
+
+
+class OpenApiSchemaViewTests(SimpleTestCase):
+    def setUp(self):
+        self.compiled = CompiledSchema(b'{"swagger": "2.0", "paths": {}}')
+        patcher = mock.patch.object(OpenApiSchemaStaticHelper, '_compiled', self.compiled)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.factory = RequestFactory()
+
+    def test_plain_body_with_etag_and_vary(self):
+        response = openapi_schema_view(self.factory.get('/api/v1/swagger.json'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, self.compiled.content)
+        self.assertEqual(response['ETag'], self.compiled.etag)
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_gzip_body(self):
+        response = openapi_schema_view(
+            self.factory.get('/api/v1/swagger.json', HTTP_ACCEPT_ENCODING='br, gzip'))
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertEqual(response['Vary'], 'Accept-Encoding')
+        self.assertEqual(gzip.decompress(response.content), self.compiled.content)
+
+    def test_not_modified_on_matching_etag(self):
+        response = openapi_schema_view(
+            self.factory.get('/api/v1/swagger.json', HTTP_IF_NONE_MATCH=self.compiled.etag))
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertEqual(response['ETag'], self.compiled.etag)
+
+    def test_stale_etag_gets_the_body(self):
+        response = openapi_schema_view(
+            self.factory.get('/api/v1/swagger.json', HTTP_IF_NONE_MATCH='"otro"'))
+        self.assertEqual(response.status_code, 200)
+
+
+class OpenApiSchemaFileTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.object(OpenApiSchemaStaticHelper, '_compiled', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.schema_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.schema_dir)
+
+    def test_versioned_file_is_served(self):
+        with override_settings(OPENAPI_SCHEMA_VERSION='1.4.0', OPENAPI_SCHEMA_DIR=self.schema_dir):
+            Path(self.schema_dir, 'openapi-1.4.0.json').write_bytes(b'{"v": "1.4.0"}')
+            with mock.patch.object(OpenApiSchemaStaticHelper, 'generate') as generate:
+                self.assertEqual(OpenApiSchemaStaticHelper.get_compiled().content, b'{"v": "1.4.0"}')
+            generate.assert_not_called()
+
+    def test_without_app_version_no_file_is_used(self):
+        Path(self.schema_dir, 'openapi-None.json').write_bytes(b'{"stale": true}')
+        with override_settings(OPENAPI_SCHEMA_VERSION=None, OPENAPI_SCHEMA_DIR=self.schema_dir):
+            self.assertIsNone(OpenApiSchemaStaticHelper.schema_path())
+            with mock.patch.object(OpenApiSchemaStaticHelper, 'generate', return_value=b'{}'):
+                self.assertEqual(OpenApiSchemaStaticHelper.get_compiled().content, b'{}')
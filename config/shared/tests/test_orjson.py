@@ -0,0 +1,70 @@
+import datetime
+import io
+import json
+import uuid
+from decimal import Decimal
+
+import orjson
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy as _
+from rest_framework.exceptions import ParseError
+from rest_framework.renderers import JSONRenderer
+
+from config.shared.parsers.orjson_parser import ORJSONParser
+from config.shared.renderers.orjson_renderer import ORJSONRenderer
+from core.ops.management.commands.benchmark_renderer import build_list_page
+
+
+class ORJSONRendererTests(SimpleTestCase):
+    def setUp(self):
+        self.renderer = ORJSONRenderer()
+
+    def render(self, data, **kwargs):
+        return self.renderer.render(data, 'application/json', **kwargs)
+
+    def test_none_renders_empty_body(self):
+        self.assertEqual(self.render(None), b'')
+
+    def test_native_types(self):
+        value = uuid.uuid4()
+        data = {
+            'uuid': value,
+            'created_at': datetime.datetime(2024, 1, 2, 3, 4, 5, tzinfo=datetime.timezone.utc),
+            'date': datetime.date(2024, 1, 2),
+            'price': Decimal('12.50'),
+            'message': _('Elementos paginados correctamente'),
+            'elapsed': datetime.timedelta(seconds=90),
+            'tags': {'a'},
+        }
+        self.assertEqual(orjson.loads(self.render(data)), {
+            'uuid': str(value),
+            'created_at': '2024-01-02T03:04:05Z',
+            'date': '2024-01-02',
+            'price': 12.5,
+            'message': 'Elementos paginados correctamente',
+            'elapsed': '90.0',
+            'tags': ['a'],
+        })
+
+    def test_unsupported_type_raises(self):
+        with self.assertRaises(TypeError):
+            self.render({'value': object()})
+
+    def test_indent_from_renderer_context(self):
+        rendered = self.render({'a': 1}, renderer_context={'indent': 4})
+        self.assertIn(b'\n  "a": 1', rendered)
+
+    def test_list_page_matches_drf_json_renderer(self):
+        page = build_list_page(30)
+        expected = json.loads(JSONRenderer().render(page, 'application/json'))
+        self.assertEqual(orjson.loads(self.render(page)), expected)
+
+
+class ORJSONParserTests(SimpleTestCase):
+    def test_parse(self):
+        stream = io.BytesIO(b'{"name": "Rol", "items": [1, 2.5, null]}')
+        self.assertEqual(ORJSONParser().parse(stream), {'name': 'Rol', 'items': [1, 2.5, None]})
+
+    def test_invalid_json_raises_parse_error(self):
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(io.BytesIO(b'{"name": '))
@@ -0,0 +1,79 @@
+import datetime
+
+from django.test import TestCase
+from django.utils import timezone
+from rest_framework import serializers
+
+from config.shared.exceptions.resource_not_found_exception import ResourceNotFoundException
+from config.shared.repositories.base_repository import BaseRepositoryAllMixin
+from config.shared.services.base_service import BaseServiceMixin
+from users.models.usuario_model import Usuario
+
+
+class StatefulUser(Usuario):
+    """ Usuario con `state` (como los modelos con borrado lógico) """
+
+    class Meta:
+        proxy = True
+        app_label = 'users'
+
+    @property
+    def state(self):
+        return not self.username.startswith('inactivo')
+
+
+class StatefulUserSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = StatefulUser
+        fields = ['id', 'username', 'razon_social']
+
+
+def old_lookup(service, attr, value):
+    """ lo que hacía find_all_post_serializer antes: find_one_by_attr por fila """
+    try:
+        return dict(service.find_one_by_attr(attr, value))
+    except ResourceNotFoundException:
+        return None
+
+
+class PostSerializeJoinTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        rows = [
+            # (username, razon_social, antigüedad en minutos)
+            ('acme-nuevo', 'ACME', 1),
+            ('acme-viejo', 'ACME', 5),          # duplicado: gana según Meta.ordering (-created_at)
+            ('inactivo-globex', 'GLOBEX', 1),   # el primero es inactivo
+            ('globex', 'GLOBEX', 9),
+            ('initech', 'INITECH', 1),
+        ]
+        for username, razon_social, minutes in rows:
+            user = StatefulUser.objects.create_user(
+                email=f'{username}@example.com', password='x', username=username, razon_social=razon_social)
+            StatefulUser.objects.filter(pk=user.pk).update(created_at=now - datetime.timedelta(minutes=minutes))
+
+    def setUp(self):
+        self.related = BaseServiceMixin(BaseRepositoryAllMixin(StatefulUser), serializer2=StatefulUserSerializer)
+        self.service = BaseServiceMixin(BaseRepositoryAllMixin(StatefulUser))
+
+    def test_parity_with_per_row_lookup(self):
+        page = [{'id': 1, 'empresa': name} for name in ('ACME', 'GLOBEX', 'INITECH', 'NADIE', 'ACME')]
+        page.append({'id': 6, 'empresa': None})
+        joined = self.service.post_serialize_join(
+            page, self.related, 'razon_social', as_key='cliente', source_key='empresa', wrap_key='item')
+        expected = [{'item': item, 'cliente': old_lookup(self.related, 'razon_social', item['empresa'])
+                     if item['empresa'] is not None else None} for item in page]
+        self.assertEqual(joined, expected)
+        self.assertEqual(joined[0]['cliente']['username'], 'acme-nuevo')
+        self.assertIsNone(joined[1]['cliente'])  # primer match inactivo, como find_one_by_attr
+        self.assertIsNone(joined[3]['cliente'])
+
+    def test_single_query(self):
+        page = [{'id': index, 'empresa': name} for index, name in enumerate(('ACME', 'GLOBEX', 'INITECH'))]
+        with self.assertNumQueries(1):
+            self.service.post_serialize_join(page, self.related, 'razon_social', as_key='cliente', source_key='empresa')
+
+    def test_unordered_model_uses_pk_order(self):
+        queryset = BaseRepositoryAllMixin(StatefulUser).find_all_by_attr_in('razon_social', ['ACME'])
+        self.assertTrue(queryset.ordered)
@@ -0,0 +1,117 @@
+from django.db import connection
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase
+from prometheus_client import REGISTRY
+
+from config.shared.helpers.query_instrumentation_helper import (
+    QueryStats, assert_query_budget, fingerprint_sql, instrument_queries,
+)
+from config.shared.middlewares.query_instrumentation_middleware import QueryInstrumentationMiddleware
+
+
+def run_query():
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT %s', [1])
+
+
+def observed_queries(view):
+    labels = {'view': view}
+    return (REGISTRY.get_sample_value('django_request_db_queries_sum', labels) or 0,
+            REGISTRY.get_sample_value('django_request_db_queries_count', labels) or 0)
+
+
+# ---------------------------
+# fingerprints
+# ---------------------------
+class FingerprintTests(TestCase):
+    def test_in_lists_collapse_regardless_of_length(self):
+        short = 'SELECT * FROM t WHERE id IN (%s, %s)'
+        long = 'SELECT * FROM t WHERE id IN (%s, %s, %s, %s, %s)'
+        self.assertEqual(fingerprint_sql(short), fingerprint_sql(long))
+        self.assertEqual(fingerprint_sql(short), 'SELECT * FROM t WHERE id IN (%s...)')
+
+    def test_whitespace_is_normalized(self):
+        self.assertEqual(fingerprint_sql('SELECT  *\n FROM t\tWHERE id = %s '), 'SELECT * FROM t WHERE id = %s')
+
+    def test_different_statements_keep_different_fingerprints(self):
+        self.assertNotEqual(fingerprint_sql('SELECT * FROM t WHERE id = %s'),
+                            fingerprint_sql('SELECT * FROM t WHERE uuid = %s'))
+        # un IN de un solo parámetro no es una lista
+        self.assertEqual(fingerprint_sql('SELECT * FROM t WHERE id IN (%s)'), 'SELECT * FROM t WHERE id IN (%s)')
+
+    def test_stats_count_duplicates_and_slowest(self):
+        stats = QueryStats(slowest_count=2)
+        for sql, duration in (('SELECT 1 WHERE a IN (%s, %s)', 0.1), ('SELECT 1 WHERE a IN (%s, %s, %s)', 0.3),
+                              ('SELECT 2', 0.2)):
+            stats.record(sql, duration)
+        self.assertEqual(stats.count, 3)
+        self.assertEqual(stats.duplicates, {'SELECT 1 WHERE a IN (%s...)': 2})
+        self.assertEqual(stats.duplicate_count, 1)
+        self.assertEqual([duration for _, duration in stats.slowest], [0.3, 0.2])
+
+    def test_assert_query_budget(self):
+        with assert_query_budget(max_queries=2, max_repeated=2):
+            run_query()
+            run_query()
+        with self.assertRaisesMessage(AssertionError, 'statement repetido 2 veces'):
+            with assert_query_budget(max_queries=5, max_repeated=1):
+                run_query()
+                run_query()
+
+    def test_existing_stats_keep_accumulating(self):
+        with instrument_queries() as stats:
+            run_query()
+        with instrument_queries(stats=stats):
+            run_query()
+        self.assertEqual(stats.count, 2)
+
+
+# ---------------------------
+# middleware
+# ---------------------------
+class QueryInstrumentationMiddlewareTests(TestCase):
+    def call(self, view, get_response):
+        request = RequestFactory().get('/api/v1/tests/')
+        request._instrumented_view = view
+        return QueryInstrumentationMiddleware(get_response)(request)
+
+    def test_observes_regular_response(self):
+        before = observed_queries('RegularView')
+
+        def get_response(request):
+            run_query()
+            run_query()
+            return HttpResponse('ok')
+
+        self.call('RegularView', get_response)
+        after = observed_queries('RegularView')
+        self.assertEqual((after[0] - before[0], after[1] - before[1]), (2, 1))
+
+    def test_streaming_body_queries_are_counted(self):
+        before = observed_queries('StreamingView')
+
+        def rows():
+            for index in range(3):
+                run_query()
+                yield f'{index}\n'
+
+        def get_response(request):
+            run_query()
+            return StreamingHttpResponse(rows())
+
+        response = self.call('StreamingView', get_response)
+        # nada se observa hasta consumir el body
+        self.assertEqual(observed_queries('StreamingView'), before)
+        self.assertEqual(b''.join(response.streaming_content), b'0\n1\n2\n')
+        after = observed_queries('StreamingView')
+        self.assertEqual((after[0] - before[0], after[1] - before[1]), (4, 1))
+
+    def test_n_plus_one_is_logged(self):
+        def get_response(request):
+            for _ in range(10):
+                run_query()
+            return HttpResponse('ok')
+
+        with self.assertLogs('config.shared.middlewares.query_instrumentation_middleware', 'WARNING') as logs:
+            self.call('LoopView', get_response)
+        self.assertIn('Posible N+1', logs.output[0])
@@ -0,0 +1,75 @@
+import threading
+
+from django.test import RequestFactory, SimpleTestCase
+
+from config.shared.di.di import resolve
+from config.shared.helpers.request_context_helper import (
+    end_request_context, get_request_context, start_request_context,
+)
+from config.shared.middlewares.request_context_middleware import RequestContextMiddleware
+from config.shared.services.common.job_queue import JobQueue, job
+from config.shared.services.common.tenant_job_runner import TenantJobRunner
+
+
+@job(name='tests.remember_pre_instance', queue='tests')
+def remember_pre_instance(value):
+    context = get_request_context()
+    previous = context.pre_instance
+    context.pre_instance = value
+    return previous
+
+
+class RequestContextTests(SimpleTestCase):
+    def test_middleware_opens_and_closes_context(self):
+        request = RequestFactory().get('/api/v1/role/')
+        seen = {}
+
+        def get_response(req):
+            seen['context'] = get_request_context()
+            return 'response'
+
+        outer = get_request_context()
+        self.assertEqual(RequestContextMiddleware(get_response)(request), 'response')
+        self.assertIs(seen['context'].request, request)
+        self.assertIsNot(seen['context'], outer)
+        self.assertIs(get_request_context(), outer)
+
+    def test_pre_instance_is_isolated_per_thread(self):
+        service = resolve('role_service')
+        barrier = threading.Barrier(2)
+        results = {}
+
+        def run(name):
+            token = start_request_context()
+            try:
+                service.pre_instance = {'name': name}
+                barrier.wait()  # ambos threads escribieron antes de leer
+                results[name] = service.pre_instance
+            finally:
+                end_request_context(token)
+
+        threads = [threading.Thread(target=run, args=(name,)) for name in ('a', 'b')]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(results, {'a': {'name': 'a'}, 'b': {'name': 'b'}})
+
+    def test_jobs_do_not_share_context(self):
+        queue = JobQueue()
+        job_ids = [queue.enqueue(remember_pre_instance, args=(name,), queue='tests-context') for name in 'ab']
+        try:
+            for job_id in job_ids:
+                queue.execute(job_id)
+            self.assertEqual([queue.status(job_id)['result'] for job_id in job_ids], [None, None])
+        finally:
+            queue.client.delete('jobs:queue:tests-context', *(f'jobs:job:{job_id}' for job_id in job_ids))
+        self.assertIsNone(get_request_context().pre_instance)
+
+    def test_tenant_callbacks_do_not_share_context(self):
+        def callback(schema):
+            return remember_pre_instance(schema)
+
+        # un solo thread atiende todos los schemas
+        report = TenantJobRunner(callback, max_workers=1).run(['a', 'b', 'c'], resume=False)
+        self.assertEqual(report.results, {'a': None, 'b': None, 'c': None})
@@ -0,0 +1,55 @@
+from unittest import mock
+
+import user_agents
+from django.test import RequestFactory, SimpleTestCase
+from rest_framework.request import Request
+
+from config.shared.helpers import request_netinfo
+from config.shared.helpers.request_netinfo import get_request_netinfo, get_user_agent, parse_user_agent
+
+CHROME_UA = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+             '(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+
+
+class UserAgentParsingTests(SimpleTestCase):
+    def setUp(self):
+        parse_user_agent.cache_clear()
+
+    def test_parse_is_shared_per_ua_string(self):
+        with mock.patch.object(user_agents, 'parse', wraps=user_agents.parse) as parse:
+            first = parse_user_agent(CHROME_UA)
+            second = parse_user_agent(CHROME_UA)
+            parse_user_agent('curl/8.0')
+        self.assertIs(first, second)
+        self.assertEqual(parse.call_count, 2)
+        self.assertEqual(first.browser.family, 'Chrome')
+
+    def test_single_parse_per_request(self):
+        http_request = RequestFactory().get('/', HTTP_USER_AGENT=CHROME_UA)
+        drf_request = Request(http_request)
+        with mock.patch.object(request_netinfo, 'parse_user_agent', wraps=parse_user_agent) as parse:
+            user_agent = get_user_agent(drf_request)
+            self.assertIs(get_user_agent(http_request), user_agent)
+        self.assertEqual(parse.call_count, 1)
+
+
+class RequestNetinfoTests(SimpleTestCase):
+    def test_netinfo_is_built_once_per_request(self):
+        http_request = RequestFactory().get(
+            '/', HTTP_X_FORWARDED_FOR='203.0.113.7, 10.0.0.1, basura', REMOTE_ADDR='10.0.0.2')
+        drf_request = Request(http_request)
+        with mock.patch.object(request_netinfo, '_build_request_netinfo',
+                               wraps=request_netinfo._build_request_netinfo) as build:
+            netinfo = get_request_netinfo(drf_request)
+            self.assertIs(get_request_netinfo(http_request), netinfo)
+            self.assertIs(get_request_netinfo(drf_request), netinfo)
+        self.assertEqual(build.call_count, 1)
+        self.assertEqual(netinfo['client_ip'], '203.0.113.7')
+        self.assertEqual(netinfo['ip_chain'], ['203.0.113.7', '10.0.0.1'])
+        self.assertEqual(netinfo['edge_ip'], '10.0.0.2')
+
+    def test_requests_do_not_share_netinfo(self):
+        factory = RequestFactory()
+        first = get_request_netinfo(factory.get('/', REMOTE_ADDR='10.0.0.1'))
+        second = get_request_netinfo(factory.get('/', REMOTE_ADDR='10.0.0.2'))
+        self.assertEqual((first['client_ip'], second['client_ip']), ('10.0.0.1', '10.0.0.2'))
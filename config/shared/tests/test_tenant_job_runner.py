@@ -0,0 +1,84 @@
+import threading
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+
+from config.shared.services.common.multitenant_static_helper import MultitenantStaticHelper
+from config.shared.services.common.tenant_job_runner import TenantJobError, TenantJobRunner
+
+
+def backend_pid(schema):
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT pg_backend_pid()')
+        return cursor.fetchone()[0]
+
+
+class FakeCallback:
+    """ callback por tenant: registra los schemas y falla en los indicados """
+
+    def __init__(self, failing=()):
+        self.failing = set(failing)
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, schema):
+        with self.lock:
+            self.calls.append(schema)
+        if schema in self.failing:
+            raise ValueError(f'falló {schema}')
+        return schema.upper()
+
+
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class TenantJobRunnerTests(TestCase):
+    def test_errors_are_collected_per_tenant(self):
+        callback = FakeCallback(failing={'b'})
+        report = TenantJobRunner(callback, max_workers=2).run(['a', 'b', 'c'], resume=False)
+        self.assertEqual(report.results, {'a': 'A', 'c': 'C'})
+        self.assertEqual(report.errors, {'b': 'falló b'})
+        self.assertFalse(report.ok)
+        self.assertEqual(sorted(callback.calls), ['a', 'b', 'c'])
+
+    def test_statement_timeout_marks_tenant_as_timed_out(self):
+        def callback(schema):
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_sleep(%s)', [5 if schema == 'slow' else 0])
+            return schema
+
+        report = TenantJobRunner(callback, max_workers=1, timeout=0.2).run(['slow', 'fast'], resume=False)
+        self.assertEqual(report.timed_out, ['slow'])
+        self.assertEqual(report.results, {'fast': 'fast'})
+        self.assertEqual(report.errors, {})
+
+    def test_resume_skips_checkpointed_schemas(self):
+        callback = FakeCallback(failing={'b'})
+        runner = TenantJobRunner(callback, max_workers=2, job_name='tests-resume')
+        first = runner.run(['a', 'b', 'c'])
+        self.assertEqual(first.errors, {'b': 'falló b'})
+
+        callback.failing.clear()
+        callback.calls.clear()
+        second = runner.run(['a', 'b', 'c'])
+        self.assertEqual(callback.calls, ['b'])
+        self.assertEqual(sorted(second.skipped), ['a', 'c'])
+        self.assertTrue(second.ok)
+        # run limpio: el checkpoint se borra
+        self.assertEqual(runner._get_checkpoint(), set())
+
+    def test_one_connection_per_worker(self):
+        report = TenantJobRunner(backend_pid, max_workers=1).run(['a', 'b', 'c'], resume=False)
+        self.assertEqual(len(set(report.results.values())), 1)
+        report = TenantJobRunner(backend_pid, max_workers=2).run(list('abcdef'), resume=False)
+        self.assertLessEqual(len(set(report.results.values())), 2)
+
+    def test_helper_raises_after_running_all_schemas(self):
+        callback = FakeCallback(failing={'b'})
+        tenants = mock.Mock()
+        tenants.objects.exclude.return_value.values_list.return_value = ['a', 'b', 'c']
+        with mock.patch('config.shared.services.common.multitenant_static_helper.get_tenant_model',
+                        return_value=tenants):
+            with self.assertRaises(TenantJobError) as raised:
+                MultitenantStaticHelper.run_in_all_schemas_but_list(callback)
+        self.assertEqual(raised.exception.report.results, {'a': 'A', 'c': 'C'})
+        self.assertEqual(list(raised.exception.report.errors), ['b'])
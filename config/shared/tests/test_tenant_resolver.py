@@ -0,0 +1,65 @@
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from config.shared.services.common.tenant_resolver import TenantInfo, TenantResolver
+
+
+class RecordingTenantResolver(TenantResolver):
+    TENANTS = {('domain', 'acme.example.com'): 'acme', ('schema', 'acme'): 'acme',
+               ('domain', 'globex.example.com'): 'globex', ('domain', 'initech.example.com'): 'initech'}
+
+    def __init__(self):
+        super().__init__()
+        self.loads = []
+
+    def _load(self, key):
+        self.loads.append(key)
+        schema_name = self.TENANTS.get(key)
+        return TenantInfo(schema_name=schema_name) if schema_name else None
+
+
+@override_settings(TENANT_MODEL='multicpy.Scheme', TENANT_HEADER='HTTP_X_TENANT', TENANT_CACHE_TTL=60,
+                   TENANT_CACHE_MAX_SIZE=2, TENANT_TRUSTED_PROXIES=['10.0.0.0/8'],
+                   DEFAULT_SCHEMA='public', ALLOWED_HOSTS=['*'])
+class TenantResolverTests(SimpleTestCase):
+    def setUp(self):
+        self.resolver = RecordingTenantResolver()
+
+    def resolve(self, host, header=None, remote_addr='203.0.113.5'):
+        extra = {'HTTP_HOST': host, 'REMOTE_ADDR': remote_addr}
+        if header:
+            extra['HTTP_X_TENANT'] = header
+        return self.resolver.resolve(RequestFactory().get('/', **extra))
+
+    def test_hits_are_cached(self):
+        self.assertEqual(self.resolve('acme.example.com').schema_name, 'acme')
+        self.assertEqual(self.resolve('ACME.example.com:8000').schema_name, 'acme')
+        self.assertEqual(self.resolver.loads, [('domain', 'acme.example.com')])
+
+    def test_misses_are_not_cached(self):
+        for index in range(5):
+            info = self.resolve(f'random-{index}.example.com')
+            self.assertEqual(info.schema_name, 'public')
+        self.resolve('random-0.example.com')
+        self.assertEqual(len(self.resolver.loads), 6)
+        self.assertEqual(len(self.resolver._cache), 0)
+
+    def test_cache_is_bounded_lru(self):
+        self.resolve('acme.example.com')
+        self.resolve('globex.example.com')
+        self.resolve('acme.example.com')  # acme pasa a ser el más reciente
+        self.resolve('initech.example.com')  # desaloja a globex
+        self.assertEqual(list(self.resolver._cache), [('domain', 'acme.example.com'),
+                                                      ('domain', 'initech.example.com')])
+
+    def test_header_ignored_from_untrusted_client(self):
+        info = self.resolve('globex.example.com', header='acme')
+        self.assertEqual(info.schema_name, 'globex')
+
+    def test_header_honoured_from_trusted_proxy(self):
+        info = self.resolve('globex.example.com', header='acme', remote_addr='10.1.2.3')
+        self.assertEqual(info.schema_name, 'acme')
+
+    @override_settings(TENANT_MODEL=None)
+    def test_without_tenants_everything_is_default(self):
+        self.assertEqual(self.resolve('acme.example.com').schema_name, 'public')
+        self.assertEqual(self.resolver.loads, [])
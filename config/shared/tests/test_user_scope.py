@@ -0,0 +1,157 @@
+from django.test import RequestFactory, SimpleTestCase
+
+from config.shared.constants.choices import USER_ROLES
+from config.shared.helpers.request_context_helper import end_request_context, start_request_context
+from config.shared.services.base_mixins_service import (
+    FindServiceGenericUserFilterMixin, FindServiceSalesFilterMixin,
+)
+from config.shared.services.common.user_scope_static_helper import UserScope, UserScopeStaticHelper
+from config.shared.views.base_mixins_view import CacheViewMixin
+
+
+class SalesModel:
+    """ modelo con todos los campos que filtran los roles """
+    area = departamento = canal_venta = vendedor = usuario_flota = None
+
+
+class PlainModel:
+    """ modelo sin campos de scope: todos ven lo mismo """
+
+
+class RecordingQuerySet:
+    def __init__(self, filters=()):
+        self.filters = tuple(filters)
+
+    def filter(self, **kwargs):
+        return RecordingQuerySet(self.filters + tuple(sorted(kwargs.items())))
+
+    def order_by(self, *fields):
+        return self
+
+
+class UnexpectedRepository:
+    def find_one(self, user_id):
+        raise AssertionError('el scope debe salir de request.user')
+
+
+def request_user(user_id=7, role='COORDINADOR'):
+    return type('User', (), {
+        'id': user_id, 'is_authenticated': True, 'role': role, 'is_superuser': False,
+        'state': True, 'area_id': 1, 'departamento_id': 10, 'canal_venta_id': 100})()
+
+
+def build_scope(user_id, role, area_id=1, departamento_id=10, canal_venta_id=100, is_superuser=False):
+    return UserScope(user_id=user_id, role=role, is_superuser=is_superuser, area_id=area_id,
+                     departamento_id=departamento_id, canal_venta_id=canal_venta_id)
+
+
+class ScopeCacheKeyMatrixTests(SimpleTestCase):
+    ROLES = [role for role, _ in USER_ROLES] + [None]
+
+    def key(self, model, scope):
+        return UserScopeStaticHelper.get_scope_key(model, scope)
+
+    def rows(self, model, scope):
+        return UserScopeStaticHelper.apply_scope(RecordingQuerySet(), model, scope).filters
+
+    def assertKeyMatchesRows(self, model, first, second):
+        same_key = self.key(model, first) == self.key(model, second)
+        same_rows = self.rows(model, first) == self.rows(model, second)
+        self.assertEqual(same_key, same_rows, (model.__name__, first.role, second.role))
+
+    def test_matrix(self):
+        variants = (
+            # (user_id, area, departamento, canal) respecto al usuario base (1, 1, 10, 100)
+            (2, 1, 10, 100),    # mismo equipo
+            (1, 2, 10, 100),    # otra área
+            (1, 1, 20, 100),    # otro departamento
+            (1, 1, 10, 200),    # otro canal
+            (3, 2, 20, 200),    # todo distinto
+        )
+        for model in (SalesModel, PlainModel):
+            for role in self.ROLES:
+                for other_role in self.ROLES:
+                    base = build_scope(1, role)
+                    for user_id, area, departamento, canal in variants:
+                        with self.subTest(model=model.__name__, role=role, other=other_role, user=user_id):
+                            other = build_scope(user_id, other_role, area, departamento, canal)
+                            self.assertKeyMatchesRows(model, base, other)
+
+    def test_expected_keys(self):
+        expected = {
+            'GERENCIA': 'global',
+            'ADMINISTRADOR': 'area:1',
+            'COORDINADOR': 'departamento:10',
+            'SUPERVISOR': 'canal_venta:100',
+            'AGENTE': 'vendedor:7',
+            'TECNICO': 'usuario_flota:7',
+            'BODEGUERO': 'global',
+        }
+        for role, key in expected.items():
+            with self.subTest(role=role):
+                self.assertEqual(self.key(SalesModel, build_scope(7, role)), key)
+                self.assertEqual(self.key(PlainModel, build_scope(7, role)), 'global')
+
+    def test_superuser_is_global(self):
+        scope = build_scope(7, 'AGENTE', is_superuser=True)
+        self.assertEqual(self.key(SalesModel, scope), 'global')
+        self.assertEqual(self.rows(SalesModel, scope), ())
+
+    def test_view_key_uses_request_user(self):
+        class View(CacheViewMixin):
+            pass
+
+        request = RequestFactory().get('/api/v1/ventas/')
+        request.user = request_user()
+        view = View()
+        view.service = type('Service', (), {
+            'repository': type('Repository', (), {'model': SalesModel})(),
+            'user_repository': UnexpectedRepository()})()
+
+        token = start_request_context(request)
+        try:
+            self.assertEqual(view.get_scope_cache_key(request), 'departamento:10')
+        finally:
+            end_request_context(token)
+
+
+class ScopeHookContractTests(SimpleTestCase):
+    """ los hooks _filter_by_*_logic_mx reciben la instancia de usuario (overrides existentes) """
+
+    def setUp(self):
+        self.request = RequestFactory().get('/api/v1/ventas/')
+        self.request.user = request_user()
+        self.token = start_request_context(self.request)
+
+    def tearDown(self):
+        end_request_context(self.token)
+
+    def service(self, mixin, **attrs):
+        service = type('Service', (mixin,), attrs)()
+        service.repository = type('Repository', (), {
+            'model': SalesModel, 'find_all': lambda self: RecordingQuerySet()})()
+        service.user_repository = UnexpectedRepository()
+        return service
+
+    def test_default_hooks_apply_the_role_rule(self):
+        for mixin in (FindServiceSalesFilterMixin, FindServiceGenericUserFilterMixin):
+            with self.subTest(mixin=mixin.__name__):
+                queryset = self.service(mixin).find_all_mx(user_id=7)
+                self.assertEqual(queryset.filters, (('departamento', 10),))
+
+    def test_overrides_receive_the_user_instance(self):
+        received = []
+
+        def sales_hook(self, queryset, user):
+            received.append(user)
+            return queryset.filter(area=user.area_id)
+
+        def user_hook(self, queryset, user):
+            received.append(user)
+            return queryset.filter(vendedor=user.id)
+
+        sales = self.service(FindServiceSalesFilterMixin, _filter_by_sales_logic_mx=sales_hook)
+        generic = self.service(FindServiceGenericUserFilterMixin, _filter_by_user_logic_mx=user_hook)
+        self.assertEqual(sales.find_all_mx(user_id=7).filters, (('area', 1),))
+        self.assertEqual(generic.find_all_mx(user_id=7).filters, (('vendedor', 7),))
+        self.assertEqual(received, [self.request.user, self.request.user])
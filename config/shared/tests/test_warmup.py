@@ -0,0 +1,56 @@
+from unittest import mock
+
+from django.test import SimpleTestCase, override_settings
+
+from config.shared.helpers import warmup_helper
+from config.shared.helpers.warmup_helper import WarmupStaticHelper
+from webhooks.services import auditoria_log_service
+from webhooks.services.auditoria_log_service import get_es_log_service
+
+
+@override_settings(ES_URL=None)
+class WarmupConnectionsTests(SimpleTestCase):
+    def test_db_connections_are_skipped_when_threaded(self):
+        with mock.patch.object(WarmupStaticHelper, 'warm_connections',
+                               wraps=WarmupStaticHelper.warm_connections) as warm_connections, \
+                mock.patch.object(WarmupStaticHelper, 'warm_views', return_value={}), \
+                mock.patch.object(WarmupStaticHelper, 'warm_openapi', return_value=0):
+            report = WarmupStaticHelper.run(open_connections=True, db_connections=False)
+        warm_connections.assert_called_once_with(db=False)
+        self.assertEqual(report['connections'], ['cache'])
+
+    def test_pre_fork_run_does_not_observe(self):
+        # el master no expone métricas: solo los workers las registran
+        with mock.patch.object(WarmupStaticHelper, 'warm_views', return_value={}), \
+                mock.patch.object(WarmupStaticHelper, 'warm_openapi', return_value=0), \
+                mock.patch.object(warmup_helper.worker_warmup_seconds, 'labels') as labels:
+            WarmupStaticHelper.run(open_connections=False, observe=False)
+            labels.assert_not_called()
+            WarmupStaticHelper.run(open_connections=False)
+        self.assertEqual({call.kwargs['stage'] for call in labels.call_args_list},
+                         {'urls', 'views', 'openapi', 'total'})
+
+    @override_settings(ES_URL='http://elasticsearch:9200')
+    def test_es_warmup_uses_the_process_client(self):
+        service = mock.Mock()
+        service.ping.return_value = True
+        with mock.patch.object(auditoria_log_service, 'get_es_log_service', return_value=service):
+            opened = WarmupStaticHelper.warm_connections(db=False)
+        self.assertEqual(opened, ['cache', 'elasticsearch'])
+        service.ping.assert_called_once_with(timeout=3)
+
+
+class ESLogServiceAccessorTests(SimpleTestCase):
+    def setUp(self):
+        patcher = mock.patch.multiple(auditoria_log_service, _es_log_service=None, _es_log_service_pid=None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_one_instance_per_process(self):
+        self.assertIs(get_es_log_service(), get_es_log_service())
+
+    def test_new_instance_after_fork(self):
+        parent = get_es_log_service()
+        with mock.patch.object(auditoria_log_service.os, 'getpid', return_value=-1):
+            child = get_es_log_service()
+        self.assertIsNot(child, parent)
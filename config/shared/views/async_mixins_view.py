@@ -0,0 +1,170 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from rest_framework import status
+from rest_framework.response import Response
+
+from config.shared.helpers.handle_rest_exception_helper import handle_rest_exception_helper
+from config.shared.helpers.request_context_helper import get_request_context
+from config.shared.helpers.pagination_helper import get_pagination_parameters_rest
+from config.shared.utils.redis_utils import get_filter_string
+from config.shared.constants.envs_constants import env
+from config.shared.views.base_mixins_view import CacheViewMixin, get_schema_name
+
+
+class AsyncAPIViewMixin:
+    """
+    Dispatch async para APIView (DRF 3.14 y Django 4.0 no soportan handlers async).
+    Autenticación/permisos usan el ORM -> se ejecutan en thread (sync_to_async);
+    los handlers `async def` corren en el event loop y los sync se delegan a thread.
+    Debe ir antes de APIView en el MRO (primer base de la view).
+    """
+
+    @classmethod
+    def as_view(cls, **initkwargs):
+        # validaciones de Django/DRF sobre initkwargs
+        super().as_view(**initkwargs)
+
+        async def view(request, *args, **kwargs):
+            self = cls(**initkwargs)
+            self.setup(request, *args, **kwargs)
+            return await self.adispatch(request, *args, **kwargs)
+
+        view.view_class = cls
+        view.view_initkwargs = initkwargs
+        view.cls = cls
+        view.initkwargs = initkwargs
+        view.__doc__ = cls.__doc__
+        view.__module__ = cls.__module__
+        # mismo comportamiento que csrf_exempt de APIView (auth por token)
+        view.csrf_exempt = True
+        return view
+
+    async def adispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(),
+                                  self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            if asyncio.iscoroutinefunction(handler):
+                response = await handler(request, *args, **kwargs)
+            else:
+                response = await sync_to_async(handler)(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(
+            request, response, *args, **kwargs)
+        return self.response
+
+
+class AsyncCacheViewMixin(CacheViewMixin):
+    async def aget_cached_data(self, cache_key):
+        return await cache.aget(cache_key)
+
+    async def aset_cached_data(self, cache_key, data):
+        if get_request_context().db_replica_used:
+            return
+        await cache.aset(cache_key, data, timeout=int(
+            env.str('REDIS_TIMEOUT')))
+
+
+class AsyncListViewMixin(AsyncCacheViewMixin):
+    """
+    Variante async de ListViewMixin (sin export streaming: el iterator del ORM
+    no puede recorrerse desde el event loop en Django 4.0).
+    Un hit de cache responde sin tocar el ORM ni salir del event loop.
+    """
+    async def get(self, request, ignorar_user=False):
+        try:
+            filter_params, page_number, page_size = get_pagination_parameters_rest(
+                request)
+            # ## cache debe considerar tenant company
+            schema_name = get_schema_name(request)
+            cache_key = self.get_cache_key({
+                **filter_params, **{'schema_name': schema_name}
+            })
+            cache_data = await self.aget_cached_data(cache_key)
+
+            if cache_data:
+                return Response(
+                    {
+                        'status': status.HTTP_200_OK,
+                        'message': 'Elementos paginados correctamente',
+                        'data': {
+                            'meta': cache_data['meta'],
+                            'items': cache_data['data'],
+                        }
+                    },
+                    status=status.HTTP_200_OK
+                )
+
+            # ORM sync en Django 4.0 -> thread
+            serialized_instances = await sync_to_async(self.service.find_all)(
+                filter_params, page_number, page_size)
+            await self.aset_cached_data(
+                cache_key, {
+                    'meta': serialized_instances['meta'], 'data': serialized_instances['data']}
+            )
+
+            return Response(
+                {
+                    'status': status.HTTP_200_OK,
+                    'message': 'Elementos paginados correctamente',
+                    'data': {
+                        'meta': serialized_instances['meta'],
+                        'items': serialized_instances['data'],
+                    }
+                },
+                status=status.HTTP_200_OK
+            )
+        except Exception as e:
+            return handle_rest_exception_helper(e)
+
+
+class AsyncRetrieveViewMixin(AsyncCacheViewMixin):
+    """ Variante async de RetrieveViewMixin """
+    async def get(self, request, uuid):
+        # ## cache debe considerar tenant company
+        schema_name = get_schema_name(request)
+        filter_params, page_number, page_size = get_pagination_parameters_rest(
+            request)
+        filter_params_str_cache_key = get_filter_string(filter_params)
+        cache_key = f"{self.service.repository.model.__name__}{schema_name}{filter_params_str_cache_key}{uuid}_one"
+        cache_data = await self.aget_cached_data(cache_key)
+
+        if cache_data:
+            return Response(
+                {
+                    'status': status.HTTP_200_OK,
+                    'message': 'Elemento encontrado',
+                    'data': cache_data
+                },
+                status=status.HTTP_200_OK
+            )
+
+        try:
+            serialized_instance = await sync_to_async(self.service.find_one_by_uuid)(
+                uuid, filter_params)
+            await self.aset_cached_data(cache_key, serialized_instance)
+            return Response(
+                {
+                    'status': status.HTTP_200_OK,
+                    'message': 'Elemento encontrado',
+                    'data': serialized_instance
+                },
+                status=status.HTTP_200_OK
+            )
+        except Exception as e:
+            return handle_rest_exception_helper(e)
@@ -26,10 +26,16 @@ from config.shared.utils.common_utils import (
 )
 from config.shared.helpers.pagination_helper import get_pagination_parameters_rest
 from config.shared.helpers.handle_rest_exception_helper import handle_rest_exception_helper
+from config.shared.helpers.db_replica_helper import replica_read
+from config.shared.helpers.request_context_helper import get_request_context
+from config.shared.helpers.streaming_export_helper import get_export_format, build_streaming_export_response
+from config.shared.constants.constants import EXPORT_FORMAT_KEY, PAGINATION_PAGE_NUMBER_KEY, PAGINATION_PAGE_SIZE_KEY
+from config.shared.exceptions.bad_request_exception import BadRequestException
 
 from config.shared.constants.envs_constants import env
 
 from config.shared.views.audit_log_mixin import AuditLogMixin
+from config.shared.services.common.user_scope_static_helper import UserScopeStaticHelper
 
 
 class IsActiveUser(BasePermission):
@@ -84,13 +90,27 @@ class PermissionRequiredViewMixin(APIView):
 
 
 class CacheViewMixin:
+    """
+    Los GET con cache leen del primario: un miss se guarda en cache y una réplica
+    atrasada (ej. justo después de clear_cache) dejaría data vieja hasta REDIS_TIMEOUT.
+    Las réplicas (@replica_read) quedan para los mixins sin cache.
+    """
+
     def get_cache_key(self, filter_params):
         return generate_cache_key(filter_params=filter_params, model_name=self.service.repository.model.__name__)
 
+    def get_scope_cache_key(self, request):
+        # usuarios con la misma visibilidad (global, area, departamento, ...) comparten entradas
+        scope = UserScopeStaticHelper.get_user_scope(
+            request.user.id, self.service.user_repository)
+        return UserScopeStaticHelper.get_scope_key(self.service.repository.model, scope)
+
     def get_cached_data(self, cache_key):
         return cache.get(cache_key)
 
     def set_cached_data(self, cache_key, data):
+        if get_request_context().db_replica_used:
+            return
         cache.set(cache_key, data, timeout=int(
             env.str('REDIS_TIMEOUT')))
 
@@ -113,9 +133,38 @@ class CacheViewMixin:
         cache.delete_pattern(f"*{schema_name}*__one")
 
 
-class ListViewMixin(CacheViewMixin):
+class ExportViewMixin:
+    def get_export_response(self, request, user_id=None, ignorar_user=False):
+        # ?export=ndjson|csv -> stream completo sin paginar ni cachear
+        export_format = get_export_format(request)
+        if not export_format:
+            return None
+        if not hasattr(self.service, 'find_all_export_qs'):
+            raise BadRequestException(
+                message='Exportación no disponible para este recurso')
+
+        filter_params = request.GET.copy()
+        # sin paginar: page/page_size no llegan al FilterSet
+        for key in (EXPORT_FORMAT_KEY, PAGINATION_PAGE_NUMBER_KEY, PAGINATION_PAGE_SIZE_KEY):
+            filter_params.pop(key, None)
+        # el queryset (y el scope del usuario) se resuelve antes de abrir el stream,
+        # asi los errores aun responden con el formato normal
+        queryset = self.service.find_all_export_qs(
+            filter_params, user_id=user_id, ignorar_user=ignorar_user)
+        rows = self.service.iter_serialized(queryset, filter_params)
+        filename = self.service.repository.model.__name__.lower()
+        return build_streaming_export_response(
+            rows, export_format, filename, header=self.service.export_header())
+
+
+class ListViewMixin(CacheViewMixin, ExportViewMixin):
     def get(self, request, ignorar_user=False):
         try:
+            export_response = self.get_export_response(
+                request, user_id=request.user.id, ignorar_user=ignorar_user)
+            if export_response is not None:
+                return export_response
+
             filter_params, page_number, page_size = get_pagination_parameters_rest(
                 request)
             # ## cache debe considerar tenant company
@@ -164,9 +213,15 @@ class ListViewMixin(CacheViewMixin):
             return handle_rest_exception_helper(e)
 
 
-class ListViewNoCacheMixin:
+class ListViewNoCacheMixin(ExportViewMixin):
+    @replica_read
     def get(self, request, ignorar_user=False):
         try:
+            export_response = self.get_export_response(
+                request, user_id=request.user.id, ignorar_user=ignorar_user)
+            if export_response is not None:
+                return export_response
+
             filter_params, page_number, page_size = get_pagination_parameters_rest(
                 request)
             try:
@@ -275,6 +330,7 @@ class RetrieveViewMixin(CacheViewMixin):
 
 
 class RetrieveViewMixinNoCache:
+    @replica_read
     def get(self, request, uuid):
         try:
             serialized_instance = self.service.find_one_by_uuid(uuid)
@@ -399,14 +455,19 @@ class DestroyViewMixin(AuditLogMixin, CacheViewMixin):
             )
 
 # ### Sales Mixins ===================================
-class ListViewSalesMixin(CacheViewMixin):
+class ListViewSalesMixin(CacheViewMixin, ExportViewMixin):
     def get(self, request):
         try:
+            export_response = self.get_export_response(
+                request, user_id=request.user.id)
+            if export_response is not None:
+                return export_response
+
             filter_params, page_number, page_size = get_pagination_parameters_rest(
                 request)
-            # ## cache debe considerar el user id para la key xq se filtra por user, role, canal_venta, etc., ademas del schema_name
+            # ## cache debe considerar el scope del user (global, area, departamento, canal_venta, user), ademas del schema_name
             cache_key = self.get_cache_key({
-                **filter_params, **{'user_id': request.user.id, 'schema_name': get_schema_name(request)}})
+                **filter_params, **{'scope': self.get_scope_cache_key(request), 'schema_name': get_schema_name(request)}})
             cache_data = self.get_cached_data(cache_key)
             if cache_data:
                 return Response(
@@ -447,9 +508,9 @@ class ListViewSalesMixin(CacheViewMixin):
 # UUID
 class RetrieveViewSalesMixin(CacheViewMixin):
     def get(self, request, uuid):
-        # ## cache debe considerar el user id para la key xq se filtra por user, role, canal_venta, etc.
+        # ## cache debe considerar el scope del user (global, area, departamento, canal_venta, user)
         cache_key = self.get_cache_key(
-            {'user_id': request.user.id, 'model_name': self.service.repository.model.__name__, 'uuid': uuid, 'schema_name': get_schema_name(request)})
+            {'scope': self.get_scope_cache_key(request), 'model_name': self.service.repository.model.__name__, 'uuid': uuid, 'schema_name': get_schema_name(request)})
         cache_data = self.get_cached_data(cache_key)
 
         if cache_data:
@@ -528,13 +589,23 @@ class UpdateViewSalesMixin(AuditLogMixin, CacheViewMixin):
             return handle_rest_exception_helper(e)
 
 def get_schema_name(request):
+    # resuelto una vez por request en CustomMiddleware (cache con TTL)
+    tenant_info = getattr(request, 'tenant_info', None)
+    if tenant_info is not None:
+        return tenant_info.schema_name
     return request.tenant.company.schema_name if hasattr(request, 'tenant') else env.str('DEFAULT_SCHEMA')
 
 
 # ## Sales Mixins withouth cache ===================================
-class ListViewSalesMixinNoCache:
+class ListViewSalesMixinNoCache(ExportViewMixin):
+    @replica_read
     def get(self, request):
         try:
+            export_response = self.get_export_response(
+                request, user_id=request.user.id)
+            if export_response is not None:
+                return export_response
+
             filter_params, page_number, page_size = get_pagination_parameters_rest(
                 request)
             serialized_instances = self.service.find_all(
@@ -556,6 +627,7 @@ class ListViewSalesMixinNoCache:
 
 
 class RetrieveViewSalesMixinNoCache:
+    @replica_read
     def get(self, request, uuid):
         try:
             serialized_instance = self.service.find_one_by_uuid(
@@ -896,14 +968,19 @@ class BaseGenericPATCHCustomFieldView(AuditLogMixin, CacheViewMixin, ABC):
             return handle_rest_exception_helper(e)
 
 # ### Generic User Views ===========================================
-class ListViewUserMixin(CacheViewMixin):
+class ListViewUserMixin(CacheViewMixin, ExportViewMixin):
     def get(self, request):
         try:
+            export_response = self.get_export_response(
+                request, user_id=request.user.id)
+            if export_response is not None:
+                return export_response
+
             filter_params, page_number, page_size = get_pagination_parameters_rest(
                 request)
-            # ## cache debe considerar el user id para la key.
+            # ## cache debe considerar el scope del user para la key.
             cache_key = self.get_cache_key({
-                **filter_params, **{'user_id': request.user.id, 'schema_name': get_schema_name(request)}})
+                **filter_params, **{'scope': self.get_scope_cache_key(request), 'schema_name': get_schema_name(request)}})
             cache_data = self.get_cached_data(cache_key)
             if cache_data:
                 print('-------------- [GENERIC USER]: CACHE ----------------')
@@ -946,9 +1023,9 @@ class ListViewUserMixin(CacheViewMixin):
 # UUID
 class RetrieveViewUserMixin(CacheViewMixin):
     def get(self, request, uuid):
-        # ## cache debe considerar el user id para la key.
+        # ## cache debe considerar el scope del user (global, area, departamento, canal_venta, user)
         cache_key = self.get_cache_key(
-            {'user_id': request.user.id, 'model_name': self.service.repository.model.__name__, 'uuid': uuid, 'schema_name': get_schema_name(request)})
+            {'scope': self.get_scope_cache_key(request), 'model_name': self.service.repository.model.__name__, 'uuid': uuid, 'schema_name': get_schema_name(request)})
         cache_data = self.get_cached_data(cache_key)
 
         if cache_data:
@@ -1026,9 +1103,15 @@ class UpdateViewUserMixin(AuditLogMixin, CacheViewMixin):
             return handle_rest_exception_helper(e)
 
 # Generic User Views withouth cache ---------------
-class ListViewUserMixinNoCache:
+class ListViewUserMixinNoCache(ExportViewMixin):
+    @replica_read
     def get(self, request):
         try:
+            export_response = self.get_export_response(
+                request, user_id=request.user.id)
+            if export_response is not None:
+                return export_response
+
             filter_params, page_number, page_size = get_pagination_parameters_rest(
                 request)
             serialized_instances = self.service.find_all(
@@ -1050,6 +1133,7 @@ class ListViewUserMixinNoCache:
 
 
 class RetrieveViewUserMixinNoCache:
+    @replica_read
     def get(self, request, uuid):
         try:
             serialized_instance = self.service.find_one_by_uuid(
@@ -35,6 +35,9 @@ from config.shared.constants.constants import (
 from config.shared.utils.cache_static_helper import CacheStaticHelper
 
 from config.shared.views.audit_log_mixin import AuditLogMixin
+from config.shared.views.async_mixins_view import (
+    AsyncAPIViewMixin, AsyncListViewMixin, AsyncRetrieveViewMixin
+)
 
 
 class GenericAPIViewService(AuthenticationViewMixin, PermissionRequiredViewMixin, ListViewMixin, CreateViewMixin):
@@ -116,6 +119,21 @@ class BaseUpdateViewNoCache(AuthenticationViewMixin, PermissionRequiredViewMixin
         super().__init__()
 
 
+# async views (ASGI) -----------------
+class BaseGetAllAsyncView(AsyncAPIViewMixin, AuthenticationViewMixin, PermissionRequiredViewMixin, AsyncListViewMixin):
+    # DI: service
+    def __init__(self, service):
+        self.service = service
+        super().__init__()
+
+
+class BaseRetrieveUuidAsyncView(AsyncAPIViewMixin, AuthenticationViewMixin, PermissionRequiredViewMixin, AsyncRetrieveViewMixin):
+    # DI: service
+    def __init__(self, service):
+        self.service = service
+        super().__init__()
+
+
 # ### Sales views ------------------------------
 class GenericSalesAPIViewService(AuthenticationViewMixin, PermissionRequiredViewMixin, ListViewSalesMixin, CreateViewSalesMixin):
     # DI: service
@@ -0,0 +1,40 @@
+from rest_framework import status
+from rest_framework.response import Response
+
+from config.shared.helpers.handle_rest_exception_helper import handle_rest_exception_helper
+from config.shared.services.common.job_queue import job_queue
+from config.shared.views.base_mixins_view import AuthenticationViewMixin
+
+
+# campos internos que no se exponen en el API
+HIDDEN_FIELDS = ('args', 'kwargs', 'owner_id')
+
+
+def can_read_job(user, data):
+    """ Solo quien encoló el job (o staff); un job sin dueño es solo para staff """
+    if user.is_staff:
+        return True
+    return bool(data.get('owner_id')) and data['owner_id'] == str(user.pk)
+
+
+class JobStatusView(AuthenticationViewMixin):
+    def get(self, request, job_id):
+        try:
+            data = job_queue.status(job_id)
+            # ajeno: 404 igual que inexistente, no confirma que el job exista
+            if data is None or not can_read_job(request.user, data):
+                return Response({
+                    "status": status.HTTP_404_NOT_FOUND,
+                    "message": "Job no encontrado o expirado",
+                    "data": None,
+                }, status=status.HTTP_404_NOT_FOUND)
+
+            for field in HIDDEN_FIELDS:
+                data.pop(field, None)
+            return Response({
+                "status": status.HTTP_200_OK,
+                "message": "OK",
+                "data": data,
+            }, status=status.HTTP_200_OK)
+        except Exception as e:
+            return handle_rest_exception_helper(e)
@@ -6,32 +6,36 @@ from rest_framework import permissions
 
 # ### Swagger
 from drf_yasg.views import get_schema_view
-from drf_yasg import openapi
 
 from config.shared.constants.envs_constants import env
+from config.shared.helpers.openapi_schema_helper import OPENAPI_INFO, openapi_schema_view
+from config.shared.views.job_status_view import JobStatusView
 
 schema_view = get_schema_view(
-    openapi.Info(
-        title="ERP API",
-        default_version='v1',
-        description="API description",
-        terms_of_service="https://www.google.com/policies/terms/",
-        contact=openapi.Contact(email="contact@myapi.local"),
-        license=openapi.License(name="BSD License"),
-    ),
+    OPENAPI_INFO,
     public=True,
     permission_classes=(permissions.AllowAny,),
     url=env.str('API_BASE_URL')
 )
+# sin APP_VERSION la key de cache sería la misma en todos los deploys: sin cache
+swagger_cache = {
+    'cache_timeout': settings.OPENAPI_CACHE_TIMEOUT,
+    'cache_kwargs': {'key_prefix': f'swagger-{settings.OPENAPI_SCHEMA_VERSION}'},
+} if settings.OPENAPI_SCHEMA_VERSION else {}
 
 urlpatterns = [
     # ### Swagger
-    re_path(r'^api/v1/swagger(?P<format>\.json|\.yaml)$',
-            schema_view.without_ui(cache_timeout=0), name='schema-json'),
-    path('api/v1/swagger/', schema_view.with_ui('swagger',
-         cache_timeout=0), name='schema-swagger-ui'),
+    # json precomputado (generate_openapi_schema) con ETag/gzip; yaml se genera bajo demanda
+    path('api/v1/swagger.json', openapi_schema_view, name='schema-json'),
+    re_path(r'^api/v1/swagger(?P<format>\.yaml)$',
+            schema_view.without_ui(**swagger_cache), name='schema-yaml'),
+    # la UI carga el spec desde SPEC_URL (schema-json)
+    path('api/v1/swagger/', schema_view.with_ui('swagger', **swagger_cache), name='schema-swagger-ui'),
 
     path("api/v1/role/", include("log.urls.role_urls")),
+
+    # ### Jobs en segundo plano
+    path("api/v1/jobs/<str:job_id>/", JobStatusView.as_view(), name='job-status'),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,74 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.template import Context, Template
+
+from core.billing.utilities.pdf_render_service import PDFRenderService, asset_cache
+
+
+# comprobante sintético: cabecera + N líneas de detalle
+SAMPLE_TEMPLATE = Template("""
+<html><body>
+<h3>FACTURA {{ number }}</h3>
+<table class="table table-sm table-bordered">
+  <thead><tr><th>Código</th><th>Producto</th><th>Cant.</th><th>Precio</th><th>Total</th></tr></thead>
+  <tbody>
+  {% for line in lines %}<tr><td>{{ line.code }}</td><td>{{ line.name }}</td><td>{{ line.quantity }}</td><td>{{ line.price }}</td><td>{{ line.total }}</td></tr>{% endfor %}
+  </tbody>
+</table>
+</body></html>
+""")
+
+
+def sample_htmls(count, lines):
+    return [
+        SAMPLE_TEMPLATE.render(Context({
+            'number': f'001-001-{index:09d}',
+            'lines': [{'code': f'P{line:05d}', 'name': f'Producto {line}', 'quantity': 2,
+                       'price': '10.50', 'total': '21.00'} for line in range(lines)],
+        }))
+        for index in range(count)
+    ]
+
+
+class Command(BaseCommand):
+    help = 'Throughput del render de PDFs (documentos/segundo) en línea y con pool de procesos'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=50, help='Documentos por corrida')
+        parser.add_argument('--lines', type=int, default=20, help='Líneas por documento (sample)')
+        parser.add_argument('--workers', default='0,2,4',
+                            help='Tamaños de pool a medir; 0 = en línea')
+        parser.add_argument('--template', default=None,
+                            help='Template de Django a usar en lugar del sample')
+        parser.add_argument('--context', default='{}',
+                            help='Contexto JSON para --template')
+
+    def handle(self, *args, **options):
+        count = options['count']
+        if options['template']:
+            contexts = [json.loads(options['context'])] * count
+        else:
+            htmls = sample_htmls(count, options['lines'])
+
+        for workers in (int(w) for w in options['workers'].split(',')):
+            asset_cache.clear()
+            service = PDFRenderService(max_workers=workers)
+            try:
+                timings = []
+                # 1ª corrida en frío (arranque del pool, parseo de CSS), 2ª con caches calientes
+                for _ in range(2):
+                    start = time.perf_counter()
+                    if options['template']:
+                        service.render_many(options['template'], contexts)
+                    else:
+                        service.write_many(htmls, stylesheet_paths=service.default_stylesheets())
+                    timings.append(time.perf_counter() - start)
+            finally:
+                service.shutdown()
+
+            label = f'pool x{workers}' if workers else 'en línea'
+            self.stdout.write(
+                f'{label:<12} frío {count / timings[0]:>7.1f} docs/s   '
+                f'caliente {count / timings[1]:>7.1f} docs/s')
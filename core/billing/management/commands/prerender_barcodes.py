@@ -0,0 +1,83 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from config.shared.services.common.multitenant_static_helper import MultitenantStaticHelper
+from config.shared.services.common.tenant_job_runner import TenantJobError
+from core.billing.models import Product
+from core.billing.utilities.barcode_cache import BarcodeCache, barcode_cache
+
+
+BULK_BATCH_SIZE = 500
+
+
+def prerender(codes, workers):
+    """ Renderiza los códigos que aún no tienen asset; retorna cuántos se generaron """
+    codes = set(codes)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='barcode') as executor:
+        results = executor.map(lambda code: barcode_cache.get_or_render(code)[1], codes)
+        return sum(results)
+
+
+def link_products():
+    """ Apunta los productos a su asset compartido (bulk_update: sin save() ni jobs) """
+    stale = []
+    for product in Product.objects.only('id', 'code', 'barcode').iterator(chunk_size=BULK_BATCH_SIZE):
+        path = BarcodeCache.path(product.code)
+        if product.barcode.name != path:
+            product.barcode.name = path
+            stale.append(product)
+    Product.objects.bulk_update(stale, ['barcode'], batch_size=BULK_BATCH_SIZE)
+    return len(stale)
+
+
+class Command(BaseCommand):
+    help = 'Pre-renderiza los barcodes del catálogo (o de un archivo de códigos) en la cache compartida'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--file', default=None,
+                            help='Archivo con un código por línea (antes de importar un catálogo)')
+        parser.add_argument('--workers', type=int, default=4,
+                            help='Hilos de render')
+        parser.add_argument('--no-link', action='store_true',
+                            help='Solo renderizar, sin actualizar Product.barcode')
+        parser.add_argument('--all-schemas', action='store_true',
+                            help='Recorre todos los schemas de tenants')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+
+        if options['file']:
+            with open(options['file'], encoding='utf-8') as codes_file:
+                codes = [line.strip() for line in codes_file if line.strip()]
+            rendered = prerender(codes, options['workers'])
+            self.stdout.write(f'{rendered} barcodes generados de {len(set(codes))} códigos')
+        elif options['all_schemas']:
+            try:
+                report = MultitenantStaticHelper.run_in_all_schemas_but_list(
+                    lambda schema: self.run_schema(options), job_name='prerender_barcodes')
+            except TenantJobError as e:
+                self.write_report(e.report)
+                raise CommandError(str(e))
+            self.write_report(report)
+        else:
+            self.stdout.write(str(self.run_schema(options)))
+
+        self.stdout.write(f'Tiempo: {time.perf_counter() - start:.2f}s')
+
+    def write_report(self, report):
+        for schema, result in report.results.items():
+            self.stdout.write(f'{schema}: {result}')
+        for schema, error in report.errors.items():
+            self.stderr.write(f'{schema}: {error}')
+        for schema in report.timed_out:
+            self.stderr.write(f'{schema}: timeout')
+
+    @staticmethod
+    def run_schema(options):
+        codes = Product.objects.values_list('code', flat=True)
+        result = {'rendered': prerender(codes, options['workers'])}
+        if not options['no_link']:
+            result['linked'] = link_products()
+        return result
@@ -0,0 +1,97 @@
+import random
+import threading
+import time
+from collections import Counter
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from core.billing.models import Receipt, ReceiptSequenceGap
+from core.billing.services.receipt_sequence_service import ReceiptSequenceBlock, ReceiptSequenceService
+
+
+class SimulatedRollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = ('Carga paralela sobre la secuencia de un Receipt y verificación de duplicados/huecos. '
+            'Avanza la secuencia real: usar un Receipt de pruebas.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('receipt_id', type=int)
+        parser.add_argument('--threads', type=int, default=8)
+        parser.add_argument('--per-thread', type=int, default=100)
+        parser.add_argument('--block-size', type=int, default=0,
+                            help='0 = modo sin huecos (UPDATE ... RETURNING por comprobante)')
+        parser.add_argument('--rollback-rate', type=float, default=0.1,
+                            help='Fracción de facturas que se revierten')
+
+    def handle(self, *args, **options):
+        receipt_id = options['receipt_id']
+        if not Receipt.objects.filter(pk=receipt_id).exists():
+            raise CommandError(f'Receipt {receipt_id} no existe')
+
+        service = ReceiptSequenceService(block_size=options['block_size'])
+        start_sequence = Receipt.objects.values_list('sequence', flat=True).get(pk=receipt_id)
+        gaps_before = set(ReceiptSequenceGap.objects.filter(
+            receipt_id=receipt_id).values_list('sequence', flat=True))
+
+        issued, lock = [], threading.Lock()
+        errors = []
+
+        def worker():
+            rng = random.Random()
+            # cada hilo simula un worker distinto: su propio bloque
+            block = ReceiptSequenceBlock(
+                service, receipt_id, options['block_size']) if options['block_size'] else None
+            try:
+                for _ in range(options['per_thread']):
+                    # el bloque se reserva fuera de la transacción de la factura
+                    number = block.next() if block else None
+                    try:
+                        with transaction.atomic():
+                            if not block:
+                                number = service.next(receipt_id)
+                            if rng.random() < options['rollback_rate']:
+                                raise SimulatedRollback()
+                        with lock:
+                            issued.append(number)
+                    except SimulatedRollback:
+                        if block:
+                            block.give_back(number)
+                if block:
+                    block.release()
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connections.close_all()
+
+        start = time.perf_counter()
+        threads = [threading.Thread(target=worker) for _ in range(options['threads'])]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        if errors:
+            raise CommandError(f'{len(errors)} hilos fallaron: {errors[0]!r}')
+
+        end_sequence = Receipt.objects.values_list('sequence', flat=True).get(pk=receipt_id)
+        gaps = set(ReceiptSequenceGap.objects.filter(
+            receipt_id=receipt_id).values_list('sequence', flat=True)) - gaps_before
+        duplicates = [number for number, count in Counter(issued).items() if count > 1]
+        expected = set(range(start_sequence, end_sequence))
+        missing = expected - set(issued) - gaps
+
+        self.stdout.write(
+            f'{len(issued)} comprobantes en {elapsed:.2f}s ({len(issued) / elapsed:.0f}/s), '
+            f'secuencia {start_sequence} -> {end_sequence}, huecos registrados {len(gaps)}')
+        if duplicates:
+            raise CommandError(f'Números duplicados: {sorted(duplicates)[:20]}')
+        if missing:
+            raise CommandError(f'Números perdidos sin registrar: {sorted(missing)[:20]}')
+        if not options['block_size'] and gaps:
+            raise CommandError('El modo sin huecos no debe registrar huecos')
+        self.stdout.write(self.style.SUCCESS('OK: sin duplicados ni números perdidos'))
@@ -1,16 +1,16 @@
 import unicodedata
 from datetime import datetime
-from io import BytesIO
 
-from barcode import Gs1_128, writer
-from django.core.files.base import ContentFile
 from django.db import models
 from django.forms import model_to_dict
 from django.urls import reverse_lazy
+from django_cleanup import cleanup
 from unidecode import unidecode
 
 from config import settings
 from core.billing.choices import VOUCHER_TYPE, VOUCHER_STAGE
+from core.billing.utilities.barcode_cache import BarcodeCache, barcode_cache
+from core.billing.utilities.billing_calculator import BillingCalculator
 from core.multicpy.choices import ENVIRONMENT_TYPE
 from core.security.fields import CustomImageField
 
@@ -32,6 +32,8 @@ class Category(models.Model):
         ordering = ['id']
 
 
+# los PNG de barcodes son compartidos (BarcodeCache): django_cleanup no debe borrarlos
+@cleanup.ignore
 class Product(models.Model):
     name = models.CharField(
         max_length=150, help_text='Ingrese un nombre', verbose_name='Nombre')
@@ -63,11 +65,13 @@ class Product(models.Model):
         return f'{settings.STATIC_URL}img/src/empty.png'
 
     def generate_barcode(self):
-        image_io = BytesIO()
-        Gs1_128(self.code, writer=writer.ImageWriter()).write(image_io)
-        filename = f'{self.code}.png'
-        self.barcode.save(filename, content=ContentFile(
-            image_io.getvalue()), save=False)
+        self.barcode.name, _ = barcode_cache.get_or_render(self.code)
+
+    def barcode_is_stale(self, update_fields=None):
+        # solo `code` define el barcode: un save(update_fields=['price']) no lo toca
+        if update_fields is not None and 'code' not in update_fields:
+            return False
+        return self.barcode.name != BarcodeCache.path(self.code)
 
     def as_dict(self):
         item = model_to_dict(self)
@@ -81,8 +85,22 @@ class Product(models.Model):
         return item
 
     def save(self, force_insert=False, force_update=False, using=None, update_fields=None):
-        self.generate_barcode()
-        super(Product, self).save()
+        render_pending = False
+        if self.barcode_is_stale(update_fields):
+            path = BarcodeCache.path(self.code)
+            if barcode_cache.exists(path):
+                # asset ya renderizado (otro producto/tenant o pre-render): solo se enlaza
+                self.barcode.name = path
+                if update_fields is not None:
+                    update_fields = {*update_fields, 'barcode'}
+            else:
+                render_pending = True
+        super(Product, self).save(force_insert, force_update, using, update_fields)
+        if render_pending:
+            # el PNG se genera en el worker; mientras tanto get_barcode() usa empty.png
+            from core.billing.tasks import generate_product_barcode
+            generate_product_barcode.delay_on_commit(
+                self.pk, idempotency_key=f'product-barcode-{self.pk}-{self.code}')
 
     class Meta:
         verbose_name = 'Producto'
@@ -127,6 +145,31 @@ class Receipt(models.Model):
         verbose_name = 'Comprobante'
         verbose_name_plural = 'Comprobantes'
         ordering = ['id']
+        # una secuencia por tipo + establecimiento + punto de emisión (ver ReceiptSequenceService)
+        unique_together = [('voucher_type', 'establishment_code', 'issuing_point_code')]
+
+
+class ReceiptSequenceGap(models.Model):
+    """ Números reservados que no se emitieron (bloques liberados / facturas revertidas) """
+    receipt = models.ForeignKey(
+        Receipt, on_delete=models.CASCADE, verbose_name='Tipo de Comprobante')
+    sequence = models.PositiveIntegerField(verbose_name='Secuencia')
+    reason = models.CharField(max_length=50, verbose_name='Motivo')
+    date_joined = models.DateTimeField(
+        default=datetime.now, verbose_name='Fecha de registro')
+
+    def __str__(self):
+        return f'{self.receipt} - {self.sequence:09d}'
+
+    class Meta:
+        verbose_name = 'Secuencia no emitida'
+        verbose_name_plural = 'Secuencias no emitidas'
+        ordering = ['receipt', 'sequence']
+        unique_together = [('receipt', 'sequence')]
+
+
+DETAIL_DECIMAL_FIELDS = ('tax', 'price', 'price_with_tax', 'subtotal', 'total_tax',
+                         'discount', 'total_discount', 'total_amount')
 
 
 class ElecBillingDetailBase(models.Model):
@@ -154,17 +197,15 @@ class ElecBillingDetailBase(models.Model):
     def entity_to_dict(self):
         item = model_to_dict(self)
         item['product'] = self.product.as_dict()
-        item['tax'] = float(self.tax)
-        item['price'] = float(self.price)
-        item['price_with_tax'] = float(self.price_with_tax)
-        item['subtotal'] = float(self.subtotal)
-        item['tax'] = float(self.tax)
-        item['total_tax'] = float(self.total_tax)
-        item['discount'] = float(self.discount)
-        item['total_discount'] = float(self.total_discount)
-        item['total_amount'] = float(self.total_amount)
+        for field in DETAIL_DECIMAL_FIELDS:
+            item[field] = float(item[field])
         return item
 
+    @classmethod
+    def calculate(cls, details):
+        """ Recalcula las líneas en una pasada (BillingCalculator) y retorna los totales de la factura """
+        return BillingCalculator.apply_to_details(details)
+
     class Meta:
         abstract = True
 
@@ -0,0 +1,172 @@
+import atexit
+import logging
+import os
+import threading
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import F
+
+from core.billing.models import Receipt, ReceiptSequenceGap
+
+
+logger = logging.getLogger(__name__)
+
+GAP_REASON_RELEASED = 'bloque liberado'
+GAP_REASON_ROLLED_BACK = 'factura revertida'
+
+
+class ReceiptSequenceBlock:
+    """
+    Bloque de números reservado por un worker: una sola escritura sobre Receipt
+    cada `size` comprobantes, en lugar de un lock por comprobante.
+    Los números que no se emiten (release / give_back) quedan en ReceiptSequenceGap.
+    """
+
+    def __init__(self, service, receipt_id, size):
+        self.service = service
+        self.receipt_id = receipt_id
+        self.size = size
+        self._next = 1
+        self._end = 0  # bloque vacío
+        self._lock = threading.Lock()
+
+    @property
+    def remaining(self):
+        return max(0, self._end - self._next + 1)
+
+    def next(self):
+        with self._lock:
+            if self._next > self._end:
+                numbers = self.service.reserve(self.receipt_id, self.size)
+                self._next, self._end = numbers.start, numbers.stop - 1
+            number = self._next
+            self._next += 1
+            return number
+
+    def give_back(self, number):
+        """ El comprobante con `number` no se guardó (rollback): se registra el hueco """
+        self.service.record_gaps(self.receipt_id, [number], GAP_REASON_ROLLED_BACK)
+
+    def release(self):
+        with self._lock:
+            unused = range(self._next, self._end + 1)
+            self._next, self._end = 1, 0
+        if unused:
+            self.service.record_gaps(self.receipt_id, unused, GAP_REASON_RELEASED)
+        return len(unused)
+
+
+class ReceiptSequenceService:
+    """
+    Secuencias de comprobantes por (voucher_type, establishment_code, issuing_point_code).
+    `Receipt.sequence` es el próximo número a emitir.
+
+    - next(): sin huecos. Debe llamarse dentro del transaction.atomic() de la
+      factura: el UPDATE ... RETURNING bloquea solo la fila de ese Receipt hasta el
+      commit y un rollback devuelve el número.
+    - block(): con RECEIPT_SEQUENCE_BLOCK_SIZE > 0 cada proceso reserva bloques;
+      menos contención, a cambio de huecos registrados en ReceiptSequenceGap.
+      El número se toma ANTES del transaction.atomic() de la factura (y si la
+      factura se revierte, give_back): la reserva de un bloque se confirma en su
+      propia transacción durable; dentro de otra, un rollback devolvería el
+      bloque a la secuencia mientras el proceso sigue emitiendo sus números.
+    """
+
+    def __init__(self, block_size=None):
+        self.block_size = block_size if block_size is not None else getattr(
+            settings, 'RECEIPT_SEQUENCE_BLOCK_SIZE', 0)
+        self._receipt_ids = {}
+        self._blocks = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def db_alias():
+        return router.db_for_write(Receipt)
+
+    def get_receipt_id(self, voucher_type, establishment_code, issuing_point_code):
+        key = (voucher_type, establishment_code, issuing_point_code)
+        if key not in self._receipt_ids:
+            self._receipt_ids[key] = Receipt.objects.using(self.db_alias()).values_list(
+                'id', flat=True).get(voucher_type=voucher_type, establishment_code=establishment_code,
+                                     issuing_point_code=issuing_point_code)
+        return self._receipt_ids[key]
+
+    # ---------------------------
+    # reserva
+    # ---------------------------
+    def _increment(self, receipt_id, count):
+        """ sequence += count de forma atómica; retorna el primer número reservado """
+        db = self.db_alias()
+        connection = connections[db]
+        if connection.vendor == 'postgresql':
+            table = connection.ops.quote_name(Receipt._meta.db_table)
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'UPDATE {table} SET sequence = sequence + %s WHERE id = %s RETURNING sequence',
+                    [count, receipt_id])
+                row = cursor.fetchone()
+            if row is None:
+                raise Receipt.DoesNotExist(f'Receipt {receipt_id} no existe')
+            return row[0] - count
+
+        current = Receipt.objects.using(db).select_for_update().values_list(
+            'sequence', flat=True).get(pk=receipt_id)
+        Receipt.objects.using(db).filter(pk=receipt_id).update(
+            sequence=F('sequence') + count)
+        return current
+
+    def next(self, receipt_id):
+        with transaction.atomic(using=self.db_alias()):
+            return self._increment(receipt_id, 1)
+
+    def reserve(self, receipt_id, count):
+        # durable: RuntimeError si se llama dentro de otra transacción (ver docstring de la clase)
+        with transaction.atomic(using=self.db_alias(), durable=True):
+            first = self._increment(receipt_id, count)
+        return range(first, first + count)
+
+    def record_gaps(self, receipt_id, numbers, reason):
+        ReceiptSequenceGap.objects.using(self.db_alias()).bulk_create(
+            [ReceiptSequenceGap(receipt_id=receipt_id, sequence=number, reason=reason)
+             for number in numbers],
+            ignore_conflicts=True,
+        )
+        logger.info('Receipt %s: %s números no emitidos (%s)', receipt_id, len(numbers), reason)
+
+    # ---------------------------
+    # bloques por proceso
+    # ---------------------------
+    def block(self, receipt_id, size=None):
+        # la key incluye el pid: un fork no hereda el bloque del padre
+        key = (os.getpid(), receipt_id)
+        if key not in self._blocks:
+            with self._lock:
+                if key not in self._blocks:
+                    self._blocks[key] = ReceiptSequenceBlock(
+                        self, receipt_id, size or self.block_size)
+        return self._blocks[key]
+
+    def allocate(self, receipt_id):
+        """
+        Punto de entrada: bloque si RECEIPT_SEQUENCE_BLOCK_SIZE > 0, si no sin huecos.
+        En modo bloque debe llamarse fuera de la transacción de la factura.
+        """
+        if self.block_size > 0:
+            return self.block(receipt_id).next()
+        return self.next(receipt_id)
+
+    def release_blocks(self):
+        released = 0
+        pid = os.getpid()
+        for (block_pid, _), block in list(self._blocks.items()):
+            if block_pid == pid:
+                try:
+                    released += block.release()
+                except Exception:
+                    logger.exception('No se pudo registrar el bloque liberado de %s', block.receipt_id)
+        return released
+
+
+receipt_sequence_service = ReceiptSequenceService()
+atexit.register(receipt_sequence_service.release_blocks)
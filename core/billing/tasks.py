@@ -0,0 +1,30 @@
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+from config.shared.services.common.job_queue import job
+from core.billing.models import Product
+from core.billing.utilities.pdf_creator import PDFCreator
+
+
+@job(queue='default')
+def generate_product_barcode(product_id):
+    product = Product.objects.filter(pk=product_id).first()
+    if product is None:
+        return {'barcode': None}
+    if not product.barcode_is_stale():
+        return {'barcode': product.barcode.name}
+    product.generate_barcode()
+    # update() y no save(): save() volvería a encolar este job
+    Product.objects.filter(pk=product_id).update(barcode=product.barcode.name)
+    return {'barcode': product.barcode.name}
+
+
+@job(queue='pdf', max_retries=2)
+def render_pdf(template_name, context, filename):
+    """ Renderiza con weasyprint y guarda en el storage; retorna el path del archivo """
+    pdf_file = PDFCreator(template_name).create(context)
+    path = f'pdf/{filename}'
+    # mismo nombre en cada reintento: se reemplaza el archivo anterior
+    if default_storage.exists(path):
+        default_storage.delete(path)
+    return {'path': default_storage.save(path, ContentFile(pdf_file))}
@@ -0,0 +1,291 @@
+import random
+import threading
+from collections import Counter
+from decimal import Decimal, ROUND_FLOOR, localcontext
+from types import SimpleNamespace
+from unittest import mock
+
+from django.db import connection, connections, transaction
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+
+from core.billing.models import Receipt, ReceiptSequenceGap
+from core.billing.services.receipt_sequence_service import ReceiptSequenceBlock, ReceiptSequenceService
+from core.billing.utilities import pdf_render_service
+from core.billing.utilities.billing_calculator import (
+    INVOICE_FIELDS, LINE_FIELDS, BillingCalculator, div_round_half_up,
+)
+from core.billing.utilities.pdf_render_service import AssetCache, asset_ttl, fetch_asset
+
+
+def asset(content=b'x'):
+    return {'mime_type': 'image/png', 'encoding': None, 'filename': 'logo.png', 'string': content}
+
+
+# ---------------------------
+# cache de assets del PDF
+# ---------------------------
+class AssetCacheTests(SimpleTestCase):
+    def test_entries_expire_after_ttl(self):
+        cache = AssetCache(max_bytes=1024)
+        with mock.patch.object(pdf_render_service.time, 'monotonic', return_value=100.0):
+            cache.set('https://cdn.example.com/logo.png', asset(), ttl=60)
+            cache.set('file:///static/logo.png', asset())
+        with mock.patch.object(pdf_render_service.time, 'monotonic', return_value=161.0):
+            self.assertIsNone(cache.get('https://cdn.example.com/logo.png'))
+            self.assertIsNotNone(cache.get('file:///static/logo.png'))
+        self.assertEqual(cache._size, 1)
+
+    def test_lru_bounded_by_bytes(self):
+        cache = AssetCache(max_bytes=4)
+        cache.set('a', asset(b'aa'))
+        cache.set('b', asset(b'bb'))
+        cache.get('a')
+        cache.set('c', asset(b'cc'))
+        self.assertIsNone(cache.get('b'))
+        self.assertIsNotNone(cache.get('a'))
+
+    @override_settings(STATIC_URL='/static/', MEDIA_URL='/media/', PDF_ASSET_CACHE_TTL=60)
+    def test_ttl_by_origin(self):
+        self.assertIsNone(asset_ttl('file:///static/billing/logo.png'))
+        self.assertEqual(asset_ttl('file:///media/empresa/logo.png'), 60)
+        self.assertEqual(asset_ttl('https://cdn.example.com/logo.png'), 60)
+        self.assertEqual(asset_ttl('data:image/png;base64,AAAA'), 0)
+
+    @override_settings(PDF_ASSET_CACHE_TTL=0)
+    def test_remote_assets_not_cached_when_ttl_disabled(self):
+        url = 'https://cdn.example.com/logo.png'
+        with mock.patch.object(pdf_render_service, 'asset_cache', AssetCache(1024)), \
+                mock.patch.object(pdf_render_service, '_load_asset', return_value=asset()) as load:
+            fetch_asset(url)
+            fetch_asset(url)
+        self.assertEqual(load.call_count, 2)
+
+    @override_settings(PDF_ASSET_CACHE_TTL=60)
+    def test_remote_assets_refetched_after_ttl(self):
+        url = 'https://cdn.example.com/logo.png'
+        with mock.patch.object(pdf_render_service, 'asset_cache', AssetCache(1024)), \
+                mock.patch.object(pdf_render_service, '_load_asset', return_value=asset()) as load, \
+                mock.patch.object(pdf_render_service.time, 'monotonic', return_value=0.0) as clock:
+            fetch_asset(url)
+            fetch_asset(url)
+            self.assertEqual(load.call_count, 1)
+            clock.return_value = 61.0
+            fetch_asset(url)
+        self.assertEqual(load.call_count, 2)
+
+
+# ---------------------------
+# secuencia de comprobantes
+# ---------------------------
+class SimulatedRollback(Exception):
+    pass
+
+
+class ReceiptSequenceConcurrencyTests(TransactionTestCase):
+    """ hilos reales, cada uno con su conexión: los locks y rollbacks son los de la base """
+    threads = 6
+    per_thread = 30
+
+    def setUp(self):
+        self.receipt = Receipt.objects.create(
+            voucher_type='01', establishment_code='001', issuing_point_code='001')
+
+    def run_workers(self, issue):
+        issued, errors, lock = [], [], threading.Lock()
+
+        def worker(index):
+            try:
+                for number in range(self.per_thread):
+                    # una de cada tres facturas se revierte
+                    result = issue(index, rollback=number % 3 == 0)
+                    if result is not None:
+                        with lock:
+                            issued.append(result)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=worker, args=(index,)) for index in range(self.threads)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        return issued
+
+    def assertNoDuplicatesNorLost(self, issued):
+        self.assertEqual([n for n, count in Counter(issued).items() if count > 1], [])
+        self.receipt.refresh_from_db()
+        gaps = set(ReceiptSequenceGap.objects.filter(
+            receipt=self.receipt).values_list('sequence', flat=True))
+        self.assertEqual(set(range(1, self.receipt.sequence)) - set(issued) - gaps, set())
+        self.assertEqual(set(issued) & gaps, set())
+        return gaps
+
+    def test_gapless_mode(self):
+        service = ReceiptSequenceService(block_size=0)
+
+        def issue(index, rollback):
+            try:
+                with transaction.atomic():
+                    number = service.next(self.receipt.id)
+                    if rollback:
+                        raise SimulatedRollback()
+                return number
+            except SimulatedRollback:
+                return None
+
+        issued = self.run_workers(issue)
+        self.assertEqual(len(issued), self.threads * self.per_thread * 2 // 3)
+        self.assertEqual(self.assertNoDuplicatesNorLost(issued), set())
+        self.assertEqual(sorted(issued), list(range(1, len(issued) + 1)))
+
+    def test_block_mode(self):
+        service = ReceiptSequenceService(block_size=7)
+        blocks = [ReceiptSequenceBlock(service, self.receipt.id, 7) for _ in range(self.threads)]
+
+        def issue(index, rollback):
+            number = blocks[index].next()
+            try:
+                with transaction.atomic():
+                    if rollback:
+                        raise SimulatedRollback()
+                return number
+            except SimulatedRollback:
+                blocks[index].give_back(number)
+                return None
+
+        issued = self.run_workers(issue)
+        for block in blocks:
+            block.release()
+        self.assertEqual(len(issued), self.threads * self.per_thread * 2 // 3)
+        self.assertNoDuplicatesNorLost(issued)
+
+    def test_block_refill_inside_invoice_transaction_is_rejected(self):
+        block = ReceiptSequenceService(block_size=5).block(self.receipt.id)
+        with self.assertRaises(RuntimeError):
+            with transaction.atomic():
+                block.next()
+        self.receipt.refresh_from_db()
+        self.assertEqual(self.receipt.sequence, 1)
+
+
+# ---------------------------
+# cálculo de facturas
+# ---------------------------
+TAX_RATES = [Decimal(rate) for rate in ('0.00', '0.05', '0.08', '0.12', '0.15')]
+
+
+def pg_numeric(value):
+    """ lo que guarda PostgreSQL en numeric(9,2): mitad alejándose de cero (independiente del calculador) """
+    cents = (abs(value) * 100 + Decimal('0.5')).to_integral_value(rounding=ROUND_FLOOR)
+    return (cents if value >= 0 else -cents).scaleb(-2)
+
+
+def expected_invoice(lines):
+    """
+    Fórmulas de BillingCalculator en Decimal exacto; solo se redondea al guardar
+    cada campo (y los campos siguientes usan el valor guardado)
+    """
+    rows, without_tax, discount_total, with_tax_by_rate = [], Decimal(0), Decimal(0), {}
+    with localcontext() as context:
+        context.prec = 50
+        for quantity, price, discount, has_tax, tax in lines:
+            subtotal = pg_numeric(quantity * price)
+            total_discount = pg_numeric(subtotal * discount)
+            total_amount = pg_numeric(subtotal - total_discount)
+            if has_tax:
+                total_tax = pg_numeric(total_amount * tax)
+                price_with_tax = pg_numeric(price + price * tax)
+                with_tax_by_rate[tax] = with_tax_by_rate.get(tax, Decimal(0)) + total_amount
+            else:
+                total_tax, price_with_tax = Decimal(0), price
+                without_tax += total_amount
+            discount_total += total_discount
+            rows.append(dict(zip(LINE_FIELDS, (price_with_tax, subtotal, total_discount, total_tax, total_amount))))
+        with_tax = sum(with_tax_by_rate.values(), Decimal(0))
+        total_tax = sum((pg_numeric(base * tax) for tax, base in with_tax_by_rate.items()), Decimal(0))
+        subtotal = with_tax + without_tax
+        totals = (with_tax, without_tax, subtotal, discount_total, total_tax, pg_numeric(subtotal + total_tax))
+    return rows, dict(zip(INVOICE_FIELDS, totals))
+
+
+def random_lines(rng, count):
+    # la mayoría de facturas usan una sola tarifa; algunas mezclan tarifas por línea
+    rates = [rng.choice(TAX_RATES)] if rng.random() < 0.7 else TAX_RATES
+    return [
+        (rng.randint(0, 1000),
+         # negativos: notas de crédito / ajustes
+         Decimal(rng.randint(-10 ** 5, 10 ** 7)).scaleb(-2),
+         Decimal(rng.randint(0, 100)).scaleb(-2),
+         rng.random() < 0.7,
+         rng.choice(rates))
+        for _ in range(count)
+    ]
+
+
+class BillingCalculatorTests(SimpleTestCase):
+    def test_div_round_half_up(self):
+        cases = {(5, 10): 1, (-5, 10): -1, (15, 10): 2, (-15, 10): -2, (25, 10): 3, (-25, 10): -3,
+                 (14, 10): 1, (-14, 10): -1, (16, 10): 2, (-16, 10): -2, (5, -10): -1, (0, 10): 0}
+        for (numerator, denominator), expected in cases.items():
+            self.assertEqual(div_round_half_up(numerator, denominator), expected, (numerator, denominator))
+
+    def test_ties_round_away_from_zero(self):
+        # 0.125 * 100 y 0.625 * 100: empates; half-even daría 0.12 / 0.62
+        lines = [(1, Decimal('0.25'), Decimal('0.50'), True, Decimal('0.50')),
+                 (1, Decimal('-1.25'), Decimal('0.50'), False, Decimal('0.50'))]
+        rows, totals = BillingCalculator.compute(lines)
+        self.assertEqual(rows[0]['total_discount'], Decimal('0.13'))
+        self.assertEqual(rows[0]['price_with_tax'], Decimal('0.38'))
+        self.assertEqual(rows[1]['total_discount'], Decimal('-0.63'))
+        self.assertEqual(totals['total_tax'], Decimal('0.06'))
+
+    def test_matches_exact_decimal_rounded_like_postgresql(self):
+        rng = random.Random(20261019)
+        for _ in range(2000):
+            lines = random_lines(rng, rng.randint(0, 30))
+            self.assertEqual(BillingCalculator.compute(lines), expected_invoice(lines), lines)
+
+    def test_reference_matches_exact_decimal(self):
+        rng = random.Random(7)
+        for _ in range(500):
+            lines = random_lines(rng, rng.randint(0, 30))
+            self.assertEqual(BillingCalculator.reference_invoice(lines), expected_invoice(lines))
+
+    def test_mixed_rates_use_each_line_rate(self):
+        # 12% y 15% en la misma factura: cada línea usa su tasa y el total se suma por tasa
+        lines = [(2, Decimal('10.05'), Decimal('0.00'), True, Decimal('0.12')),
+                 (1, Decimal('3.35'), Decimal('0.00'), True, Decimal('0.15')),
+                 (3, Decimal('1.10'), Decimal('0.00'), True, Decimal('0.12')),
+                 (1, Decimal('5.00'), Decimal('0.00'), False, Decimal('0.15'))]
+        rows, totals = BillingCalculator.compute(lines)
+        self.assertEqual([row['total_tax'] for row in rows],
+                         [Decimal('2.41'), Decimal('0.50'), Decimal('0.40'), Decimal('0.00')])
+        self.assertEqual(rows[1]['price_with_tax'], Decimal('3.85'))
+        # 12% sobre 23.40 = 2.81 y 15% sobre 3.35 = 0.50 (con la tasa de la primera línea serían 3.21)
+        self.assertEqual(totals['subtotal_with_tax'], Decimal('26.75'))
+        self.assertEqual(totals['total_tax'], Decimal('3.31'))
+        self.assertEqual(totals['total_amount'], Decimal('35.06'))
+        self.assertEqual((rows, totals), expected_invoice(lines))
+        self.assertEqual(BillingCalculator.reference_invoice(lines), expected_invoice(lines))
+
+    def test_apply_to_details_uses_each_detail_rate(self):
+        details = [
+            SimpleNamespace(quantity=q, price=p, discount=Decimal('0.00'), tax=t, product=SimpleNamespace(has_tax=True))
+            for q, p, t in ((2, Decimal('10.05'), Decimal('0.12')), (1, Decimal('3.35'), Decimal('0.15')))
+        ]
+        totals = BillingCalculator.apply_to_details(details)
+        self.assertEqual([detail.total_tax for detail in details], [Decimal('2.41'), Decimal('0.50')])
+        self.assertEqual(totals['total_tax'], Decimal('2.91'))
+
+
+class PostgresNumericRoundingTests(TestCase):
+    def test_pg_numeric_matches_database(self):
+        values = ['0.005', '-0.005', '0.015', '-0.015', '0.025', '-0.025', '1.125', '-1.125',
+                  '2.675', '-2.675', '0.0049', '-0.0051', '1234567.895', '-1234567.895']
+        with connection.cursor() as cursor:
+            for value in values:
+                cursor.execute('SELECT CAST(%s AS numeric(9,2))', [value])
+                self.assertEqual(cursor.fetchone()[0], pg_numeric(Decimal(value)), value)
@@ -0,0 +1,77 @@
+import hashlib
+import threading
+from io import BytesIO
+
+import orjson
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+
+
+DEFAULT_SYMBOLOGY = 'gs1_128'
+# opciones de barcode.writer.ImageWriter; cambiarlas genera assets nuevos (otra key)
+DEFAULT_WRITER_OPTIONS = {}
+
+# compartido entre productos y tenants: el PNG solo depende de la key
+BARCODE_FOLDER = 'barcodes'
+
+
+class BarcodeCache:
+    """
+    Cache de assets direccionada por contenido:
+        sha256(code, symbology, writer options) -> barcodes/ab/abcdef....png
+    El PNG se renderiza una sola vez y lo reutiliza cualquier producto (de
+    cualquier tenant) con el mismo código. Los archivos nunca se reescriben,
+    así que no se borran al cambiar/eliminar un producto (ver Product).
+    """
+
+    def __init__(self, storage=None):
+        self.storage = storage or default_storage
+        self._known = set()  # paths ya confirmados en el storage (por proceso)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(code, symbology=DEFAULT_SYMBOLOGY, options=None):
+        raw = orjson.dumps([code, symbology, options or DEFAULT_WRITER_OPTIONS],
+                           option=orjson.OPT_SORT_KEYS)
+        return hashlib.sha256(raw).hexdigest()
+
+    @staticmethod
+    def path(code, symbology=DEFAULT_SYMBOLOGY, options=None):
+        key = BarcodeCache.key(code, symbology, options)
+        return f'{BARCODE_FOLDER}/{key[:2]}/{key}.png'
+
+    @staticmethod
+    def render(code, symbology=DEFAULT_SYMBOLOGY, options=None):
+        # diferido: PIL solo al renderizar
+        from barcode import get_barcode_class, writer
+        image_io = BytesIO()
+        get_barcode_class(symbology)(code, writer=writer.ImageWriter()).write(
+            image_io, options=options or DEFAULT_WRITER_OPTIONS)
+        return image_io.getvalue()
+
+    def exists(self, path):
+        if path in self._known:
+            return True
+        if self.storage.exists(path):
+            self._known.add(path)
+            return True
+        return False
+
+    def get_or_render(self, code, symbology=DEFAULT_SYMBOLOGY, options=None):
+        """ Retorna (path, rendered): rendered=False si el asset ya existía """
+        path = self.path(code, symbology, options)
+        if self.exists(path):
+            return path, False
+
+        content = self.render(code, symbology, options)
+        with self._lock:
+            if not self.exists(path):
+                saved_path = self.storage.save(path, ContentFile(content))
+                if saved_path != path:
+                    # otro proceso lo escribió primero: mismo contenido, se usa el suyo
+                    self.storage.delete(saved_path)
+                self._known.add(path)
+        return path, True
+
+
+barcode_cache = BarcodeCache()
@@ -0,0 +1,153 @@
+from decimal import Decimal, ROUND_HALF_UP
+
+
+CENT = Decimal('0.01')
+# ROUND_HALF_UP (mitad alejándose de cero, también en negativos): el redondeo de
+# PostgreSQL al guardar en numeric(9,2)
+ROUNDING = ROUND_HALF_UP
+
+LINE_FIELDS = ('price_with_tax', 'subtotal', 'total_discount', 'total_tax', 'total_amount')
+INVOICE_FIELDS = ('subtotal_with_tax', 'subtotal_without_tax', 'subtotal',
+                  'total_discount', 'total_tax', 'total_amount')
+
+
+def to_cents(value):
+    """ Decimal/int/str con hasta 2 decimales -> entero en centavos (tasas: centésimas) """
+    if not isinstance(value, Decimal):
+        value = Decimal(str(value))
+    return int(value.quantize(CENT, rounding=ROUNDING).scaleb(2))
+
+
+def from_cents(value):
+    return Decimal(value).scaleb(-2)
+
+
+def div_round_half_up(numerator, denominator):
+    """ numerator / denominator redondeado a entero, mitad alejándose de cero (sin pasar por float) """
+    quotient, remainder = divmod(abs(numerator), abs(denominator))
+    if 2 * remainder >= abs(denominator):
+        quotient += 1
+    return quotient if (numerator < 0) == (denominator < 0) else -quotient
+
+
+def apply_rate(cents, rate_hundredths):
+    """ centavos * tasa (0.12 -> 12) redondeado a centavos """
+    return div_round_half_up(cents * rate_hundredths, 100)
+
+
+class BillingCalculator:
+    """
+    Totales de líneas y de factura en una sola pasada con aritmética entera
+    (centavos / centésimas). Como todos los campos de entrada tienen 2 decimales,
+    el resultado es idéntico al cálculo en Decimal cuantizando cada campo con
+    ROUND_HALF_UP, como PostgreSQL al guardar numeric(9,2) (ver reference_line /
+    reference_invoice).
+
+    Por línea (tax y discount son tasas: 0.12 = 12%; cada línea trae su tax):
+        subtotal       = quantity * price
+        total_discount = subtotal * discount
+        total_amount   = subtotal - total_discount
+        total_tax      = total_amount * tax             (solo product.has_tax)
+        price_with_tax = price + price * tax            (solo product.has_tax)
+    Factura:
+        subtotal_with_tax / subtotal_without_tax = Σ total_amount por has_tax
+        total_tax    = Σ por tasa (Σ total_amount de las líneas con esa tasa) * tasa
+        total_amount = subtotal + total_tax
+    """
+
+    @staticmethod
+    def compute_cents(lines):
+        """
+        lines: iterable de (quantity, price_cents, discount_hundredths, has_tax, tax_hundredths)
+        Retorna (filas de LINE_FIELDS en centavos, totales de INVOICE_FIELDS en centavos).
+        """
+        rows = []
+        append = rows.append
+        without_tax = discount_total = 0
+        with_tax_by_rate = {}
+        for quantity, price, discount, has_tax, tax in lines:
+            subtotal = quantity * price
+            total_discount = div_round_half_up(subtotal * discount, 100)
+            total_amount = subtotal - total_discount
+            discount_total += total_discount
+            if has_tax:
+                with_tax_by_rate[tax] = with_tax_by_rate.get(tax, 0) + total_amount
+                append((price + div_round_half_up(price * tax, 100), subtotal, total_discount,
+                        div_round_half_up(total_amount * tax, 100), total_amount))
+            else:
+                without_tax += total_amount
+                append((price, subtotal, total_discount, 0, total_amount))
+
+        with_tax = sum(with_tax_by_rate.values())
+        subtotal = with_tax + without_tax
+        # el impuesto de la factura se redondea una vez por tasa (base imponible por tarifa)
+        total_tax = sum(apply_rate(base, tax) for tax, base in with_tax_by_rate.items())
+        totals = (with_tax, without_tax, subtotal, discount_total, total_tax, subtotal + total_tax)
+        return rows, totals
+
+    @staticmethod
+    def compute(lines):
+        """
+        lines: iterable de (quantity, price, discount, has_tax, tax) con Decimals
+        Retorna (lista de dicts por línea, dict de totales) en Decimal.
+        """
+        rows, totals = BillingCalculator.compute_cents(
+            (int(quantity), to_cents(price), to_cents(discount), has_tax, to_cents(tax))
+            for quantity, price, discount, has_tax, tax in lines
+        )
+        return (
+            [dict(zip(LINE_FIELDS, map(from_cents, row))) for row in rows],
+            dict(zip(INVOICE_FIELDS, map(from_cents, totals))),
+        )
+
+    @staticmethod
+    def apply_to_details(details):
+        """
+        Completa los campos calculados de instancias de ElecBillingDetailBase
+        (usa detail.tax y detail.product.has_tax) y retorna los totales de la factura.
+        Persistir con bulk_update(details, LINE_FIELDS).
+        """
+        details = list(details)
+        if not details:
+            return dict.fromkeys(INVOICE_FIELDS, Decimal('0.00'))
+        rows, totals = BillingCalculator.compute_cents(
+            (detail.quantity, to_cents(detail.price), to_cents(detail.discount),
+             detail.product.has_tax, to_cents(detail.tax)) for detail in details
+        )
+        for detail, row in zip(details, rows):
+            for field, cents in zip(LINE_FIELDS, row):
+                setattr(detail, field, from_cents(cents))
+        return dict(zip(INVOICE_FIELDS, map(from_cents, totals)))
+
+    # ---------------------------
+    # referencia en Decimal (validación / benchmark)
+    # ---------------------------
+    @staticmethod
+    def reference_line(quantity, price, discount, has_tax, tax):
+        subtotal = (quantity * price).quantize(CENT, rounding=ROUNDING)
+        total_discount = (subtotal * discount).quantize(CENT, rounding=ROUNDING)
+        total_amount = subtotal - total_discount
+        if has_tax:
+            price_with_tax = price + (price * tax).quantize(CENT, rounding=ROUNDING)
+            total_tax = (total_amount * tax).quantize(CENT, rounding=ROUNDING)
+        else:
+            price_with_tax, total_tax = price, Decimal('0.00')
+        return dict(zip(LINE_FIELDS, (price_with_tax, subtotal, total_discount, total_tax, total_amount)))
+
+    @staticmethod
+    def reference_invoice(lines):
+        rows = [BillingCalculator.reference_line(*line) for line in lines]
+        with_tax_by_rate = {}
+        for row, (_, _, _, has_tax, tax) in zip(rows, lines):
+            if has_tax:
+                with_tax_by_rate[tax] = with_tax_by_rate.get(tax, Decimal('0.00')) + row['total_amount']
+        with_tax = sum(with_tax_by_rate.values(), Decimal('0.00'))
+        without_tax = sum((row['total_amount'] for row, line in zip(rows, lines) if not line[3]), Decimal('0.00'))
+        subtotal = with_tax + without_tax
+        total_tax = sum(((base * tax).quantize(CENT, rounding=ROUNDING)
+                         for tax, base in with_tax_by_rate.items()), Decimal('0.00'))
+        totals = dict(zip(INVOICE_FIELDS, (
+            with_tax, without_tax, subtotal,
+            sum((row['total_discount'] for row in rows), Decimal('0.00')),
+            total_tax, subtotal + total_tax)))
+        return rows, totals
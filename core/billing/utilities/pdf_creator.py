@@ -1,18 +1,6 @@
-import mimetypes
-from pathlib import Path
-from urllib.parse import urlparse
-
-import weasyprint
 from crum import get_current_request
-from django.conf import settings
-from django.contrib.staticfiles.finders import find
-from django.core.files.storage import default_storage
-from django.template.loader import get_template
-from django.urls import get_script_prefix
-from weasyprint import CSS
-from weasyprint import HTML
 
-from config import settings
+from core.billing.utilities.pdf_render_service import fetch_asset, pdf_render_service
 
 
 class PDFCreator:
@@ -20,38 +8,29 @@ class PDFCreator:
         self.template_name = template_name
 
     def url_fetcher(self, url, *args, **kwargs):
-        if url.startswith('file:'):
-            mime_type, encoding = mimetypes.guess_type(url)
-            url_path = urlparse(url).path
-            data = {
-                'mime_type': mime_type,
-                'encoding': encoding,
-                'filename': Path(url_path).name,
-            }
-
-            default_media_url = settings.MEDIA_URL in ('', get_script_prefix())
-            if not default_media_url and url_path.startswith(settings.MEDIA_URL):
-                media_root = settings.MEDIA_ROOT
-                if isinstance(settings.MEDIA_ROOT, Path):
-                    media_root = f'{settings.MEDIA_ROOT}/'
-                path = url_path.replace(settings.MEDIA_URL, media_root, 1)
-                data['file_obj'] = default_storage.open(path)
-                return data
-
-            elif settings.STATIC_URL and url_path.startswith(settings.STATIC_URL):
-                path = url_path.replace(settings.STATIC_URL, '', 1)
-                data['file_obj'] = open(find(path), 'rb')
-                return data
-
-        return weasyprint.default_url_fetcher(url, *args, **kwargs)
+        # static/media locales y remotos pasan por la AssetCache del proceso
+        return fetch_asset(url, *args, **kwargs)
 
-    def create(self, context):
+    def get_base_url(self):
         request = get_current_request()
-        template = get_template(self.template_name)
-        html_template = template.render(context).encode(encoding="UTF-8")
         if request is not None:
-            pdf_file = HTML(string=html_template, base_url=request.build_absolute_uri()).write_pdf(presentational_hints=True)
-        else:
-            path_css = f'{settings.BASE_DIR}{settings.STATIC_URL}lib/bootstrap-5.0.2/css/bootstrap.min.css'
-            pdf_file = HTML(string=html_template, base_url='.', url_fetcher=self.url_fetcher).write_pdf(stylesheets=[CSS(path_css)], presentational_hints=True)
-        return pdf_file
+            return request.build_absolute_uri()
+        # sin request: rutas relativas + bootstrap (PDF_BASE_STYLESHEET) parseado una vez
+        return None
+
+    def create(self, context):
+        return pdf_render_service.render(
+            self.template_name, context, base_url=self.get_base_url())
+
+    def create_many(self, contexts):
+        """ Batch de comprobantes con el mismo template; un PDF por contexto """
+        return pdf_render_service.render_many(
+            self.template_name, contexts, base_url=self.get_base_url())
+
+    def create_async(self, context, filename):
+        """
+        Encola el render (cola pdf) y retorna el job_id para consultar
+        /api/v1/jobs/<job_id>/. `context` debe ser serializable a JSON.
+        """
+        from core.billing.tasks import render_pdf
+        return render_pdf.delay(self.template_name, context, filename)
@@ -0,0 +1,242 @@
+import atexit
+import mimetypes
+import multiprocessing
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from urllib.parse import urlparse
+
+from django.conf import settings
+from django.contrib.staticfiles.finders import find
+from django.core.files.storage import default_storage
+from django.template.loader import get_template
+from django.urls import get_script_prefix
+
+
+class AssetCache:
+    """
+    LRU en memoria (por proceso) de lo que weasyprint pide al url_fetcher:
+    logos, fuentes, imágenes. Acotada por bytes totales; cada entrada puede
+    tener TTL (None = no vence).
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()  # url -> (dict del fetcher con 'string', expires_at)
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get(self, url):
+        with self._lock:
+            entry = self._items.get(url)
+            if entry is None:
+                return None
+            item, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._items[url]
+                self._size -= len(item['string'])
+                return None
+            self._items.move_to_end(url)
+            return item
+
+    def set(self, url, item, ttl=None):
+        size = len(item['string'])
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + ttl if ttl is not None else None
+        with self._lock:
+            previous = self._items.pop(url, None)
+            if previous is not None:
+                self._size -= len(previous[0]['string'])
+            self._items[url] = (item, expires_at)
+            self._size += size
+            while self._size > self.max_bytes:
+                _, (evicted, _) = self._items.popitem(last=False)
+                self._size -= len(evicted['string'])
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._size = 0
+
+
+asset_cache = AssetCache(getattr(settings, 'PDF_ASSET_CACHE_MAX_BYTES', 32 * 1024 * 1024))
+
+
+def _is_media(url_path):
+    default_media_url = settings.MEDIA_URL in ('', get_script_prefix())
+    return not default_media_url and url_path.startswith(settings.MEDIA_URL)
+
+
+def _local_asset(url_path):
+    """ static/media servidos por este mismo proyecto: se leen del disco/storage """
+    if _is_media(url_path):
+        media_root = settings.MEDIA_ROOT
+        if isinstance(settings.MEDIA_ROOT, Path):
+            media_root = f'{settings.MEDIA_ROOT}/'
+        with default_storage.open(url_path.replace(settings.MEDIA_URL, media_root, 1)) as file_obj:
+            return file_obj.read()
+
+    if settings.STATIC_URL and url_path.startswith(settings.STATIC_URL):
+        path = find(url_path.replace(settings.STATIC_URL, '', 1))
+        if path:
+            with open(path, 'rb') as file_obj:
+                return file_obj.read()
+    return None
+
+
+def _load_asset(url, *args, **kwargs):
+    url_path = urlparse(url).path
+    content = _local_asset(url_path) if url.startswith('file:') else None
+    if content is not None:
+        mime_type, encoding = mimetypes.guess_type(url)
+        return {
+            'mime_type': mime_type,
+            'encoding': encoding,
+            'filename': Path(url_path).name,
+            'string': content,
+        }
+
+    import weasyprint
+    result = weasyprint.default_url_fetcher(url, *args, **kwargs)
+    if 'file_obj' in result:
+        file_obj = result.pop('file_obj')
+        result['string'] = file_obj.read()
+        file_obj.close()
+    return result
+
+
+def asset_ttl(url):
+    """
+    static (parte del deploy) y archivos locales: sin vencimiento.
+    media (subido por usuarios, ej. logos de la empresa) y http(s): PDF_ASSET_CACHE_TTL;
+    0 = no se cachean. data: URIs no se cachean (ya vienen en el HTML).
+    """
+    if url.startswith('data:'):
+        return 0
+    if url.startswith('file:') and not _is_media(urlparse(url).path):
+        return None
+    return getattr(settings, 'PDF_ASSET_CACHE_TTL', 60)
+
+
+def fetch_asset(url, *args, **kwargs):
+    """ url_fetcher de weasyprint con AssetCache (mismo contrato que PDFCreator.url_fetcher) """
+    item = asset_cache.get(url)
+    if item is None:
+        item = _load_asset(url, *args, **kwargs)
+        ttl = asset_ttl(url)
+        if ttl != 0:
+            asset_cache.set(url, item, ttl=ttl)
+    return dict(item)
+
+
+@lru_cache(maxsize=None)
+def get_font_config():
+    from weasyprint.text.fonts import FontConfiguration
+    return FontConfiguration()
+
+
+@lru_cache(maxsize=32)
+def _parsed_stylesheet(path, mtime):
+    from weasyprint import CSS
+    return CSS(filename=path, url_fetcher=fetch_asset, font_config=get_font_config())
+
+
+def get_stylesheet(path):
+    """ CSS parseado una vez por proceso; se invalida si cambia el mtime del archivo """
+    path = str(path)
+    return _parsed_stylesheet(path, os.path.getmtime(path))
+
+
+def write_pdf(html, base_url=None, stylesheet_paths=()):
+    """ HTML ya renderizado -> PDF. Es lo que corre en los procesos del pool """
+    from weasyprint import HTML
+    return HTML(string=html, base_url=base_url or '.', url_fetcher=fetch_asset).write_pdf(
+        stylesheets=[get_stylesheet(path) for path in stylesheet_paths],
+        presentational_hints=True,
+        font_config=get_font_config(),
+    )
+
+
+def _write_pdf_args(args):
+    return write_pdf(*args)
+
+
+def _init_worker():
+    import django
+    django.setup()
+
+
+class PDFRenderService:
+    """
+    Render de PDFs con weasyprint:
+    - el template de Django se renderiza en el proceso que llama (puede usar ORM/request);
+    - write_pdf (CPU) corre en un pool de procesos si PDF_RENDER_WORKERS > 0,
+      o en línea con 0;
+    - cada proceso mantiene su cache de hojas de estilo parseadas y de assets.
+    El pool se crea al primer uso (después del fork de gunicorn) con 'spawn'.
+    """
+
+    def __init__(self, max_workers=None):
+        self.max_workers = max_workers if max_workers is not None else getattr(
+            settings, 'PDF_RENDER_WORKERS', 0)
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context('spawn'),
+                        initializer=_init_worker,
+                    )
+                    atexit.register(self.shutdown)
+        return self._executor
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    @staticmethod
+    def default_stylesheets():
+        path = getattr(settings, 'PDF_BASE_STYLESHEET', None)
+        return (str(path),) if path else ()
+
+    def render_html(self, template_name, context):
+        return get_template(template_name).render(context)
+
+    def write(self, html, base_url=None, stylesheet_paths=()):
+        if not self.max_workers:
+            return write_pdf(html, base_url, stylesheet_paths)
+        return self.executor.submit(write_pdf, html, base_url, tuple(stylesheet_paths)).result()
+
+    def write_many(self, htmls, base_url=None, stylesheet_paths=()):
+        jobs = [(html, base_url, tuple(stylesheet_paths)) for html in htmls]
+        if not self.max_workers:
+            return [write_pdf(*job) for job in jobs]
+        chunksize = max(1, len(jobs) // (self.max_workers * 4))
+        return list(self.executor.map(_write_pdf_args, jobs, chunksize=chunksize))
+
+    def render(self, template_name, context, base_url=None, stylesheet_paths=None):
+        if stylesheet_paths is None:
+            stylesheet_paths = () if base_url else self.default_stylesheets()
+        return self.write(self.render_html(template_name, context), base_url, stylesheet_paths)
+
+    def render_many(self, template_name, contexts, base_url=None, stylesheet_paths=None):
+        """ Batch (p. ej. muchos comprobantes): un PDF por contexto, en el mismo orden """
+        if stylesheet_paths is None:
+            stylesheet_paths = () if base_url else self.default_stylesheets()
+        template = get_template(template_name)
+        htmls = [template.render(context) for context in contexts]
+        return self.write_many(htmls, base_url, stylesheet_paths)
+
+
+pdf_render_service = PDFRenderService()
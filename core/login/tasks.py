@@ -0,0 +1,32 @@
+from django.conf import settings
+from django.core.mail import EmailMessage
+from django.template.loader import render_to_string
+from django.urls import reverse_lazy
+
+from config.shared.services.common.job_queue import job
+from core.user.models import User
+
+
+@job(queue='email', max_retries=5, backoff=10)
+def send_reset_password_email(user_id, absolute_root_url, email_reset_token):
+    user = User.objects.get(pk=user_id)
+    if str(user.email_reset_token) != email_reset_token:
+        # se generó otro token después: ese envío es el que vale
+        return {'sent': False, 'reason': 'token reemplazado'}
+
+    link_reset_password = f"{absolute_root_url}{reverse_lazy('update_password', kwargs={'pk': email_reset_token})}"
+    html = render_to_string('login/password_reset_email.html', {
+        'user': user,
+        'link_reset_password': link_reset_password,
+        'link_home': absolute_root_url
+    })
+    message = EmailMessage(
+        subject='Reseteo de contraseña',
+        body=html,
+        from_email=settings.EMAIL_HOST_USER or settings.DEFAULT_FROM_EMAIL,
+        to=[user.email],
+    )
+    message.content_subtype = 'html'
+    message.send()
+    # el resultado queda en Redis y se expone por /api/v1/jobs/: sin datos personales
+    return {'sent': True}
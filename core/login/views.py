@@ -1,19 +1,16 @@
 import json
-import smtplib
-from email.mime.multipart import MIMEMultipart
-from email.mime.text import MIMEText
 
 from django.contrib.auth import login, logout
 from django.contrib.auth.forms import AuthenticationForm
 from django.contrib.auth.views import LoginView
 from django.db import transaction
 from django.http import HttpResponseRedirect, HttpResponse
-from django.template.loader import render_to_string
 from django.urls import reverse_lazy
 from django.views.generic import FormView, RedirectView, TemplateView
 
 from config import settings
 from core.login.forms import ResetPasswordForm, UpdatePasswordForm
+from core.login.tasks import send_reset_password_email
 from core.security.models import UserAccess
 from core.user.models import User
 
@@ -69,32 +66,15 @@ class LoginResetPasswordView(FormView):
         return HttpResponse(json.dumps(data), content_type='application/json')
 
     def send_email_reset_password(self, user):
+        ABSOLUTE_ROOT_URL = self.request.build_absolute_uri('/').strip('/')
         with transaction.atomic():
-            ABSOLUTE_ROOT_URL = self.request.build_absolute_uri('/').strip('/')
             user.is_change_password = True
             user.email_reset_token = user.generate_token_email()
             user.save()
-            activate_account = f"{ABSOLUTE_ROOT_URL}{reverse_lazy('update_password', kwargs={'pk': user.email_reset_token})}"
-            message = MIMEMultipart('alternative')
-            message['Subject'] = 'Reseteo de contraseña'
-            message['From'] = settings.EMAIL_HOST_USER
-            message['To'] = user.email
-            parameters = {
-                'user': user,
-                'link_reset_password': activate_account,
-                'link_home': ABSOLUTE_ROOT_URL
-            }
-            html = render_to_string(
-                'login/password_reset_email.html', parameters)
-            content = MIMEText(html, 'html')
-            message.attach(content)
-            server = smtplib.SMTP(settings.EMAIL_HOST, settings.EMAIL_PORT)
-            server.starttls()
-            server.login(settings.EMAIL_HOST_USER,
-                         settings.EMAIL_HOST_PASSWORD)
-            server.sendmail(settings.EMAIL_HOST_USER,
-                            user.email, message.as_string())
-            server.quit()
+            # el SMTP corre en el worker (cola email) cuando la transacción confirma
+            send_reset_password_email.delay_on_commit(
+                user.id, ABSOLUTE_ROOT_URL, str(user.email_reset_token),
+                idempotency_key=f'reset-password-{user.id}-{user.email_reset_token}')
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
@@ -1,18 +1,22 @@
 # core/multicpy/middleware.py
 # from django.http import HttpResponseForbidden
+from config.shared.services.common.tenant_resolver import tenant_resolver
 
 
 class CustomMiddleware:
     """
-    Middleware simplificado sin tenants.
+    Resuelve el tenant (host / header -> schema + empresa) una vez por request.
+    Queda en request.tenant_info y en el RequestContext.
     Aquí puedes poner cualquier lógica de validación global de request.
     """
 
     def __init__(self, get_response):
         self.get_response = get_response
+        tenant_resolver.connect_invalidation()
 
     def __call__(self, request):
         # Lógica antes de la vista
+        request.tenant_info = tenant_resolver.resolve(request)
         # Por ejemplo, si quieres bloquear requests basados en headers, IP, etc.
         # if some_condition:
         #     return HttpResponseForbidden("No autorizado")
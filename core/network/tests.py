@@ -0,0 +1,130 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from config.shared.helpers.db_replica_helper import replica_read
+from config.shared.helpers.request_context_helper import (
+    end_request_context, get_request_context, start_request_context,
+)
+from config.shared.views.base_mixins_view import ListViewMixin
+from core.network.utils.db_routers import PRIMARY_DB, ReplicaLagMonitor, Router, _PG_REPLICA_LAG_SQL, replica_lag
+
+
+def build_router(lag=0.0):
+    router = Router()
+    router.lag_monitor.get_lag = lambda alias: lag
+    return router
+
+
+class RecordingService:
+    """ service de listado que registra a qué base iría la lectura """
+
+    def __init__(self, router):
+        self.router = router
+        self.reads = []
+        self.repository = type('Repository', (), {'model': type('Producto', (), {})})()
+
+    def find_all(self, filter_params, page_number, page_size, ignorar_user=False):
+        self.reads.append(self.router.db_for_read(None))
+        return {'meta': {'count': 0}, 'data': []}
+
+
+@override_settings(DB_REPLICAS=['replica_1'], DB_REPLICA_MAX_LAG=5)
+class RouterTests(SimpleTestCase):
+    def setUp(self):
+        self.token = start_request_context(RequestFactory().get('/'))
+
+    def tearDown(self):
+        end_request_context(self.token)
+
+    def test_reads_outside_replica_read_use_primary(self):
+        self.assertEqual(build_router().db_for_read(None), PRIMARY_DB)
+        self.assertFalse(get_request_context().db_replica_used)
+
+    def test_replica_read_marks_context(self):
+        router = build_router()
+        self.assertEqual(replica_read(lambda: router.db_for_read(None))(), 'replica_1')
+        self.assertTrue(get_request_context().db_replica_used)
+
+    def test_lagging_replica_falls_back_to_primary(self):
+        router = build_router(lag=30)
+        self.assertEqual(replica_read(lambda: router.db_for_read(None))(), PRIMARY_DB)
+        self.assertFalse(get_request_context().db_replica_used)
+
+    def test_write_pins_primary(self):
+        router = build_router()
+
+        def handler():
+            router.db_for_write(None)
+            return router.db_for_read(None)
+
+        self.assertEqual(replica_read(handler)(), PRIMARY_DB)
+
+
+@override_settings(DB_REPLICAS=['replica_1'], DB_REPLICA_MAX_LAG=5)
+class CachedListReadsTests(SimpleTestCase):
+    def setUp(self):
+        self.router = build_router()
+        self.view = ListViewMixin()
+        self.view.service = RecordingService(self.router)
+        self.view.clear_cache(model_name='Producto')
+
+    def tearDown(self):
+        self.view.clear_cache(model_name='Producto')
+
+    def get(self, path):
+        request = RequestFactory().get(path)
+        request.user = type('User', (), {'id': 1})()
+        request.tenant_info = type('TenantInfo', (), {'schema_name': 'public'})()
+        token = start_request_context(request)
+        try:
+            return self.view.get(request)
+        finally:
+            end_request_context(token)
+
+    def test_cache_miss_reads_primary_and_is_cached(self):
+        self.assertEqual(self.get('/api/v1/producto/?page=1').status_code, 200)
+        self.assertEqual(self.view.service.reads, [PRIMARY_DB])
+        self.get('/api/v1/producto/?page=1')
+        self.assertEqual(self.view.service.reads, [PRIMARY_DB])  # hit
+
+    def test_replica_results_are_not_cached(self):
+        token = start_request_context(RequestFactory().get('/'))
+        try:
+            get_request_context().db_replica_used = True
+            self.view.set_cached_data('Producto_all_replica', {'meta': {}, 'data': []})
+        finally:
+            end_request_context(token)
+        self.assertIsNone(cache.get('Producto_all_replica'))
+
+
+class ReplicaLagTests(TestCase):
+    def test_primary_reports_no_lag(self):
+        # fuera de recovery las funciones de WAL retornan NULL -> 0
+        with connection.cursor() as cursor:
+            cursor.execute(_PG_REPLICA_LAG_SQL)
+            self.assertEqual(cursor.fetchone()[:2], (False, False))
+        lag = ReplicaLagMonitor(check_interval=5)._measure(connection.alias)
+        self.assertEqual(lag, 0.0)
+
+    def test_disconnected_receiver_is_unavailable(self):
+        # sin WAL receiver receive_lsn = replay_lsn aunque el primario siga escribiendo
+        self.assertEqual(replica_lag(True, False, True, 3600), float('inf'))
+        self.assertEqual(replica_lag(True, False, None, None), float('inf'))
+
+    def test_streaming_replica(self):
+        self.assertEqual(replica_lag(True, True, True, 3600), 0.0)
+        self.assertEqual(replica_lag(True, True, False, 2.5), 2.5)
+        self.assertEqual(replica_lag(True, True, False, None), 0.0)
+
+    @override_settings(DB_REPLICAS=['replica_1'], DB_REPLICA_MAX_LAG=5, DB_REPLICA_STRATEGY='least_lag')
+    def test_disconnected_replica_is_not_picked(self):
+        router = build_router()
+        router.lag_monitor = ReplicaLagMonitor(check_interval=5)
+        router.lag_monitor._measure = lambda alias: replica_lag(True, False, True, 0)
+        token = start_request_context(RequestFactory().get('/'))
+        try:
+            get_request_context().db_read_replica = True
+            self.assertEqual(router.db_for_read(None), PRIMARY_DB)
+        finally:
+            end_request_context(token)
@@ -1,15 +1,139 @@
+import threading
+import time
+from itertools import count
+
+from django.conf import settings
+from django.db import connections
+
+from config.shared.helpers.db_replica_helper import pin_primary
+from config.shared.helpers.request_context_helper import get_request_context
+
+
+PRIMARY_DB = 'default'
+
+# estado de replicación de una réplica postgres; el lag se calcula en replica_lag().
+# pg_stat_wal_receiver.status requiere pg_read_all_stats (o pg_monitor) para el usuario
+# de la réplica: sin ese permiso se ve NULL y la réplica queda fuera.
+_PG_REPLICA_LAG_SQL = (
+    "SELECT pg_is_in_recovery(), "
+    "EXISTS (SELECT 1 FROM pg_stat_wal_receiver WHERE status = 'streaming'), "
+    "pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn(), "
+    "EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())"
+)
+
+
+def replica_lag(in_recovery, streaming, caught_up, replay_age):
+    """
+    Lag en segundos a partir de _PG_REPLICA_LAG_SQL.
+    - Fuera de recovery (alias apuntando al primario): 0.
+    - WAL receiver desconectado: receive_lsn deja de avanzar y receive = replay
+      aunque el primario siga escribiendo; no se puede medir -> infinito.
+    - Ya reprodujo todo lo recibido: 0 (con el primario sin escrituras
+      now() - pg_last_xact_replay_timestamp() crece sin límite).
+    """
+    if not in_recovery:
+        return 0.0
+    if not streaming:
+        return float('inf')
+    if caught_up:
+        return 0.0
+    # NULL: todavía no reprodujo ninguna transacción
+    return float(replay_age or 0)
+
+
+class ReplicaLagMonitor:
+    """
+    Lag por réplica, medido como máximo una vez cada `check_interval` segundos
+    por proceso. Una réplica que falla al consultar queda fuera (lag infinito).
+    """
+
+    def __init__(self, check_interval):
+        self.check_interval = check_interval
+        self._lags = {}  # alias -> (lag, checked_at)
+        self._lock = threading.Lock()
+
+    def get_lag(self, alias):
+        now = time.monotonic()
+        cached = self._lags.get(alias)
+        if cached and now - cached[1] < self.check_interval:
+            return cached[0]
+
+        lag = self._measure(alias)
+        with self._lock:
+            self._lags[alias] = (lag, now)
+        return lag
+
+    @staticmethod
+    def _measure(alias):
+        connection = connections[alias]
+        if connection.vendor != 'postgresql':
+            # sqlite/local: alias apuntando a la misma data, sin replicación
+            return 0.0
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(_PG_REPLICA_LAG_SQL)
+                return replica_lag(*cursor.fetchone())
+        except Exception:
+            return float('inf')
+
+
 class Router:
     """
-    Router simple para un proyecto sin tenants.
-    Todas las operaciones se hacen en la base de datos 'default'.
+    Router primario/réplicas para un proyecto sin tenants.
+    - Escrituras y migraciones: 'default'.
+    - Lecturas: réplicas solo dentro de handlers marcados con @replica_read
+      (list/detail genéricos), nunca después de una escritura en el mismo
+      request, y solo si la réplica está dentro del lag permitido.
+    - Sin DB_REPLICAS configuradas todo va a 'default'.
     """
 
+    def __init__(self):
+        self.replicas = list(getattr(settings, 'DB_REPLICAS', []))
+        self.max_lag = getattr(settings, 'DB_REPLICA_MAX_LAG', 5)
+        self.strategy = getattr(settings, 'DB_REPLICA_STRATEGY', 'round_robin')
+        self.lag_monitor = ReplicaLagMonitor(
+            getattr(settings, 'DB_REPLICA_LAG_CHECK_INTERVAL', 5))
+        self._round_robin = count()
+
     def db_for_read(self, model, **hints):
-        return 'default'
+        if not self.replicas:
+            return PRIMARY_DB
+        context = get_request_context()
+        if not context.db_read_replica or context.db_pinned_primary:
+            return PRIMARY_DB
+        alias = self._pick_replica()
+        if alias is None:
+            return PRIMARY_DB
+        context.db_replica_used = True
+        return alias
 
     def db_for_write(self, model, **hints):
-        return 'default'
+        if self.replicas:
+            # read-after-write: el resto del request lee del primario
+            pin_primary()
+        return PRIMARY_DB
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # primario y réplicas tienen la misma data
+        return True
 
     def allow_migrate(self, db, app_label, model_name=None, **hints):
         # Permitir todas las migraciones solo en 'default'
-        return db == 'default'
+        return db == PRIMARY_DB
+
+    # ---------------------------
+    # selección de réplica
+    # ---------------------------
+    def _pick_replica(self):
+        if self.strategy == 'least_lag':
+            lags = [(self.lag_monitor.get_lag(alias), alias)
+                    for alias in self.replicas]
+            lag, alias = min(lags)
+            return alias if lag <= self.max_lag else None
+
+        start = next(self._round_robin)
+        for offset in range(len(self.replicas)):
+            alias = self.replicas[(start + offset) % len(self.replicas)]
+            if self.lag_monitor.get_lag(alias) <= self.max_lag:
+                return alias
+        return None
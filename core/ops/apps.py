@@ -0,0 +1,7 @@
+from django.apps import AppConfig
+
+
+class OpsConfig(AppConfig):
+    """ Comandos del proyecto (no de un módulo de negocio): worker de jobs, OpenAPI, perfiles y benchmarks """
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'core.ops'
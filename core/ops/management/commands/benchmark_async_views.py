@@ -0,0 +1,111 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import ThreadSensitiveContext
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from rest_framework.permissions import AllowAny
+from rest_framework.views import APIView
+
+from config.shared.views.async_mixins_view import AsyncAPIViewMixin, AsyncListViewMixin
+from config.shared.views.base_mixins_view import ListViewMixin
+from core.ops.management.commands.benchmark_renderer import build_list_page
+
+
+class SimulatedListService:
+    """ find_all con latencia de I/O fija (BD/ES), mismo shape que los services """
+
+    def __init__(self, io_seconds=0.0, page_size=10):
+        self.io_seconds = io_seconds
+        self.page = build_list_page(page_size)['data']
+        self.calls = 0
+        self.repository = type('Repository', (), {'model': type('BenchmarkItem', (), {})})()
+
+    def find_all(self, filter_params, page_number, page_size, ignorar_user=False):
+        self.calls += 1
+        if self.io_seconds:
+            time.sleep(self.io_seconds)
+        return {'meta': self.page['meta'], 'data': self.page['items']}
+
+
+class SyncListView(APIView, ListViewMixin):
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    service = None
+
+    def __init__(self, service, **kwargs):
+        self.service = service
+        super().__init__(**kwargs)
+
+
+class AsyncListView(AsyncAPIViewMixin, APIView, AsyncListViewMixin):
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    service = None
+
+    def __init__(self, service, **kwargs):
+        self.service = service
+        super().__init__(**kwargs)
+
+
+def build_request(path):
+    request = RequestFactory().get(path)
+    request.tenant_info = type('TenantInfo', (), {'schema_name': 'benchmark'})()
+    return request
+
+
+class Command(BaseCommand):
+    help = ('Benchmark de concurrencia del listado genérico: ListViewMixin (threads, WSGI) '
+            'vs AsyncListViewMixin (event loop, ASGI), con hits de cache y con misses con I/O')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=2000)
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument('--io-ms', type=float, default=20,
+                            help='Latencia simulada de la consulta en un miss de cache')
+
+    def run_sync(self, view, paths, concurrency):
+        def call(path):
+            return view(build_request(path)).render().status_code
+
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            start = time.perf_counter()
+            statuses = list(executor.map(call, paths))
+        return time.perf_counter() - start, statuses
+
+    def run_async(self, view, paths, concurrency):
+        async def main():
+            semaphore = asyncio.Semaphore(concurrency)
+
+            async def call(path):
+                # como ASGIHandler: el código sync de cada request usa su propio thread
+                async with semaphore, ThreadSensitiveContext():
+                    response = await view(build_request(path))
+                    return response.render().status_code
+
+            return await asyncio.gather(*(call(path) for path in paths))
+
+        start = time.perf_counter()
+        statuses = asyncio.run(main())
+        return time.perf_counter() - start, statuses
+
+    def handle(self, *args, **options):
+        total, concurrency = options['requests'], options['concurrency']
+        io_seconds = options['io_ms'] / 1000
+
+        for label, paths in (
+                ('hits de cache', ['/benchmark/?page=1'] * total),
+                # cada request con filtros distintos -> miss
+                ('misses con I/O', [f'/benchmark/?page=1&name=item{index}' for index in range(total)])):
+            for mode, view_class, run in (('sync', SyncListView, self.run_sync),
+                                          ('async', AsyncListView, self.run_async)):
+                service = SimulatedListService(io_seconds)
+                view = view_class.as_view(service=service)
+                view_class(service).clear_cache(model_name='BenchmarkItem')
+                elapsed, statuses = run(view, paths, concurrency)
+                errors = sum(status != 200 for status in statuses)
+                self.stdout.write(
+                    f"{label:<16} {mode:<6} {total / elapsed:>9.0f} req/s  "
+                    f"({elapsed:.2f} s, {service.calls} consultas, {errors} errores)")
+            SyncListView(SimulatedListService()).clear_cache(model_name='BenchmarkItem')
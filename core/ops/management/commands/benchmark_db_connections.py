@@ -0,0 +1,63 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class Command(BaseCommand):
+    help = ('Latencia de un request típico (una query) con y sin reutilizar la conexión: '
+            'conexión nueva por request (CONN_MAX_AGE=0), persistente, y persistente con ping por request')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument('--requests', type=int, default=500)
+
+    def run_query(self, conn):
+        with conn.cursor() as cursor:
+            cursor.execute('SELECT 1')
+            cursor.fetchone()
+
+    def measure(self, conn, requests, before=None, after=None):
+        timings = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            if before:
+                before(conn)
+            self.run_query(conn)
+            if after:
+                after(conn)
+            timings.append(time.perf_counter() - start)
+        return timings
+
+    def handle(self, *args, **options):
+        conn = connections[options['database']]
+        requests = options['requests']
+        conn.close()
+
+        cases = (
+            # CONN_MAX_AGE=0: se conecta y se cierra en cada request
+            ('sin reutilización', None, lambda c: c.close()),
+            # CONN_MAX_AGE>0 con ping en cada request (health check sin umbral)
+            ('reutilizada + ping', lambda c: c.connection is not None and c.is_usable(), None),
+            # CONN_MAX_AGE>0; el ping solo tras DB_CONN_HEALTH_CHECK_IDLE de inactividad
+            ('reutilizada', None, None),
+        )
+        results = {}
+        for label, before, after in cases:
+            self.run_query(conn)  # calentamiento
+            timings = self.measure(conn, requests, before, after)
+            results[label] = statistics.median(timings)
+            self.stdout.write(
+                f"{label:<22} mediana {results[label] * 1000:>7.3f} ms  "
+                f"p95 {percentile(timings, 0.95) * 1000:>7.3f} ms")
+        conn.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Reutilizar la conexión: {results['sin reutilización'] / results['reutilizada']:.1f}x "
+            f"menos latencia por request ({options['database']})"))
@@ -0,0 +1,56 @@
+import statistics
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.utils.module_loading import import_string
+
+
+class Command(BaseCommand):
+    help = ('Overhead por request de cada middleware de MIDDLEWARE (y del stack completo) '
+            'alrededor de una view que responde sin trabajo')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=5000)
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Corridas por caso (se reporta la mediana)')
+        parser.add_argument('--status', type=int, default=200,
+                            help='Status de la view (ej. 404 para medir la normalización de errores)')
+
+    def measure(self, handler, request, iterations, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                handler(request)
+            timings.append((time.perf_counter() - start) / iterations)
+        return statistics.median(timings)
+
+    def handle(self, *args, **options):
+        iterations, repeat = options['iterations'], options['repeat']
+        status_code = options['status']
+
+        def view(request):
+            return HttpResponse(b'{}', status=status_code, content_type='application/json')
+
+        request = RequestFactory().get('/api/v1/role/', HTTP_HOST='localhost')
+        baseline = self.measure(view, request, iterations, repeat)
+        self.stdout.write(f"{'view sola':<90} {baseline * 1e6:>8.2f} us")
+
+        for path in settings.MIDDLEWARE:
+            try:
+                handler = import_string(path)(view)
+                elapsed = self.measure(handler, request, iterations, repeat)
+            except Exception as exc:
+                self.stdout.write(f"{path:<90} {'error':>8}  {exc.__class__.__name__}: {exc}")
+                continue
+            self.stdout.write(f"{path:<90} {(elapsed - baseline) * 1e6:>8.2f} us")
+
+        handler = view
+        for path in reversed(settings.MIDDLEWARE):
+            handler = import_string(path)(handler)
+        elapsed = self.measure(handler, request, iterations, repeat)
+        self.stdout.write(self.style.SUCCESS(
+            f"{'stack completo':<90} {(elapsed - baseline) * 1e6:>8.2f} us ({len(settings.MIDDLEWARE)} middlewares)"))
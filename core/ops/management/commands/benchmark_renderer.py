@@ -0,0 +1,74 @@
+import statistics
+import time
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.renderers import JSONRenderer
+
+from config.shared.constants.constants import PAGINATION_DEFAULT_PAGE_SIZE
+from config.shared.renderers.orjson_renderer import ORJSONRenderer
+
+
+def build_list_page(page_size):
+    """ Mismo envelope que ListViewMixin.get con items típicos (UUID, fechas, Decimal) """
+    now = timezone.now()
+    items = [
+        {
+            'id': index,
+            'uuid': uuid.uuid4(),
+            'name': f'Producto {index}',
+            'description': 'Descripción del producto ' * 4,
+            'price': Decimal('1234.56') + index,
+            'tax': Decimal('0.12'),
+            'state': True,
+            'created_at': now - timedelta(days=index),
+            'modified_at': now,
+            'category': {'id': index % 7, 'name': f'Categoría {index % 7}'},
+        }
+        for index in range(page_size)
+    ]
+    return {
+        'status': status.HTTP_200_OK,
+        'message': 'Elementos paginados correctamente',
+        'data': {
+            'meta': {'page': 1, 'page_size': page_size, 'total': 10 * page_size, 'total_pages': 10},
+            'items': items,
+        },
+    }
+
+
+class Command(BaseCommand):
+    help = 'Microbenchmark del render de una página de listado: JSONRenderer (DRF) vs ORJSONRenderer'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--page-size', type=int, default=PAGINATION_DEFAULT_PAGE_SIZE)
+        parser.add_argument('--iterations', type=int, default=2000,
+                            help='Renders por corrida')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Corridas por renderer (se reporta la mediana)')
+
+    def handle(self, *args, **options):
+        page = build_list_page(options['page_size'])
+        iterations = options['iterations']
+
+        results = {}
+        for label, renderer in (('JSONRenderer', JSONRenderer()), ('ORJSONRenderer', ORJSONRenderer())):
+            size = len(renderer.render(page, 'application/json'))
+            timings = []
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                for _ in range(iterations):
+                    renderer.render(page, 'application/json')
+                timings.append((time.perf_counter() - start) / iterations)
+            results[label] = statistics.median(timings)
+            self.stdout.write(
+                f"{label:<16} {results[label] * 1e6:>9.1f} us/página "
+                f"{1 / results[label]:>10.0f} páginas/s  ({size} bytes)")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"ORJSONRenderer {results['JSONRenderer'] / results['ORJSONRenderer']:.1f}x más rápido "
+            f"(page_size={options['page_size']})"))
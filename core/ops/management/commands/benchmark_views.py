@@ -0,0 +1,48 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from config.shared.di.di import container, resolve
+from config.shared.views.general_view import GenericAPIViewService
+from log.models.role_model import Role
+from log.repositories.role_repositories import RoleRepository
+from log.services.role_services import RoleService
+from log.views.role_views import RoleDetailView, RoleView
+
+
+def build_role_service():
+    # grafo armado en cada instanciación (lo que se evita con los Singleton del container)
+    return RoleService(repository=RoleRepository(model=Role))
+
+
+class Command(BaseCommand):
+    help = 'Benchmark del costo de instanciar views: resolve() vs provider del container vs grafo nuevo'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=20000)
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Corridas por caso (se reporta la mediana)')
+
+    def measure(self, build, iterations, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(iterations):
+                build()
+            timings.append((time.perf_counter() - start) / iterations)
+        return statistics.median(timings)
+
+    def handle(self, *args, **options):
+        iterations, repeat = options['iterations'], options['repeat']
+        cases = (
+            ('resolve()', lambda: resolve('role_service')),
+            ('container.role_service()', container.role_service),
+            ('grafo nuevo', build_role_service),
+            ('RoleView()', RoleView),
+            ('RoleDetailView()', RoleDetailView),
+            ('view + grafo nuevo', lambda: GenericAPIViewService(build_role_service())),
+        )
+        for label, build in cases:
+            elapsed = self.measure(build, iterations, repeat)
+            self.stdout.write(f"{label:<28} {elapsed * 1e6:>8.2f} us  {1 / elapsed:>12.0f} /s")
@@ -0,0 +1,76 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# un worker nuevo por corrida: primer request vs mediana de los siguientes
+WORKER_SCRIPT = """
+import json, statistics, sys, time
+import django
+django.setup()
+from django.test import Client
+from config.shared.helpers.warmup_helper import WarmupStaticHelper
+
+paths, repeat, warm = json.loads(sys.argv[1]), int(sys.argv[2]), sys.argv[3] == '1'
+client = Client()
+# como get_wsgi_application(): el middleware se carga al crear la app, antes del warm-up
+client.handler.load_middleware()
+if warm:
+    WarmupStaticHelper.run(open_connections=True, observe=False)
+result = {}
+for path in paths:
+    timings = []
+    for _ in range(repeat + 1):
+        start = time.perf_counter()
+        client.get(path)
+        timings.append(time.perf_counter() - start)
+    result[path] = {'first': timings[0], 'steady': statistics.median(timings[1:])}
+print(json.dumps(result))
+"""
+
+DEFAULT_PATHS = ['/api/v1/role/', '/api/v1/swagger.json']
+
+
+class Command(BaseCommand):
+    help = 'Latencia del primer request de un worker nuevo vs estado estable, con y sin warm-up'
+
+    def add_arguments(self, parser):
+        parser.add_argument('paths', nargs='*', default=DEFAULT_PATHS)
+        parser.add_argument('--repeat', type=int, default=20,
+                            help='Requests después del primero (se reporta la mediana)')
+        parser.add_argument('--max-ratio', type=float, default=None,
+                            help='Falla si con warm-up primer request / estable supera este valor')
+
+    def run_worker(self, paths, repeat, warm):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get(
+            'DJANGO_SETTINGS_MODULE', 'config.settings')}
+        result = subprocess.run(
+            [sys.executable, '-c', WORKER_SCRIPT, json.dumps(paths), str(repeat), '1' if warm else '0'],
+            env=env, cwd=str(settings.BASE_DIR), capture_output=True, text=True)
+        if result.returncode != 0:
+            raise CommandError(result.stderr[-2000:])
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def handle(self, *args, **options):
+        paths, repeat = options['paths'], options['repeat']
+        cold = self.run_worker(paths, repeat, warm=False)
+        warm = self.run_worker(paths, repeat, warm=True)
+
+        self.stdout.write(
+            f"{'path':<40} {'estable ms':>11} {'1º sin warm-up':>15} {'1º con warm-up':>15} {'ratio':>7}")
+        worst = 0.0
+        for path in paths:
+            steady = warm[path]['steady']
+            ratio = warm[path]['first'] / steady if steady else float('inf')
+            worst = max(worst, ratio)
+            self.stdout.write(
+                f"{path:<40} {steady * 1000:>11.2f} {cold[path]['first'] * 1000:>15.2f} "
+                f"{warm[path]['first'] * 1000:>15.2f} {ratio:>7.1f}")
+
+        if options['max_ratio'] is not None and worst > options['max_ratio']:
+            raise CommandError(
+                f"primer request con warm-up {worst:.1f}x el estable (máximo: {options['max_ratio']})")
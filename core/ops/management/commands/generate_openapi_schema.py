@@ -0,0 +1,44 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+
+from config.shared.helpers.openapi_schema_helper import OpenApiSchemaStaticHelper
+from config.shared.helpers.warmup_helper import WarmupStaticHelper
+
+
+class Command(BaseCommand):
+    help = 'Genera el schema OpenAPI versionado (APP_VERSION) que sirve /api/v1/swagger.json'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=None,
+                            help='Ruta del archivo (por defecto OPENAPI_SCHEMA_DIR/openapi-<version>.json)')
+        parser.add_argument('--benchmark', type=int, default=0,
+                            help='Genera el schema N veces y reporta el tiempo vs. cantidad de endpoints')
+
+    def handle(self, *args, **options):
+        if options['benchmark']:
+            return self.benchmark(options['benchmark'])
+
+        if options['output'] is None and OpenApiSchemaStaticHelper.schema_path() is None:
+            self.stdout.write(self.style.WARNING(
+                'APP_VERSION no definido: no se escribe el schema (cada proceso lo genera al primer uso)'))
+            return
+
+        start = time.perf_counter()
+        path, content = OpenApiSchemaStaticHelper.write(options['output'])
+        self.stdout.write(self.style.SUCCESS(
+            f'Schema generado en {path} ({len(content) / 1024:.0f} KB, {(time.perf_counter() - start) * 1000:.0f} ms)'))
+
+    def benchmark(self, runs):
+        endpoints = sum(1 for _ in WarmupStaticHelper.iter_url_patterns())
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            OpenApiSchemaStaticHelper.generate()
+            timings.append(time.perf_counter() - start)
+        median = statistics.median(timings)
+        self.stdout.write(
+            f'endpoints={endpoints} runs={runs} mediana={median * 1000:.0f} ms '
+            f'min={min(timings) * 1000:.0f} ms max={max(timings) * 1000:.0f} ms '
+            f'ms/endpoint={median * 1000 / max(endpoints, 1):.2f}')
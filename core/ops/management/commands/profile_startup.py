@@ -0,0 +1,89 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+
+# arranque equivalente al de un worker: settings + apps + urls
+BOOT_SCRIPT = (
+    "import django; django.setup(); "
+    "from django.urls import get_resolver; get_resolver().url_patterns"
+)
+
+PROJECT_PACKAGES = ('config', 'core', 'users', 'usuarios', 'log', 'webhooks')
+
+
+def group_name(module):
+    parts = module.split('.')
+    if parts[0] in PROJECT_PACKAGES and len(parts) > 1:
+        return '.'.join(parts[:2])
+    return parts[0]
+
+
+def parse_importtime(stderr):
+    """
+    Lee la salida de `python -X importtime`:
+        import time: self [us] | cumulative | imported package
+    Retorna {grupo: {'self': us, 'cumulative': us, 'modules': n}}.
+    `self` sumado por grupo no duplica; `cumulative` es el del import más externo del grupo.
+    """
+    groups = defaultdict(lambda: {'self': 0, 'cumulative': 0, 'modules': 0})
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        group = groups[group_name(module.strip())]
+        group['self'] += int(self_us)
+        group['cumulative'] = max(group['cumulative'], int(cumulative_us))
+        group['modules'] += 1
+    return groups
+
+
+class Command(BaseCommand):
+    help = 'Perfil de arranque: costo de imports por app (-X importtime) y tiempo de boot de un worker'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=25,
+                            help='Cantidad de grupos a mostrar')
+        parser.add_argument('--repeat', type=int, default=5,
+                            help='Arranques en frío para medir el boot')
+
+    def handle(self, *args, **options):
+        env = {**os.environ, 'DJANGO_SETTINGS_MODULE': os.environ.get(
+            'DJANGO_SETTINGS_MODULE', 'config.settings')}
+        cwd = str(settings.BASE_DIR)
+
+        # 1) imports por app
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', BOOT_SCRIPT],
+            env=env, cwd=cwd, capture_output=True, text=True)
+        if result.returncode != 0:
+            self.stderr.write(result.stderr[-2000:])
+            return
+        groups = parse_importtime(result.stderr)
+        total_self = sum(g['self'] for g in groups.values())
+
+        self.stdout.write(
+            f"{'app / package':<40} {'self ms':>10} {'cumul ms':>10} {'%':>6} {'mods':>6}")
+        ranked = sorted(groups.items(), key=lambda x: -x[1]['self'])
+        for name, group in ranked[:options['top']]:
+            self.stdout.write(
+                f"{name:<40} {group['self'] / 1000:>10.1f} {group['cumulative'] / 1000:>10.1f} "
+                f"{100 * group['self'] / total_self:>6.1f} {group['modules']:>6}")
+        self.stdout.write(f"Total imports: {total_self / 1000:.1f} ms")
+
+        # 2) boot de worker en frío (proceso nuevo por corrida)
+        timings = []
+        for _ in range(options['repeat']):
+            start = time.perf_counter()
+            subprocess.run([sys.executable, '-c', BOOT_SCRIPT],
+                           env=env, cwd=cwd, check=True, capture_output=True)
+            timings.append(time.perf_counter() - start)
+        self.stdout.write(
+            f"Boot worker ({options['repeat']} corridas): mediana {statistics.median(timings) * 1000:.0f} ms, "
+            f"min {min(timings) * 1000:.0f} ms, max {max(timings) * 1000:.0f} ms")
@@ -0,0 +1,58 @@
+import signal
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from config.shared.services.common.job_queue import JobWorker, autodiscover_tasks
+
+
+def parse_queues(value):
+    """ 'default:4,email:2,pdf' -> {'default': 4, 'email': 2, 'pdf': 1} """
+    concurrency = {}
+    for item in filter(None, (part.strip() for part in value.split(','))):
+        name, _, threads = item.partition(':')
+        try:
+            concurrency[name] = int(threads) if threads else 1
+        except ValueError:
+            raise CommandError(f'Concurrencia inválida para la cola {name}: {threads}')
+        if concurrency[name] < 1:
+            raise CommandError(f'La cola {name} necesita al menos 1 hilo')
+    return concurrency
+
+
+class Command(BaseCommand):
+    help = 'Worker de jobs en segundo plano (email, PDF, barcode, auditoría)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--queues', default=None,
+                            help='Colas y concurrencia: "default:4,email:2" (por defecto JOB_QUEUES)')
+        parser.add_argument('--poll-timeout', type=int, default=1,
+                            help='Segundos de espera de BRPOPLPUSH por cola')
+
+    def handle(self, *args, **options):
+        concurrency = parse_queues(options['queues'] or settings.JOB_QUEUES)
+        if not concurrency:
+            raise CommandError('No hay colas configuradas')
+
+        tasks = autodiscover_tasks()
+        self.stdout.write(f"Jobs registrados: {', '.join(sorted(tasks)) or '-'}")
+        self.stdout.write(
+            'Colas: ' + ', '.join(f'{name} x{threads}' for name, threads in concurrency.items()))
+
+        worker = JobWorker(concurrency, poll_timeout=options['poll_timeout'])
+        stopping = []
+
+        def shutdown(signum, frame):
+            # termina el job en curso de cada hilo y sale
+            if not stopping:
+                stopping.append(signum)
+                self.stdout.write('Deteniendo worker...')
+
+        signal.signal(signal.SIGTERM, shutdown)
+        signal.signal(signal.SIGINT, shutdown)
+
+        worker.start()
+        while not stopping:
+            time.sleep(0.5)
+        worker.stop()
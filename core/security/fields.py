@@ -1,14 +1,19 @@
 from datetime import datetime
 
+from django.conf import settings
 from django.db import models, connection
 
+from config.shared.helpers.request_context_helper import get_request_context
+
 
 def file_upload_path(instance, filename, scheme, folder):
     current_date = datetime.now()
     if folder is None:
         folder = type(instance).__name__.lower()
     if not scheme:
-        scheme = connection.schema_name
+        tenant_info = get_request_context().tenant
+        scheme = tenant_info.schema_name if tenant_info else getattr(
+            connection, 'schema_name', settings.DEFAULT_SCHEMA)
     return f'{scheme}/{folder}/{current_date.year}/{current_date.month}/{current_date.day}/{filename}'
 
 
@@ -6,6 +6,7 @@ from django.db import models
 from django.forms import model_to_dict
 
 from config import settings
+from config.shared.helpers.request_netinfo import get_user_agent
 from core.security.fields import CustomImageField
 from core.user.models import User
 
@@ -149,7 +150,7 @@ class UserAccess(models.Model):
              update_fields=None):
         try:
             request = get_current_request()
-            self.http_user_agent = str(request.user_agent)
+            self.http_user_agent = str(get_user_agent(request))
             self.remote_addr = request.META.get('REMOTE_ADDR', None)
         except:
             pass
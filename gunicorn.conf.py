@@ -0,0 +1,45 @@
+# gunicorn lee este archivo automáticamente desde el directorio de trabajo
+import os
+
+wsgi_app = os.getenv('GUNICORN_WSGI_APP', 'config.wsgi:application')
+worker_class = os.getenv('GUNICORN_WORKER_CLASS', 'sync')
+threads = int(os.getenv('GUNICORN_THREADS', '1'))
+preload_app = os.getenv('GUNICORN_PRELOAD', 'false').lower() == 'true'
+# métricas de prometheus_client compartidas entre workers (modo multiproceso)
+prometheus_multiproc_dir = os.getenv('PROMETHEUS_MULTIPROC_DIR')
+
+
+def on_starting(server):
+    # valores de una ejecución anterior (pids que ya no existen)
+    if prometheus_multiproc_dir and os.path.isdir(prometheus_multiproc_dir):
+        for name in os.listdir(prometheus_multiproc_dir):
+            if name.endswith('.db'):
+                os.remove(os.path.join(prometheus_multiproc_dir, name))
+
+
+def when_ready(server):
+    # pre-fork: con preload_app la app ya está cargada en el master; se
+    # precalienta todo menos las conexiones (no se heredan entre procesos)
+    if preload_app and os.getenv('WORKER_WARMUP', 'true').lower() == 'true':
+        from config.shared.helpers.warmup_helper import WarmupStaticHelper
+        WarmupStaticHelper.run(open_connections=False, observe=False)
+
+
+def post_worker_init(worker):
+    # post-fork: la app ya está cargada en el worker, antes de aceptar requests.
+    # Las conexiones de Django son por thread: abrirlas aquí solo sirve si el
+    # request corre en este mismo thread (worker sync con threads=1). Con
+    # gthread (threads>1) o gevent cada thread/greenlet abre la suya y solo se
+    # precalientan los clientes compartidos por el proceso (cache, ES).
+    if os.getenv('WORKER_WARMUP', 'true').lower() == 'true':
+        from config.shared.helpers.warmup_helper import WarmupStaticHelper
+        WarmupStaticHelper.run(
+            open_connections=True,
+            db_connections=threads == 1 and worker_class == 'sync',
+        )
+
+
+def child_exit(server, worker):
+    if prometheus_multiproc_dir:
+        from prometheus_client import multiprocess
+        multiprocess.mark_process_dead(worker.pid)
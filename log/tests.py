@@ -0,0 +1,77 @@
+import uuid
+from datetime import datetime, timezone
+
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from config.shared.helpers.query_instrumentation_helper import assert_query_budget
+from config.shared.serializers.compiled_serializer import get_compiled_serializer
+from log.models.role_model import Role
+from log.serializers.role_serializers import RoleLimitResponseSerializer, RoleResponseSerializer
+from users.models import Usuario
+
+
+class RoleCompiledSerializerParityTests(SimpleTestCase):
+    """ El plan compilado produce lo mismo que Serializer.to_representation de DRF """
+
+    def setUp(self):
+        created_at = datetime(2024, 5, 1, 12, 30, tzinfo=timezone.utc)
+        self.roles = [
+            Role(id=1, uuid=uuid.uuid4(), name='Administrador', code='ADMIN',
+                 description='Acceso total', state=True, created_at=created_at, modified_at=created_at),
+            Role(id=2, uuid=uuid.uuid4(), name='', code='VEND',
+                 description='Vendedor', state=False, created_at=created_at, modified_at=None),
+        ]
+
+    def assertParity(self, serializer_class):
+        compiled = get_compiled_serializer(serializer_class)
+        self.assertIsNotNone(compiled)
+        expected = [dict(row) for row in serializer_class(self.roles, many=True).data]
+        self.assertEqual(compiled.serialize_many(self.roles), expected)
+
+    def test_role_response_serializer(self):
+        self.assertParity(RoleResponseSerializer)
+
+    def test_role_limit_response_serializer(self):
+        self.assertParity(RoleLimitResponseSerializer)
+
+
+# ---------------------------
+# presupuesto de queries de los endpoints
+# ---------------------------
+@override_settings(CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}})
+class RoleEndpointQueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        Role.objects.bulk_create(
+            Role(name=f'Rol {index}', code=f'R{index}', description=f'Rol {index}') for index in range(30))
+        cls.user = Usuario.objects.create_superuser(email='admin@example.com', password='x', username='admin')
+
+    def setUp(self):
+        self.user.state = True  # Usuario no tiene el campo; IsActiveUser lo exige
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list(self):
+        # count + página, sin queries por fila
+        with assert_query_budget(max_queries=2, max_repeated=1):
+            response = self.client.get('/api/v1/role/', {'page_size': 20})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()['data']['items']), 20)
+        # la segunda lectura sale de cache
+        with assert_query_budget(max_queries=0):
+            self.client.get('/api/v1/role/', {'page_size': 20})
+
+    def test_retrieve_by_uuid(self):
+        role = Role.objects.first()
+        with assert_query_budget(max_queries=1):
+            response = self.client.get(f'/api/v1/role/{role.uuid}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['uuid'], str(role.uuid))
+
+    def test_export_streams_in_bounded_queries(self):
+        with assert_query_budget(max_queries=2, max_repeated=1):
+            response = self.client.get('/api/v1/role/', {'export': 'csv'})
+            body = b''.join(response.streaming_content)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(body.decode().strip().splitlines()), 31)
@@ -3,7 +3,7 @@ from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
 
-from config.shared.di.di import container
+from config.shared.di.di import resolve
 from config.shared.views.general_view import (
     GenericAPIViewService,
     BaseUpdateView,
@@ -27,7 +27,7 @@ class RoleView(GenericAPIViewService):
 
     # constructor: DI
     def __init__(self):
-        role_service = container.role_service()
+        role_service = resolve('role_service')
         super().__init__(role_service)
 
     @swagger_auto_schema(
@@ -57,7 +57,7 @@ class RoleDetailView(BaseUpdateView):
 
     # constructor: DI
     def __init__(self):
-        role_service = container.role_service()
+        role_service = resolve('role_service')
         super().__init__(role_service)
 
     @swagger_auto_schema(
@@ -75,7 +75,7 @@ class RoleDetailView(BaseUpdateView):
 class RoleDetailViewByUuid(BaseRetrieveUuidView):
     # constructor: DI
     def __init__(self):
-        role_service = container.role_service()
+        role_service = resolve('role_service')
         super().__init__(role_service)
 
     @swagger_auto_schema(
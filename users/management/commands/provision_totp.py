@@ -0,0 +1,55 @@
+import time
+
+import orjson
+from django.core.management.base import BaseCommand, CommandError
+
+from config.shared.di.di import resolve
+from users.services.totp_service import provision_executor
+
+
+class Command(BaseCommand):
+    help = ('Aprovisiona TOTP para muchos usuarios (pool de procesos + bulk_update) y escribe '
+            'secret/QR/backup codes en un archivo JSONL para distribuirlos')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', required=True,
+                            help='Archivo JSONL de salida (contiene secretos: tratar como sensible)')
+        parser.add_argument('--usernames', default=None,
+                            help='Archivo con un username por línea; por defecto todos sin TOTP')
+        parser.add_argument('--qr-format', choices=['png', 'svg'], default='png')
+        parser.add_argument('--workers', type=int, default=None,
+                            help='Procesos del pool (1 = en línea); por defecto TOTP_PROVISION_WORKERS')
+        parser.add_argument('--batch-size', type=int, default=1000,
+                            help='Usuarios por lote (un bulk_update por lote)')
+
+    def handle(self, *args, **options):
+        svc = resolve('totp_service')
+        queryset = svc.user_repository.model.objects.filter(
+            totp_enabled=False, is_active=True).order_by('id')
+        if options['usernames']:
+            with open(options['usernames'], encoding='utf-8') as usernames_file:
+                usernames = [line.strip() for line in usernames_file if line.strip()]
+            queryset = queryset.filter(username__in=usernames)
+
+        users = list(queryset)
+        if not users:
+            raise CommandError('No hay usuarios para aprovisionar')
+
+        start, total = time.perf_counter(), 0
+        # un solo pool para toda la corrida: los lotes reutilizan los procesos ya inicializados
+        executor = provision_executor(options['workers']) if options['workers'] != 1 else None
+        try:
+            with open(options['output'], 'wb') as output:
+                for index in range(0, len(users), options['batch_size']):
+                    batch = users[index:index + options['batch_size']]
+                    for item in svc.bulk_provision(batch, qr_format=options['qr_format'], executor=executor):
+                        output.write(orjson.dumps(item) + b'\n')
+                        total += 1
+                    self.stdout.write(f'{total}/{len(users)}')
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(
+            f'{total} usuarios aprovisionados en {elapsed:.1f}s ({total / elapsed:.1f}/s)'))
@@ -7,8 +7,8 @@ class AuthRepository():
     custom_group_repository = CustomGroupRepository
 
     def __init__(self):
-        from config.shared.di.di import container
-        self.custom_group_repository = container.custom_group_repository()
+        from config.shared.di.di import resolve
+        self.custom_group_repository = resolve('custom_group_repository')
 
     def find_all_groups(self, order_by="id"):
         queryset = Group.objects.all()
@@ -30,3 +30,19 @@ class TOTPStatusResponseSerializer(serializers.Serializer):
 
 class TOTPBackupRegenerateResponseSerializer(serializers.Serializer):
     backup_codes = serializers.ListField(child=serializers.CharField())
+
+
+class TOTPBulkProvisionSerializer(serializers.Serializer):
+    user_ids = serializers.ListField(
+        child=serializers.IntegerField(), min_length=1, max_length=5000)
+    qr_format = serializers.ChoiceField(choices=["png", "svg"], default="png")
+
+
+class TOTPBulkProvisionItemSerializer(serializers.Serializer):
+    user_id = serializers.IntegerField()
+    username = serializers.CharField()
+    secret = serializers.CharField()
+    provisioning_uri = serializers.CharField()
+    qr = serializers.CharField()
+    qr_format = serializers.CharField()
+    backup_codes = serializers.ListField(child=serializers.CharField())
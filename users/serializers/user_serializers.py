@@ -47,12 +47,12 @@ class BaseUserSerializer(serializers.Serializer):
 
 
 class UserCreateSerializer(BaseUserSerializer):
-    def __init__(self, *args, **kwargs):
-        super(UserCreateSerializer, self).__init__(*args, **kwargs)
-        # ## DI
+    @property
+    def user_repository(self):
+        # ## DI (resuelto una vez por proceso)
         # to avoid circular imports
-        from config.shared.di.di import container
-        self.user_repository = container.user_repository()
+        from config.shared.di.di import resolve
+        return resolve('user_repository')
 
     # creation validation
     def validate_username(self, value):
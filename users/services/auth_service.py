@@ -21,16 +21,10 @@ from config.shared.constants.constants import (
 )
 from users.shared.constants.system_modules import system_modules_sidenav
 
-from webhooks.services.auditoria_log_service import ESLogService
-
 from types import SimpleNamespace
 
 
-import environ
-import os
-from config import settings
-env = environ.Env()
-environ.Env.read_env(os.path.join(settings.BASE_DIR, '.env'))
+from config.shared.constants.envs_constants import env
 
 
 class AuthService():
@@ -281,8 +275,12 @@ class AuthService():
             try:
                 if username not in no_user_log_es:
                     req.user = user
-                    ESLogService(timeout=3).write_sync_from_request(
+                    # el documento se arma con el request; la escritura en ES va al worker
+                    from webhooks.services.auditoria_log_service import get_es_log_service
+                    from webhooks.tasks import index_audit_document
+                    document = get_es_log_service().build_document_from_request(
                         req, payload)
+                    index_audit_document.delay(document)
             finally:
                 req.user = original_user
 
@@ -1,24 +1,147 @@
 import io
+import atexit
 import base64
-import qrcode
+import hashlib
+import multiprocessing
+import secrets
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import orjson
+from django.conf import settings
+from django.core.cache import cache
+
 from config.shared.exceptions.bad_request_exception import BadRequestException
 from config.shared.exceptions.unauthorized_exception import UnauthorizedException
+from users.services.totp_verifier import TOTPVerifier
+
+
+QR_FORMATS = ('png', 'svg')
+BULK_UPDATE_BATCH_SIZE = 500
+
+
+def render_qr(data: str, qr_format: str = 'png') -> str:
+    """ PNG en base64 o SVG (path único, más compacto y sin PIL) """
+    import qrcode  # diferido: PIL + qrcode solo al generar el QR
+    qr = qrcode.QRCode(version=1, box_size=6, border=3)
+    qr.add_data(data)
+    qr.make(fit=True)
+    buf = io.BytesIO()
+    if qr_format == 'svg':
+        from qrcode.image.svg import SvgPathImage
+        qr.make_image(image_factory=SvgPathImage).save(buf)
+        return buf.getvalue().decode()
+    img = qr.make_image(fill_color="black", back_color="white")
+    img.save(buf, format="PNG")
+    return base64.b64encode(buf.getvalue()).decode()
+
+
+def _provision_user(args):
+    """
+    Corre en los procesos del pool: secret + URI + QR + backup codes con los
+    métodos del modelo sobre una instancia transitoria (sin tocar la BD).
+    """
+    from users.models.usuario_model import Usuario
+    user_id, username, email, issuer, qr_format, backup_count = args
+    user = Usuario(pk=user_id, username=username, email=email)
+    user.generate_totp_secret()
+    uri = user.get_totp_uri(issuer=issuer)
+    backup_plaintext = user.generate_backup_codes(n=backup_count)
+    return {
+        "user_id": user_id,
+        "username": username,
+        "secret": user.totp_secret,
+        "provisioning_uri": uri,
+        "qr": render_qr(uri, qr_format),
+        "qr_format": qr_format,
+        "backup_codes": backup_plaintext,
+        "backup_hashes": user.totp_backup_hashes,
+    }
+
+
+def _init_worker():
+    import django
+    django.setup()
+
+
+def provision_executor(max_workers=None):
+    """
+    Pool 'spawn' para bulk_provision. Arrancarlo cuesta un django.setup() por
+    proceso: se crea una vez (por corrida del comando / por proceso del worker)
+    y se pasa a cada llamada.
+    """
+    return ProcessPoolExecutor(max_workers=max_workers or getattr(settings, 'TOTP_PROVISION_WORKERS', None),
+                               mp_context=multiprocessing.get_context('spawn'),
+                               initializer=_init_worker)
+
+
+_shared_executor = None
+_shared_executor_lock = threading.Lock()
+
+
+def shared_provision_executor():
+    """ Pool del proceso (worker de jobs), creado al primer uso; None = en línea (TOTP_PROVISION_WORKERS=1) """
+    global _shared_executor
+    if getattr(settings, 'TOTP_PROVISION_WORKERS', None) == 1:
+        return None
+    if _shared_executor is None:
+        with _shared_executor_lock:
+            if _shared_executor is None:
+                _shared_executor = provision_executor()
+                atexit.register(_shared_executor.shutdown)
+    return _shared_executor
+
+
+# ---------------------------
+# descarga única del aprovisionamiento masivo
+# ---------------------------
+def _provision_download_key(owner_id, download_id):
+    # el dueño va en la key: otro usuario con el mismo download_id no la encuentra ni la consume
+    return f'totp_provision:{owner_id}:{download_id}'
+
+
+def store_provision_download(owner_id, items, client=None):
+    """
+    Guarda el resultado en claro (secrets, QR, backup codes) fuera del job, con
+    TTL corto (TOTP_PROVISION_DOWNLOAD_TTL), y retorna el download_id.
+    Solo `owner_id` puede descargarlo, una vez (pop_provision_download).
+    """
+    if client is None:
+        from django_redis import get_redis_connection
+        client = get_redis_connection('default')
+    download_id = secrets.token_urlsafe(32)
+    client.set(_provision_download_key(owner_id, download_id), orjson.dumps(items),
+               ex=getattr(settings, 'TOTP_PROVISION_DOWNLOAD_TTL', 900))
+    return download_id
+
+
+def pop_provision_download(owner_id, download_id, client=None):
+    """ Lee y borra en una transacción (MULTI): la segunda lectura retorna None """
+    if client is None:
+        from django_redis import get_redis_connection
+        client = get_redis_connection('default')
+    pipe = client.pipeline(transaction=True)
+    key = _provision_download_key(owner_id, download_id)
+    pipe.get(key)
+    pipe.delete(key)
+    raw, _ = pipe.execute()
+    return orjson.loads(raw) if raw is not None else None
 
 
 class TOTPService:
-    def __init__(self, user_repository, issuer="S360 ERP"):
+    def __init__(self, user_repository, issuer="S360 ERP", verifier=None):
         self.user_repository = user_repository
         self.issuer = issuer
+        self.verifier = verifier or TOTPVerifier()
 
     def _qrcode_b64(self, data: str) -> str:
-        qr = qrcode.QRCode(version=1, box_size=6, border=3)
-        qr.add_data(data)
-        qr.make(fit=True)
-        img = qr.make_image(fill_color="black", back_color="white")
-        buf = io.BytesIO()
-        img.save(buf, format="PNG")
-        buf.seek(0)
-        return base64.b64encode(buf.getvalue()).decode()
+        # cache corta: reintentos de setup_init no vuelven a renderizar (la key no expone el secret)
+        cache_key = f"totp_qr_{hashlib.sha256(data.encode()).hexdigest()}"
+        qr_b64 = cache.get(cache_key)
+        if qr_b64 is None:
+            qr_b64 = render_qr(data, 'png')
+            cache.set(cache_key, qr_b64, getattr(settings, 'TOTP_QR_CACHE_TTL', 300))
+        return qr_b64
 
     def setup_init(self, user):
         if user.totp_enabled:
@@ -32,22 +155,22 @@ class TOTPService:
         qr_b64 = self._qrcode_b64(uri)
         return {"secret": user.totp_secret, "provisioning_uri": uri, "qr_png_base64": qr_b64}
 
-    def setup_confirm(self, user, token: str, valid_window: int = 1):
+    def setup_confirm(self, user, token: str, valid_window: int = 1, ip: str | None = None):
         if user.totp_enabled:
             raise BadRequestException("TOTP ya está habilitado.")
-        ok, ts = user.verify_totp(token, valid_window=valid_window)
+        # totp_last_ts se persiste en segundo plano (TOTPVerifier)
+        ok, _ = self.verifier.verify(user, token, ip=ip, valid_window=valid_window)
         if not ok:
             raise BadRequestException("Código TOTP inválido.")
         # habilitar y generar backups
         user.totp_enabled = True
-        user.totp_last_ts = ts
-        backup_plaintext = user.generate_backup_codes(
+        # si el aprovisionamiento masivo ya entregó backup codes, se conservan
+        backup_plaintext = [] if user.totp_backup_hashes else user.generate_backup_codes(
             n=10)  # guarda hashes internamente
-        user.save(update_fields=["totp_enabled",
-                  "totp_last_ts", "totp_backup_hashes"])
+        user.save(update_fields=["totp_enabled", "totp_backup_hashes"])
         return backup_plaintext
 
-    def disable(self, user, password: str, token: str | None, backup_token: str | None):
+    def disable(self, user, password: str, token: str | None, backup_token: str | None, ip: str | None = None):
         if not user.totp_enabled:
             raise BadRequestException("TOTP no está habilitado.")
         if not user.check_password(password):
@@ -55,7 +178,7 @@ class TOTPService:
 
         verified = False
         if token:
-            ok, _ = user.verify_totp(token)
+            ok, _ = self.verifier.verify(user, token, ip=ip)
             verified = ok
         elif backup_token:
             verified = user.verify_backup_code(backup_token)
@@ -70,6 +193,7 @@ class TOTPService:
         user.totp_backup_hashes = []
         user.save(update_fields=[
                   "totp_enabled", "totp_secret", "totp_last_ts", "totp_backup_hashes"])
+        self.verifier.forget(user.pk)
         return True
 
     def status(self, user):
@@ -85,3 +209,37 @@ class TOTPService:
         new_plain = user.generate_backup_codes(n=10)
         user.save(update_fields=["totp_backup_hashes"])
         return new_plain
+
+    # ---------------------------
+    # aprovisionamiento masivo
+    # ---------------------------
+    def bulk_provision(self, users, qr_format: str = 'png', executor=None, backup_count: int = 10):
+        """
+        Secrets, QR y backup codes para muchos usuarios (olas de onboarding):
+        el render del QR y el hash de los backup codes (CPU) corren en `executor`
+        (ver provision_executor; None = en línea) y todo se persiste con un solo bulk_update.
+        TOTP queda deshabilitado hasta que cada usuario confirme (setup_confirm).
+        Retorna los datos en claro para entregar a cada usuario, una sola vez.
+        """
+        if qr_format not in QR_FORMATS:
+            raise BadRequestException(f"Formato de QR inválido: {qr_format}")
+        users = [user for user in users if not user.totp_enabled]
+        if not users:
+            return []
+
+        jobs = [(user.pk, user.username, user.email, self.issuer, qr_format, backup_count)
+                for user in users]
+        if executor is None or len(jobs) == 1:
+            results = [_provision_user(job) for job in jobs]
+        else:
+            results = list(executor.map(_provision_user, jobs,
+                                        chunksize=max(1, len(jobs) // 32)))
+
+        by_id = {user.pk: user for user in users}
+        for result in results:
+            user = by_id[result["user_id"]]
+            user.totp_secret = result["secret"]
+            user.totp_backup_hashes = result.pop("backup_hashes")
+        self.user_repository.model.objects.bulk_update(
+            users, ["totp_secret", "totp_backup_hashes"], batch_size=BULK_UPDATE_BATCH_SIZE)
+        return results
@@ -0,0 +1,132 @@
+import hmac
+import time
+
+from django.conf import settings
+from rest_framework import status
+
+from config.shared.exceptions.custom_generic_exception import CustomGenericException
+
+
+# consume el time-step solo si es mayor al último usado: SETNX por usuario con orden,
+# atómico en Redis (dos verificaciones simultáneas del mismo código: solo una gana)
+CONSUME_STEP_SCRIPT = """
+local last = tonumber(redis.call('GET', KEYS[1]) or '-1')
+if tonumber(ARGV[1]) <= last then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[1], 'EX', ARGV[2])
+return 1
+"""
+
+# INCR + EXPIRE en un solo paso: si el proceso muere entre ambos, la key no queda
+# sin TTL (bloqueo permanente). También repara keys que hayan quedado sin TTL.
+INCR_ATTEMPTS_SCRIPT = """
+local counts = {}
+for i, key in ipairs(KEYS) do
+    counts[i] = redis.call('INCR', key)
+    if redis.call('TTL', key) < 0 then
+        redis.call('EXPIRE', key, ARGV[1])
+    end
+end
+return counts
+"""
+
+
+class TOTPVerifier:
+    """
+    Verificación TOTP sin escrituras en la BD en el camino del request:
+    - el código se compara en memoria (pyotp + hmac.compare_digest) contra la ventana;
+    - el (usuario, time-step) consumido se registra en Redis de forma atómica:
+      un código no se puede reutilizar, ni uno más viejo que el último usado;
+    - intentos limitados por usuario e IP (contadores con TTL en Redis);
+    - totp_last_ts se persiste en un job (users.tasks.persist_totp_last_ts) y
+      sigue siendo el respaldo si Redis pierde las keys.
+    """
+
+    def __init__(self, client=None):
+        self._client = client
+        self._consume_step = None
+        self._incr_attempts = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            # import diferido: django_redis solo al verificar
+            from django_redis import get_redis_connection
+            self._client = get_redis_connection('default')
+        return self._client
+
+    @property
+    def interval(self):
+        return getattr(settings, 'TOTP_INTERVAL', 30)
+
+    # ---------------------------
+    # rate limit
+    # ---------------------------
+    def check_rate_limit(self, user_id, ip=None):
+        window = getattr(settings, 'TOTP_RATE_LIMIT_WINDOW', 300)
+        limits = [(f'totp_attempts:user:{user_id}', getattr(settings, 'TOTP_RATE_LIMIT_USER', 5))]
+        if ip:
+            limits.append((f'totp_attempts:ip:{ip}', getattr(settings, 'TOTP_RATE_LIMIT_IP', 30)))
+
+        if self._incr_attempts is None:
+            self._incr_attempts = self.client.register_script(INCR_ATTEMPTS_SCRIPT)
+        counts = self._incr_attempts(keys=[key for key, _ in limits], args=[window])
+
+        for (_, limit), count in zip(limits, counts):
+            if count > limit:
+                raise CustomGenericException(
+                    "Demasiados intentos de verificación. Intente más tarde.",
+                    status=status.HTTP_429_TOO_MANY_REQUESTS)
+
+    def reset_attempts(self, user_id):
+        self.client.delete(f'totp_attempts:user:{user_id}')
+
+    # ---------------------------
+    # verificación
+    # ---------------------------
+    def match_step(self, secret, token, valid_window=1):
+        """ time-step (contador) que genera `token` dentro de la ventana, o None """
+        import pyotp
+        totp = pyotp.TOTP(secret, interval=self.interval)
+        token = str(token).strip().replace(' ', '')
+        current = int(time.time()) // self.interval
+        matched = None
+        for step in range(current - valid_window, current + valid_window + 1):
+            # sin early return: mismo costo acierte o no
+            if hmac.compare_digest(totp.generate_otp(step), token):
+                matched = step
+        return matched
+
+    def consume_step(self, user_id, step, valid_window=1):
+        if self._consume_step is None:
+            self._consume_step = self.client.register_script(CONSUME_STEP_SCRIPT)
+        # basta con recordar el step mientras el código siga dentro de la ventana
+        ttl = (2 * valid_window + 2) * self.interval
+        return bool(self._consume_step(keys=[f'totp_last_step:{user_id}'], args=[step, ttl]))
+
+    def verify(self, user, token, ip=None, valid_window=1):
+        """ Retorna (ok, ts) como user.verify_totp; ts = inicio del time-step usado """
+        self.check_rate_limit(user.pk, ip)
+        if not user.totp_secret or not token:
+            return False, None
+
+        step = self.match_step(user.totp_secret, token, valid_window)
+        if step is None:
+            return False, None
+
+        ts = step * self.interval
+        if user.totp_last_ts is not None and ts <= user.totp_last_ts:
+            return False, None
+        if not self.consume_step(user.pk, step, valid_window):
+            return False, None
+
+        self.reset_attempts(user.pk)
+        from users.tasks import persist_totp_last_ts
+        persist_totp_last_ts.delay(user.pk, ts)
+        user.totp_last_ts = ts
+        return True, ts
+
+    def forget(self, user_id):
+        """ Al deshabilitar TOTP: el próximo secret empieza sin steps consumidos """
+        self.client.delete(f'totp_last_step:{user_id}')
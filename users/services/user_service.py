@@ -89,31 +89,13 @@ class UserService(BaseServiceAllMixin):
 
     # @Override
     def find_all(self, filter_params=None, page_number=..., page_size=...):
-        queryset = self.find_all_mx(self.filter, filter_params)
+        queryset = self.find_all_queryset(filter_params)
         paginated_data = self.paginate_queryset(
             queryset, page_number, page_size)
         serialized_data_list = self.serialize(
             paginated_data["page_obj"], many=True)
-
-        # serialize employee if exists ------------
-        transformed_data = []
-        try:
-            for item in list(serialized_data_list or []):
-                # service already serialized employee
-                employee = self.employee_service.find_one_by_attr(
-                    'user_id', item['id'])
-                transformed_data.append({
-                    'user': item,
-                    'employee': employee,
-                })
-        except Exception as e:
-            if isinstance(e, ResourceNotFoundException):
-                transformed_data = [
-                    {'user': item, 'employee': None}
-                    for item in list(serialized_data_list or [])
-                ]
-            else:
-                raise e
+        transformed_data = self.find_all_post_serializer(
+            serialized_data_list, filter_params)
 
         return {
             "meta": {
@@ -125,6 +107,18 @@ class UserService(BaseServiceAllMixin):
             "data": transformed_data,
         }
 
+    # @Override
+    def export_header(self):
+        # find_all_post_serializer envuelve cada fila: {user, employee}
+        return ['user', 'employee']
+
+    # @Override
+    def find_all_post_serializer(self, serialized_data, filter_params=None):
+        # serialize employee if exists: una sola query user_id__in para toda la pagina
+        return self.post_serialize_join(
+            serialized_data, self.employee_service, 'user_id',
+            as_key='employee', wrap_key='user')
+
     def find_one(self, pk) -> dict:
         user_instance = self.repository.find_one(pk)
         if not user_instance:
@@ -0,0 +1,29 @@
+from django.db.models import Q
+
+from config.shared.di.di import resolve
+from config.shared.services.common.job_queue import job
+from users.models.usuario_model import Usuario
+from users.services.totp_service import shared_provision_executor, store_provision_download
+
+
+@job(queue='default', max_retries=5, backoff=2)
+def persist_totp_last_ts(user_id, ts):
+    """ Solo avanza: un job atrasado (reintento) nunca retrocede totp_last_ts """
+    updated = Usuario.objects.filter(pk=user_id).filter(
+        Q(totp_last_ts__isnull=True) | Q(totp_last_ts__lt=ts)).update(totp_last_ts=ts)
+    return {'updated': bool(updated)}
+
+
+@job(queue='default', max_retries=1)
+def bulk_provision_totp(user_ids, qr_format='png', requested_by=None):
+    """
+    Aprovisionamiento masivo desde el API. Los secrets, QR y backup codes en claro
+    no van en el resultado del job (queda en Redis hasta JOB_RESULT_TTL): se guardan
+    para una descarga única de `requested_by` (store_provision_download) y el job
+    solo retorna el download_id. Un reintento genera secrets nuevos (TOTP sigue
+    deshabilitado hasta setup_confirm).
+    """
+    svc = resolve('totp_service')
+    users = Usuario.objects.filter(id__in=user_ids).order_by('id')
+    items = svc.bulk_provision(users, qr_format=qr_format, executor=shared_provision_executor())
+    return {'provisioned': len(items), 'download_id': store_provision_download(requested_by, items)}
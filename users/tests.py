@@ -0,0 +1,308 @@
+import threading
+from types import SimpleNamespace
+from unittest import mock
+
+from django.contrib.auth.models import Permission
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from config.shared.serializers.compiled_serializer import get_compiled_serializer
+from config.shared.services.common.job_queue import job_queue
+from config.shared.views.job_status_view import JobStatusView
+from users.models.custom_group_model import CustomGroup
+from users.models.usuario_model import Usuario
+from users.serializers.custom_group_serializers import (
+    CustomGroupLimitResponseSerializer,
+    CustomGroupResponseSerializer,
+)
+from users.serializers.user_serializers import UserResponseSerializer
+from config.shared.exceptions.custom_generic_exception import CustomGenericException
+from users.services.totp_service import TOTPService
+from users.services.totp_verifier import TOTPVerifier
+from users.tasks import bulk_provision_totp
+from users.views.totp_views import TOTPBulkProvisionDownloadView, TOTPBulkProvisionView
+
+
+class CompiledSerializerParityTests(TestCase):
+    """ El plan compilado produce lo mismo que Serializer.to_representation de DRF """
+
+    @classmethod
+    def setUpTestData(cls):
+        permissions = list(Permission.objects.order_by('id')[:3])
+        cls.sales = CustomGroup.objects.create(
+            name='Ventas', codigo='VEN', description='Vendedores', system_modules=['billing'])
+        cls.sales.permissions.set(permissions)
+        cls.empty = CustomGroup.objects.create(name='Sin permisos', codigo='SP')
+
+        cls.admin = Usuario.objects.create_user(
+            email='admin@example.com', password='x', username='admin', razon_social='Admin S.A.')
+        cls.admin.groups.set([cls.sales, cls.empty])
+        cls.admin.user_permissions.set(permissions[:1])
+        cls.plain = Usuario.objects.create_user(
+            email='plain@example.com', password='x', username='plain')
+
+    def assertParity(self, serializer_class, queryset):
+        instances = list(queryset)
+        compiled = get_compiled_serializer(serializer_class)
+        self.assertIsNotNone(compiled)
+        expected = [dict(row) for row in serializer_class(instances, many=True).data]
+        self.assertEqual(compiled.serialize_many(instances), expected)
+
+    def test_user_response_serializer(self):
+        self.assertParity(UserResponseSerializer, Usuario.objects.order_by('id'))
+
+    def test_custom_group_response_serializer(self):
+        self.assertParity(CustomGroupResponseSerializer, CustomGroup.objects.order_by('id'))
+
+    def test_custom_group_limit_response_serializer(self):
+        self.assertParity(CustomGroupLimitResponseSerializer, CustomGroup.objects.order_by('id'))
+
+
+# ---------------------------
+# aprovisionamiento masivo de TOTP
+# ---------------------------
+class RecordingExecutor:
+    """ executor en línea que registra las llamadas """
+
+    def __init__(self):
+        self.calls = 0
+
+    def map(self, func, iterable, chunksize=1):
+        self.calls += 1
+        return map(func, iterable)
+
+
+def fake_provision(args):
+    user_id, username = args[:2]
+    return {'user_id': user_id, 'username': username, 'secret': f'S{user_id}', 'backup_hashes': [f'h{user_id}']}
+
+
+class TOTPBulkProvisionTests(SimpleTestCase):
+    def build_service(self):
+        self.bulk_update = mock.Mock()
+        model = type('Model', (), {'objects': type('Manager', (), {'bulk_update': self.bulk_update})()})
+        return TOTPService(user_repository=type('Repository', (), {'model': model})())
+
+    def build_users(self, count):
+        return [SimpleNamespace(pk=index, username=f'user{index}', email=f'user{index}@example.com',
+                                totp_enabled=False, totp_secret=None, totp_backup_hashes=[])
+                for index in range(count)]
+
+    @mock.patch('users.services.totp_service._provision_user', fake_provision)
+    def test_bulk_provision_reuses_given_executor(self):
+        svc, executor = self.build_service(), RecordingExecutor()
+        users = self.build_users(5)
+        first = svc.bulk_provision(users[:3], qr_format='svg', executor=executor)
+        second = svc.bulk_provision(users[3:], qr_format='svg', executor=executor)
+        self.assertEqual(executor.calls, 2)
+        self.assertEqual([item['user_id'] for item in first + second], [0, 1, 2, 3, 4])
+        self.assertNotIn('backup_hashes', first[0])
+        self.assertEqual([user.totp_secret for user in users], ['S0', 'S1', 'S2', 'S3', 'S4'])
+        self.assertEqual(self.bulk_update.call_count, 2)
+
+    @mock.patch('users.services.totp_service._provision_user', fake_provision)
+    def test_bulk_provision_without_executor_runs_inline(self):
+        users = self.build_users(2)
+        results = self.build_service().bulk_provision(users, executor=None)
+        self.assertEqual(len(results), 2)
+
+    def test_view_enqueues_job(self):
+        request = APIRequestFactory().post(
+            '/totp/bulk-provision/', {'user_ids': [3, 1, 2], 'qr_format': 'svg'}, format='json')
+        force_authenticate(request, user=SimpleNamespace(pk=7, is_authenticated=True, is_staff=True))
+        with mock.patch('users.views.totp_views.bulk_provision_totp') as task:
+            task.delay.return_value = 'job-1'
+            response = TOTPBulkProvisionView.as_view()(request)
+        self.assertEqual(response.status_code, 202, response.data)
+        self.assertEqual(response.data['data'], {'job_id': 'job-1'})
+        task.delay.assert_called_once_with([3, 1, 2], qr_format='svg', requested_by=7)
+
+    def test_job_uses_shared_executor(self):
+        svc, executor = mock.Mock(), RecordingExecutor()
+        svc.bulk_provision.return_value = []
+        with mock.patch('users.tasks.resolve', return_value=svc), \
+                mock.patch('users.tasks.shared_provision_executor', return_value=executor), \
+                mock.patch('users.tasks.store_provision_download', return_value='d-1'):
+            bulk_provision_totp([1, 2], qr_format='svg')
+        users, = svc.bulk_provision.call_args.args
+        self.assertEqual(svc.bulk_provision.call_args.kwargs, {'qr_format': 'svg', 'executor': executor})
+        self.assertIn('IN (1, 2)', str(users.query))
+
+
+def api_user(pk, is_staff=False):
+    return SimpleNamespace(pk=pk, id=pk, is_authenticated=True, is_staff=is_staff, state=True)
+
+
+class TOTPBulkProvisionSecretsTests(SimpleTestCase):
+    """ el plaintext no queda en el resultado del job: descarga única del admin que lo encoló """
+    admin = api_user(7, is_staff=True)
+    items = [{'user_id': 1, 'username': 'user1', 'secret': 'JBSWY3DPEHPK3PXP', 'backup_codes': ['12345678']}]
+
+    def setUp(self):
+        self.job_ids = []
+
+    def tearDown(self):
+        job_queue.client.delete('jobs:queue:tests-totp', *(f'jobs:job:{job_id}' for job_id in self.job_ids),
+                                *job_queue.client.scan_iter(f'totp_provision:{self.admin.pk}:*'))
+
+    def run_job(self):
+        job_id = job_queue.enqueue(bulk_provision_totp, args=([1],), kwargs={'requested_by': self.admin.pk},
+                                   queue='tests-totp', owner_id=self.admin.pk)
+        self.job_ids.append(job_id)
+        svc = mock.Mock()
+        svc.bulk_provision.return_value = [dict(item) for item in self.items]
+        with mock.patch('users.tasks.resolve', return_value=svc), \
+                mock.patch('users.tasks.shared_provision_executor', return_value=None):
+            job_queue.execute(job_id)
+        return job_id
+
+    def read_job(self, user, job_id):
+        request = APIRequestFactory().get(f'/api/v1/jobs/{job_id}/')
+        force_authenticate(request, user=user)
+        return JobStatusView.as_view()(request, job_id=job_id)
+
+    def download(self, user, download_id):
+        request = APIRequestFactory().get(f'/totp/bulk-provision/{download_id}/')
+        force_authenticate(request, user=user)
+        return TOTPBulkProvisionDownloadView.as_view()(request, download_id=download_id)
+
+    def test_job_result_has_no_secrets(self):
+        job_id = self.run_job()
+        stored = job_queue.status(job_id)
+        self.assertEqual(stored['status'], 'succeeded')
+        self.assertEqual(set(stored['result']), {'provisioned', 'download_id'})
+        self.assertNotIn('JBSWY3DPEHPK3PXP', str(stored))
+        self.assertNotIn('12345678', str(stored))
+
+    def test_non_admin_cannot_read_job_nor_download(self):
+        job_id = self.run_job()
+        self.assertEqual(self.read_job(api_user(8), job_id).status_code, 404)
+        download_id = self.read_job(self.admin, job_id).data['data']['result']['download_id']
+        self.assertEqual(self.download(api_user(8), download_id).status_code, 403)
+        # otro admin tampoco: ni lo encuentra ni consume la descarga del dueño
+        self.assertEqual(self.download(api_user(9, is_staff=True), download_id).status_code, 404)
+        self.assertEqual(self.download(self.admin, download_id).data['data'], self.items)
+
+    def test_download_is_single_use_and_expires(self):
+        job_id = self.run_job()
+        download_id = job_queue.status(job_id)['result']['download_id']
+        key = f'totp_provision:{self.admin.pk}:{download_id}'
+        self.assertTrue(0 < job_queue.client.ttl(key) <= 900)
+        self.assertEqual(self.download(self.admin, download_id).status_code, 200)
+        self.assertEqual(self.download(self.admin, download_id).status_code, 404)
+        self.assertFalse(job_queue.client.exists(key))
+
+
+# ---------------------------
+# rate limit de verificación TOTP
+# ---------------------------
+@override_settings(TOTP_RATE_LIMIT_WINDOW=120, TOTP_RATE_LIMIT_USER=3, TOTP_RATE_LIMIT_IP=10)
+class TOTPRateLimitTests(SimpleTestCase):
+    user_id = 'tests-rate-limit'
+    ip = '203.0.113.9'
+
+    def setUp(self):
+        self.verifier = TOTPVerifier()
+        self.keys = [f'totp_attempts:user:{self.user_id}', f'totp_attempts:ip:{self.ip}']
+        self.verifier.client.delete(*self.keys)
+
+    def tearDown(self):
+        self.verifier.client.delete(*self.keys)
+
+    def test_counters_get_ttl_on_first_attempt(self):
+        self.verifier.check_rate_limit(self.user_id, self.ip)
+        for key in self.keys:
+            self.assertEqual(int(self.verifier.client.get(key)), 1)
+            self.assertTrue(0 < self.verifier.client.ttl(key) <= 120)
+
+    def test_key_left_without_ttl_is_repaired(self):
+        # lo que dejaba un proceso muerto entre INCR y EXPIRE
+        self.verifier.client.set(self.keys[0], 1)
+        self.verifier.check_rate_limit(self.user_id)
+        self.assertTrue(0 < self.verifier.client.ttl(self.keys[0]) <= 120)
+
+    def test_limit_exceeded(self):
+        for _ in range(3):
+            self.verifier.check_rate_limit(self.user_id, self.ip)
+        with self.assertRaises(CustomGenericException):
+            self.verifier.check_rate_limit(self.user_id, self.ip)
+        self.verifier.reset_attempts(self.user_id)
+        self.verifier.check_rate_limit(self.user_id, self.ip)
+
+
+# ---------------------------
+# protección contra replay de códigos TOTP
+# ---------------------------
+@override_settings(TOTP_RATE_LIMIT_USER=100, TOTP_RATE_LIMIT_IP=100)
+class TOTPReplayTests(SimpleTestCase):
+    user_id = 'tests-replay'
+    now = 1_700_000_015
+
+    def setUp(self):
+        import pyotp
+        self.verifier = TOTPVerifier()
+        self.secret = pyotp.random_base32()
+        self.totp = pyotp.TOTP(self.secret, interval=self.verifier.interval)
+        self.step = self.now // self.verifier.interval
+        self.keys = [f'totp_last_step:{self.user_id}', f'totp_attempts:user:{self.user_id}']
+        self.verifier.client.delete(*self.keys)
+        for patcher in (mock.patch('users.services.totp_verifier.time.time', return_value=self.now),
+                        mock.patch('users.tasks.persist_totp_last_ts')):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.verifier.client.delete(*self.keys)
+
+    def user(self, totp_last_ts=None):
+        """ instancia recién leída de la BD (otro request / proceso) """
+        return SimpleNamespace(pk=self.user_id, totp_secret=self.secret, totp_last_ts=totp_last_ts)
+
+    def code(self, step):
+        return self.totp.generate_otp(step)
+
+    def test_same_code_rejected_on_second_verify(self):
+        from users.tasks import persist_totp_last_ts
+        ts = self.step * self.verifier.interval
+        self.assertEqual(self.verifier.verify(self.user(), self.code(self.step)), (True, ts))
+        persist_totp_last_ts.delay.assert_called_once_with(self.user_id, ts)
+        # otro request que leyó el usuario antes de persistir totp_last_ts: lo frena Redis
+        self.assertEqual(self.verifier.verify(self.user(), self.code(self.step)), (False, None))
+
+    def test_same_code_concurrent_verify_only_one_wins(self):
+        threads_count = 8
+        barrier, results = threading.Barrier(threads_count), []
+
+        def worker():
+            verifier = TOTPVerifier()
+            barrier.wait()
+            results.append(verifier.verify(self.user(), self.code(self.step))[0])
+
+        threads = [threading.Thread(target=worker) for _ in range(threads_count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(sorted(results), [False] * (threads_count - 1) + [True])
+
+    def test_older_step_rejected_after_newer(self):
+        self.assertTrue(self.verifier.verify(self.user(), self.code(self.step))[0])
+        # dentro de la ventana (valid_window=1) pero más viejo que el último usado
+        self.assertEqual(self.verifier.verify(self.user(), self.code(self.step - 1)), (False, None))
+        self.assertTrue(self.verifier.verify(self.user(), self.code(self.step + 1))[0])
+
+    def test_db_last_ts_blocks_replay_without_redis_key(self):
+        ok, ts = self.verifier.verify(self.user(), self.code(self.step))
+        self.assertTrue(ok)
+        # Redis perdió la key (flush / failover): queda totp_last_ts persistido por el job
+        self.verifier.client.delete(f'totp_last_step:{self.user_id}')
+        self.assertEqual(self.verifier.verify(self.user(totp_last_ts=ts), self.code(self.step)), (False, None))
+        self.assertEqual(self.verifier.verify(self.user(totp_last_ts=ts), self.code(self.step - 1)), (False, None))
+        self.assertTrue(self.verifier.verify(self.user(totp_last_ts=ts), self.code(self.step + 1))[0])
+
+    def test_forget_resets_consumed_step(self):
+        self.assertTrue(self.verifier.verify(self.user(), self.code(self.step))[0])
+        self.verifier.forget(self.user_id)
+        self.assertFalse(self.verifier.client.exists(f'totp_last_step:{self.user_id}'))
+        # al re-habilitar TOTP (totp_last_ts en None) el mismo step vuelve a ser válido
+        self.assertTrue(self.verifier.verify(self.user(), self.code(self.step))[0])
@@ -12,7 +12,8 @@ from users.views.custom_group_views import (
 )
 from users.views.totp_views import (
     TOTPSetupInitView, TOTPSetupConfirmView, TOTPDisableView,
-    totp_status, TOTPBackupRegenerateView
+    totp_status, TOTPBackupRegenerateView, TOTPBulkProvisionView,
+    TOTPBulkProvisionDownloadView
 )
 
 
@@ -30,6 +31,10 @@ urlpatterns = [
     path("totp/status/", totp_status, name="totp-status"),
     path("totp/backup/regenerate/", TOTPBackupRegenerateView.as_view(),
          name="totp-backup-regenerate"),
+    path("totp/bulk-provision/", TOTPBulkProvisionView.as_view(),
+         name="totp-bulk-provision"),
+    path("totp/bulk-provision/<str:download_id>/", TOTPBulkProvisionDownloadView.as_view(),
+         name="totp-bulk-provision-download"),
     # ------------
 
     # permissions
@@ -16,7 +16,7 @@ from drf_yasg import openapi
 from rest_framework import status
 from rest_framework.response import Response
 
-from config.shared.di.di import container
+from config.shared.di.di import resolve
 from config.shared.serializers.serializers import (
     BadRequestSerializer,
 )
@@ -37,7 +37,7 @@ class AuthView(APIView):
 
     # constructor: DI
     def __init__(self):
-        self.service = container.auth_service()
+        self.service = resolve('auth_service')
 
     @swagger_auto_schema(
         operation_description="User Login",
@@ -158,7 +158,7 @@ def logout(request):
 @permission_classes([IsAdminUser])  # is_staff - not is_superuser
 def get_permissions(request):
     try:
-        auth_service = container.auth_service()
+        auth_service = resolve('auth_service')
         _, page_number, page_size = get_pagination_parameters_rest(
             request)
 
@@ -222,7 +222,7 @@ def get_permissions(request):
 @permission_classes([IsAdminUser])  # is_staff - not is_superuser
 def get_permissions_group(request, pk):
     try:
-        auth_service = container.auth_service()
+        auth_service = resolve('auth_service')
         _, page_number, page_size = get_pagination_parameters_rest(
             request)
 
@@ -6,7 +6,7 @@ from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
 
-from config.shared.di.di import container
+from config.shared.di.di import resolve
 from config.shared.views.general_view import (
     GenericAPIViewService,
     GenericAPIDetailAllViewService,
@@ -30,7 +30,7 @@ class CustomGroupView(GenericAPIViewService):
 
     # constructor: DI
     def __init__(self):
-        custom_group_service = container.custom_group_service()
+        custom_group_service = resolve('custom_group_service')
         super().__init__(custom_group_service)
 
     @swagger_auto_schema(
@@ -60,7 +60,7 @@ class CustomGroupDetailView(GenericAPIDetailAllViewService):
 
     # constructor: DI
     def __init__(self):
-        custom_group_service = container.custom_group_service()
+        custom_group_service = resolve('custom_group_service')
         super().__init__(custom_group_service)
 
     @swagger_auto_schema(
@@ -101,7 +101,7 @@ class CustomGroupDetailView(GenericAPIDetailAllViewService):
 class CustomGroupDetailViewByUuid(BaseRetrieveUuidView):
     # constructor: DI
     def __init__(self):
-        custom_group_service = container.custom_group_service()
+        custom_group_service = resolve('custom_group_service')
         super().__init__(custom_group_service)
 
     @swagger_auto_schema(
@@ -1,19 +1,23 @@
 from rest_framework.views import APIView
 from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.authentication import TokenAuthentication
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.permissions import IsAuthenticated, IsAdminUser
 from rest_framework.response import Response
 from rest_framework import status
 from drf_yasg.utils import swagger_auto_schema
 from drf_yasg import openapi
 
-from config.shared.di.di import container
+from config.shared.di.di import resolve
 from config.shared.helpers.handle_rest_exception_helper import handle_rest_exception_helper
+from config.shared.helpers.request_netinfo import get_request_netinfo
 from users.serializers.totp_serializers import (
     TOTPSetupInitSerializer, TOTPSetupInitResponseSerializer,
     TOTPSetupConfirmSerializer, TOTPDisableSerializer,
-    TOTPStatusResponseSerializer, TOTPBackupRegenerateResponseSerializer
+    TOTPStatusResponseSerializer, TOTPBackupRegenerateResponseSerializer,
+    TOTPBulkProvisionSerializer, TOTPBulkProvisionItemSerializer
 )
+from users.services.totp_service import pop_provision_download
+from users.tasks import bulk_provision_totp
 
 
 class TOTPSetupInitView(APIView):
@@ -28,7 +32,7 @@ class TOTPSetupInitView(APIView):
     )
     def post(self, request):
         try:
-            svc = container.totp_service()
+            svc = resolve('totp_service')
             data = svc.setup_init(request.user)
             return Response({"status": status.HTTP_200_OK, "message": "Setup TOTP iniciado.", "data": data}, status=200)
         except Exception as e:
@@ -49,9 +53,10 @@ class TOTPSetupConfirmView(APIView):
         try:
             ser = TOTPSetupConfirmSerializer(data=request.data)
             ser.is_valid(raise_exception=True)
-            svc = container.totp_service()
+            svc = resolve('totp_service')
             backup_plain = svc.setup_confirm(
-                request.user, ser.validated_data["token"])
+                request.user, ser.validated_data["token"],
+                ip=get_request_netinfo(request)["client_ip"])
             return Response({"status": 200, "message": "TOTP habilitado.", "data": {"backup_codes": backup_plain}}, status=200)
         except Exception as e:
             return handle_rest_exception_helper(e)
@@ -70,12 +75,13 @@ class TOTPDisableView(APIView):
         try:
             ser = TOTPDisableSerializer(data=request.data)
             ser.is_valid(raise_exception=True)
-            svc = container.totp_service()
+            svc = resolve('totp_service')
             svc.disable(
                 request.user,
                 password=ser.validated_data["password"],
                 token=ser.validated_data.get("token"),
                 backup_token=ser.validated_data.get("backup_token"),
+                ip=get_request_netinfo(request)["client_ip"],
             )
             return Response({"status": 200, "message": "TOTP deshabilitado."}, status=200)
         except Exception as e:
@@ -92,7 +98,7 @@ class TOTPDisableView(APIView):
 @permission_classes([IsAuthenticated])
 def totp_status(request):
     try:
-        svc = container.totp_service()
+        svc = resolve('totp_service')
         data = svc.status(request.user)
         return Response({"status": 200, "data": data}, status=200)
     except Exception as e:
@@ -110,8 +116,47 @@ class TOTPBackupRegenerateView(APIView):
     )
     def post(self, request):
         try:
-            svc = container.totp_service()
+            svc = resolve('totp_service')
             new_plain = svc.backup_regenerate(request.user)
             return Response({"status": 200, "message": "Backup codes regenerados.", "data": {"backup_codes": new_plain}}, status=200)
         except Exception as e:
             return handle_rest_exception_helper(e)
+
+
+class TOTPBulkProvisionView(APIView):
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    @swagger_auto_schema(
+        operation_description="Encola el aprovisionamiento TOTP (secret + QR + backup codes) de muchos usuarios. El job (/api/v1/jobs/<job_id>/) retorna solo {provisioned, download_id}; el plaintext se descarga una vez en totp/bulk-provision/<download_id>/. Cada usuario debe confirmar.",
+        request_body=TOTPBulkProvisionSerializer,
+        responses={202: "Accepted: {job_id}", 400: "Bad Request"}
+    )
+    def post(self, request):
+        try:
+            ser = TOTPBulkProvisionSerializer(data=request.data)
+            ser.is_valid(raise_exception=True)
+            job_id = bulk_provision_totp.delay(
+                list(ser.validated_data["user_ids"]), qr_format=ser.validated_data["qr_format"],
+                requested_by=request.user.pk)
+            return Response({"status": 202, "message": "Aprovisionamiento TOTP encolado.", "data": {"job_id": job_id}}, status=202)
+        except Exception as e:
+            return handle_rest_exception_helper(e)
+
+
+class TOTPBulkProvisionDownloadView(APIView):
+    authentication_classes = [TokenAuthentication]
+    permission_classes = [IsAuthenticated, IsAdminUser]
+
+    @swagger_auto_schema(
+        operation_description="Descarga única del aprovisionamiento masivo (plaintext, lista de TOTPBulkProvisionItem). Solo el admin que lo encoló; se borra al leerlo o al vencer TOTP_PROVISION_DOWNLOAD_TTL.",
+        responses={200: openapi.Response("OK", TOTPBulkProvisionItemSerializer(many=True)), 404: "Not Found"}
+    )
+    def get(self, request, download_id):
+        try:
+            items = pop_provision_download(request.user.pk, download_id)
+            if items is None:
+                return Response({"status": 404, "message": "Descarga no encontrada, expirada o ya entregada.", "data": None}, status=404)
+            return Response({"status": 200, "message": "OK", "data": items}, status=200)
+        except Exception as e:
+            return handle_rest_exception_helper(e)
@@ -10,7 +10,7 @@ from rest_framework import status
 from rest_framework.response import Response
 
 from config.shared.helpers.pagination_helper import get_pagination_parameters_rest
-from config.shared.di.di import container
+from config.shared.di.di import resolve
 from config.shared.serializers.serializers import (
     BadRequestSerializer
 )
@@ -58,7 +58,7 @@ from rest_framework.decorators import authentication_classes, permission_classes
 @permission_classes([IsAuthenticated])  # Authent
 def user_create_view(request):
     try:
-        service = container.user_service()
+        service = resolve('user_service')
         serialized_instance = service.create_user(data=request.data)
         return Response({
             "status": status.HTTP_201_CREATED,
@@ -90,7 +90,7 @@ def get_all(request):
         filter_params, page_number, page_size = get_pagination_parameters_rest(
             request)
 
-        service = container.user_service()
+        service = resolve('user_service')
         serialized_instances = service.find_all(
             filter_params, page_number, page_size
         )
@@ -114,7 +114,7 @@ class UserDetailUUIDView(APIView):
     service = UserService
 
     def __init__(self):
-        self.service = container.user_service()
+        self.service = resolve('user_service')
 
     @swagger_auto_schema(
         operation_description="Detalle de Usuario",
@@ -148,7 +148,7 @@ class UserDetailView(GenericApiUpdDelentViewService):
 
     # constructor: DI
     def __init__(self):
-        user_service = container.user_service()
+        user_service = resolve('user_service')
         super().__init__(user_service)
 
     @swagger_auto_schema(
@@ -211,7 +211,7 @@ class UnblockUserView(AuthenticationViewMixin, PermissionRequiredViewMixin, Base
 
     # constructor: DI
     def __init__(self):
-        self.service = container.user_service()
+        self.service = resolve('user_service')
 
     @swagger_auto_schema(
         operation_description="Desbloquear Usuario",
@@ -234,7 +234,7 @@ class UnblockUserView(AuthenticationViewMixin, PermissionRequiredViewMixin, Base
 class ChangePasswordView(BaseGenericPATCHNoCacheView):
 
     def __init__(self):
-        self.service = container.user_service()
+        self.service = resolve('user_service')
 
     @swagger_auto_schema(
         operation_description="Change User Password",
@@ -259,7 +259,7 @@ class ChangePasswordView(BaseGenericPATCHNoCacheView):
 class DeactivateUserView(BaseGenericPATCHNoCacheView):
 
     def __init__(self):
-        self.service = container.user_service()
+        self.service = resolve('user_service')
 
     @swagger_auto_schema(
         operation_description="Deactivate User",
@@ -1,11 +1,11 @@
 """Webhook log views."""
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, TYPE_CHECKING
 from django.conf import settings
-from elasticsearch import Elasticsearch
-from elasticsearch.exceptions import NotFoundError, TransportError
 
+import os
+import threading
 import uuid as _uuid
 from datetime import datetime, timezone as _tz
 
@@ -15,6 +15,9 @@ from webhooks.serializers.auditoria_log_serializers import (
     AuditLogCreateSerializer
 )
 
+if TYPE_CHECKING:
+    from elasticsearch import AsyncElasticsearch, Elasticsearch
+
 
 class ESLogService:
     """
@@ -26,23 +29,50 @@ class ESLogService:
 
     def __init__(self, *, timeout: int = 10):
         self.timeout = timeout
-        self.es = self._build_client()
+        self._es: Optional[Elasticsearch] = None
+        self._aes: Optional[AsyncElasticsearch] = None
 
     # ---------------------------
     # Client & indices utilities
     # ---------------------------
-    def _build_client(self) -> Elasticsearch:
+    def _client_kwargs(self) -> Dict[str, Any]:
         kwargs: Dict[str, Any] = {"request_timeout": self.timeout}
         if getattr(settings, "ES_USER", None):
             kwargs["basic_auth"] = (settings.ES_USER, settings.ES_PASS)
-        return Elasticsearch(settings.ES_URL, **kwargs)
+        return kwargs
+
+    def _build_client(self) -> Elasticsearch:
+        from elasticsearch import Elasticsearch
+        return Elasticsearch(settings.ES_URL, **self._client_kwargs())
+
+    @property
+    def es(self) -> Elasticsearch:
+        # import y cliente diferidos al primer uso
+        if self._es is None:
+            self._es = self._build_client()
+        return self._es
+
+    @property
+    def aes(self) -> AsyncElasticsearch:
+        # cliente async (aiohttp): se crea al primer uso desde el event loop
+        if self._aes is None:
+            from elasticsearch import AsyncElasticsearch
+            self._aes = AsyncElasticsearch(
+                settings.ES_URL, **self._client_kwargs())
+        return self._aes
+
+    async def aclose(self) -> None:
+        if self._aes is not None:
+            await self._aes.close()
+            self._aes = None
 
     def _indices(self) -> str:
         return f"{settings.ES_INDEX_PREFIX}-*"
 
-    def ping(self) -> bool:
+    def ping(self, timeout: Optional[int] = None) -> bool:
         try:
-            return bool(self.es.ping())
+            client = self.es if timeout is None else self.es.options(request_timeout=timeout)
+            return bool(client.ping())
         except Exception:
             return False
 
@@ -203,6 +233,25 @@ class ESLogService:
         items = [self._adapt_source(h) for h in hits]  # <- normaliza aquí
         return {"total": total, "items": items}
 
+    async def asearch(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """ Igual que search(), sin bloquear el event loop (vistas ASGI) """
+        query, sort = self._build_query_and_sort(params)
+        offset = int(params.get("offset", 0))
+        size = int(params.get("limit", 50))
+
+        res = await self.aes.search(
+            index=self._indices(),
+            query=query,
+            from_=offset,
+            size=size,
+            sort=sort
+        )
+        hits = res.get("hits", {}).get("hits", [])
+        total = res.get("hits", {}).get("total", {}).get("value", 0)
+
+        items = [self._adapt_source(h) for h in hits]
+        return {"total": total, "items": items}
+
     # --------------------------------------------
     # Streaming search: PIT + search_after (big)
     # --------------------------------------------
@@ -272,6 +321,7 @@ class ESLogService:
     # Get by UUID / _id helpers
     # ---------------------------
     def get_by_uuid(self, uuid: str) -> Optional[Dict[str, Any]]:
+        from elasticsearch.exceptions import TransportError
         # 1) Por _id
         try:
             res = self.es.search(
@@ -302,6 +352,7 @@ class ESLogService:
         return None
 
     def get_by_id(self, index: str, _id: str) -> Optional[Dict[str, Any]]:
+        from elasticsearch.exceptions import NotFoundError
         try:
             doc = self.es.get(index=index, id=_id)
             # simula un hit para reutilizar el adaptador
@@ -335,6 +386,11 @@ class ESLogService:
             payload["extra"] = extra
 
     def write_sync_from_request(self, request, data: Dict[str, Any]) -> Dict[str, Any]:
+        payload = self.build_document_from_request(request, data)
+        return self.index_document(payload)
+
+    def build_document_from_request(self, request, data: Dict[str, Any]) -> Dict[str, Any]:
+        """ Documento completo (sin I/O contra ES): se puede indexar luego desde un job """
         valid = CommonSerializerStaticHelper.validate_and_serialize_by_serializer(
             data=data, serializer=AuditLogCreateSerializer
         )
@@ -367,7 +423,9 @@ class ESLogService:
         if data.get("status"):
             payload["status"] = str(data["status"])
         self._inject_trace(request, payload)
+        return payload
 
+    def index_document(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         alias = getattr(settings, "ES_ALIAS_WRITE", None) or "audit-write"
 
         # 2) Visibilidad inmediata del doc en búsquedas siguientes
@@ -382,3 +440,27 @@ class ESLogService:
 
         # (Opcional) devolver el doc tal como quedó
         return {"uuid": payload["uuid"], "written": True, "index": alias}
+
+
+# ---------------------------
+# instancia por proceso
+# ---------------------------
+_es_log_service: Optional[ESLogService] = None
+_es_log_service_pid: Optional[int] = None
+_es_log_service_lock = threading.Lock()
+
+
+def get_es_log_service() -> ESLogService:
+    """
+    ESLogService del proceso: un solo cliente (y pool HTTP) compartido por el
+    warm-up, el login y los jobs de auditoría. Tras un fork se crea uno nuevo:
+    las conexiones del pool no se comparten entre procesos.
+    """
+    global _es_log_service, _es_log_service_pid
+    pid = os.getpid()
+    if _es_log_service is None or _es_log_service_pid != pid:
+        with _es_log_service_lock:
+            if _es_log_service is None or _es_log_service_pid != pid:
+                _es_log_service = ESLogService(timeout=10)
+                _es_log_service_pid = pid
+    return _es_log_service
@@ -0,0 +1,8 @@
+from config.shared.services.common.job_queue import job
+
+
+@job(queue='audit', max_retries=5, backoff=2)
+def index_audit_document(payload):
+    """ Idempotente: ES indexa con id=payload['uuid'], un reintento sobreescribe el mismo doc """
+    from webhooks.services.auditoria_log_service import get_es_log_service
+    return get_es_log_service().index_document(payload)